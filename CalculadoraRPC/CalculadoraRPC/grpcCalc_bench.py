@@ -0,0 +1,211 @@
+# grpcCalc_bench.py
+#
+# Benchmark lado a lado das implementações da calculadora.
+# Para cada modo de servidor (threads / aio) o script sobe o
+# grpcCalc_server.py e, para cada modo de cliente, mantém --concurrency
+# chamadas em andamento sobre um único canal:
+#   sync   -> CalculatorClient, uma thread por chamada em andamento
+#   aio    -> AsyncCalculatorClient, corrotinas no mesmo event loop
+#   batch  -> BatchCompute com --batch-size operações por chamada
+#             (latências por lote)
+#   stream -> todas as operações por um único ComputeStream (só vazão)
+#   vector -> ComputeVector (NumPy no servidor) com --batch-size operações
+#             por chamada, uma operação por chamada (latências por chamada)
+# As operações alternam entre Add, Sub, Mul e Div.
+# Dois modos extras medem a fórmula (a + b) * c / d, uma de cada vez
+# (latência por fórmula):
+#   chain    -> Add, Mul e DivFloat: três chamadas por fórmula
+#   evaluate -> Evaluate: uma chamada por fórmula (expressão já compilada
+#               no servidor depois da primeira)
+#
+# Exemplo:
+#   py grpcCalc_bench.py --server-modes threads,aio --client-modes sync,aio,batch,stream --calls 20000
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import grpc
+import grpcCalc_pb2
+from grpcCalc_client import CalculatorClient
+from grpcCalc_client_aio import AsyncCalculatorClient
+
+TARGET = 'localhost:50051'
+OPERATIONS = ('add', 'sub', 'mul', 'div')
+OPS = (grpcCalc_pb2.ADD, grpcCalc_pb2.SUB, grpcCalc_pb2.MUL, grpcCalc_pb2.DIV)
+FORMULA = '(a + b) * c / d'
+
+
+def percentile(values, p):
+    """Percentil pelo método nearest-rank (p entre 0 e 100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def start_server(mode):
+    server = subprocess.Popen(
+        [sys.executable, 'grpcCalc_server.py', '--mode', mode],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    channel = grpc.insecure_channel(TARGET)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    channel.close()
+    return server
+
+
+def run_sync(calls, concurrency):
+    latencies = []
+    counter = iter(range(calls))
+    lock = threading.Lock()
+
+    def worker(calc):
+        perf = time.perf_counter
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            op = getattr(calc, OPERATIONS[i % 4])
+            t0 = perf()
+            op(i, 7)
+            latencies.append(perf() - t0)
+
+    with CalculatorClient(TARGET) as calc:
+        threads = [threading.Thread(target=worker, args=(calc,)) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def run_batch(calls, batch_size):
+    latencies = []
+    operations = [(OPS[i % 4], i, 7) for i in range(calls)]
+    with CalculatorClient(TARGET) as calc:
+        start = time.perf_counter()
+        for i in range(0, calls, batch_size):
+            t0 = time.perf_counter()
+            calc.batch(operations[i:i + batch_size])
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def run_vector(calls, batch_size):
+    latencies = []
+    with CalculatorClient(TARGET) as calc:
+        start = time.perf_counter()
+        for n, i in enumerate(range(0, calls, batch_size)):
+            x = range(i, min(i + batch_size, calls))
+            t0 = time.perf_counter()
+            calc.vector(OPS[n % 4], x, [7] * len(x))
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def run_stream(calls):
+    operations = [(OPS[i % 4], i, 7) for i in range(calls)]
+    with CalculatorClient(TARGET) as calc:
+        start = time.perf_counter()
+        for _ in calc.stream(operations):
+            pass
+        elapsed = time.perf_counter() - start
+    return [], elapsed
+
+
+def run_formula(calls, chained):
+    latencies = []
+    with CalculatorClient(TARGET) as calc:
+        start = time.perf_counter()
+        for i in range(calls):
+            t0 = time.perf_counter()
+            if chained:
+                calc.div_float(calc.mul(calc.add(i, 7), 3), 2)
+            else:
+                calc.evaluate(FORMULA, {'a': i, 'b': 7, 'c': 3, 'd': 2})
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+async def run_aio(calls, concurrency):
+    latencies = []
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def call(calc, i):
+        async with in_flight:
+            op = getattr(calc, OPERATIONS[i % 4])
+            t0 = time.perf_counter()
+            await op(i, 7)
+            latencies.append(time.perf_counter() - t0)
+
+    async with AsyncCalculatorClient(TARGET) as calc:
+        start = time.perf_counter()
+        await asyncio.gather(*(call(calc, i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da calculadora: threads x asyncio")
+    parser.add_argument('--server-modes', default='threads,aio', help="Modos do servidor, separados por vírgula")
+    parser.add_argument('--client-modes', default='sync,aio,batch,stream,vector',
+                        help="Modos do cliente, separados por vírgula")
+    parser.add_argument('--calls', type=int, default=20000, help="Chamadas por medição (padrão: 20000)")
+    parser.add_argument('--concurrency', type=int, default=100,
+                        help="Chamadas em andamento ao mesmo tempo (padrão: 100)")
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help="Operações por BatchCompute / ComputeVector (padrão: 1000)")
+    args = parser.parse_args()
+
+    results = []
+    for server_mode in args.server_modes.split(','):
+        server = start_server(server_mode)
+        try:
+            for client_mode in args.client_modes.split(','):
+                if client_mode == 'aio':
+                    latencies, elapsed = asyncio.run(run_aio(args.calls, args.concurrency))
+                elif client_mode == 'batch':
+                    latencies, elapsed = run_batch(args.calls, args.batch_size)
+                elif client_mode == 'vector':
+                    latencies, elapsed = run_vector(args.calls, args.batch_size)
+                elif client_mode in ('chain', 'evaluate'):
+                    latencies, elapsed = run_formula(args.calls, client_mode == 'chain')
+                elif client_mode == 'stream':
+                    latencies, elapsed = run_stream(args.calls)
+                else:
+                    latencies, elapsed = run_sync(args.calls, args.concurrency)
+                row = {
+                    'server': server_mode,
+                    'client': client_mode,
+                    'calls': args.calls,
+                    'concurrency': args.concurrency,
+                    'ops_per_sec': args.calls / elapsed,
+                    'p50_ms': statistics.median(latencies) * 1000 if latencies else None,
+                    'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+                }
+                results.append(row)
+                latency = ""
+                if latencies:
+                    latency = f" | p50 {row['p50_ms']:.1f}ms | p99 {row['p99_ms']:.1f}ms"
+                print(f"[Bench] servidor {server_mode:>7} | cliente {client_mode:>8} | "
+                      f"{row['ops_per_sec']:>9,.0f} operações/s{latency}", file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
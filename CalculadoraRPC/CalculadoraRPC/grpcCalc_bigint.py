@@ -0,0 +1,30 @@
+# grpcCalc_bigint.py
+#
+# Conversão entre int do Python e a mensagem BigInt do .proto, usada pelo
+# servidor e pelos clientes nas operações *Big.
+# Valores que cabem em 64 bits vão no campo small (varint, sem cópia de
+# bytes); só os maiores pagam a codificação em bytes.
+
+import grpcCalc_pb2
+
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
+# Tamanho máximo de um operando em bytes (evita contas gigantes de graça)
+MAX_BIGINT_BYTES = 1 << 16
+
+
+def to_message(n):
+    if INT64_MIN <= n <= INT64_MAX:
+        return grpcCalc_pb2.BigInt(small=n)
+    # +8 garante espaço para o bit de sinal
+    return grpcCalc_pb2.BigInt(big=n.to_bytes((n.bit_length() + 8) // 8, 'big', signed=True))
+
+
+def from_message(message):
+    """BigInt -> int. Levanta ValueError se o operando passar de MAX_BIGINT_BYTES."""
+    if message.WhichOneof('value') != 'big':
+        return message.small # Campo vazio também cai aqui: 0
+    if len(message.big) > MAX_BIGINT_BYTES:
+        raise ValueError(f"Erro: Operando maior que {MAX_BIGINT_BYTES} bytes!")
+    return int.from_bytes(message.big, 'big', signed=True)
@@ -0,0 +1,172 @@
+# grpcCalc_cache.py
+#
+# Caches limitados e seguros entre threads, usados pelo servidor da
+# calculadora: expressões já compiladas do Evaluate e, opcionalmente,
+# resultados das operações por (op, x, y). Contam acertos, faltas e
+# remoções para ajudar a escolher o tamanho.
+#
+# Políticas:
+#   lru     -> remove o item usado há mais tempo
+#   tinylfu -> LRU com filtro de admissão TinyLFU: com o cache cheio um
+#              item novo só entra se for mais frequente que a vítima, então
+#              uma rajada de chaves que não se repetem não expulsa as
+#              chaves populares
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Guarda até maxsize itens e remove o usado há mais tempo quando enche.
+    maxsize 0 desliga o cache (toda consulta é uma falta).
+    """
+
+    policy = 'lru'
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0 # Itens recusados pelo filtro de admissão (só tinylfu)
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Valor da chave; numa falta calcula com compute(key) fora da trava e
+        guarda. Exceções de compute passam direto e nada é guardado.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self.lock:
+            return {
+                'policy': self.policy,
+                'size': len(self.data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'rejections': self.rejections,
+            }
+
+
+SKETCH_DEPTH = 4
+# Tabela para bytes.translate: divide todos os contadores por 2 de uma vez
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class TinyLFUCache(LRUCache):
+    """
+    LRUCache com admissão TinyLFU. A frequência recente de cada chave é
+    estimada por um count-min sketch (SKETCH_DEPTH linhas de contadores de
+    8 bits, ~4 contadores por item do cache); a cada 10 * maxsize acessos todos os
+    contadores caem pela metade, para o passado pesar menos.
+    """
+
+    policy = 'tinylfu'
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        width = 1 << max(6, (max(maxsize, 1) * 4 - 1).bit_length())
+        self.mask = width - 1
+        # As linhas lado a lado num único bytearray: linha r começa em r * width
+        self.width = width
+        self.sketch = bytearray(width * SKETCH_DEPTH)
+        self.sample_size = 10 * max(maxsize, 1)
+        self.accesses = 0
+
+    def _indexes(self, key):
+        # Hash duplo: h1 + r * h2 (h2 ímpar) dá uma posição diferente por linha
+        h = hash(key)
+        h1 = h & self.mask
+        h2 = (h >> 16) | 1
+        mask, width = self.mask, self.width
+        return (h1,
+                width + ((h1 + h2) & mask),
+                2 * width + ((h1 + 2 * h2) & mask),
+                3 * width + ((h1 + 3 * h2) & mask))
+
+    def _record(self, key):
+        sketch = self.sketch
+        for i in self._indexes(key):
+            if sketch[i] < 255:
+                sketch[i] += 1
+        self.accesses += 1
+        if self.accesses >= self.sample_size:
+            self.sketch = sketch.translate(_HALVE)
+            self.accesses //= 2
+
+    def _frequency(self, key):
+        sketch = self.sketch
+        return min(sketch[i] for i in self._indexes(key))
+
+    def get(self, key, default=None):
+        with self.lock:
+            self._record(key)
+            try:
+                value = self.data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            if key in self.data or len(self.data) < self.maxsize:
+                self.data[key] = value
+                self.data.move_to_end(key)
+                return
+            victim = next(iter(self.data))
+            if self._frequency(key) <= self._frequency(victim):
+                self.rejections += 1
+                return
+            del self.data[victim]
+            self.evictions += 1
+            self.data[key] = value
+
+
+CACHE_POLICIES = {
+    'lru': LRUCache,
+    'tinylfu': TinyLFUCache,
+}
+
+
+def make_cache(policy, maxsize):
+    """Cache da política dada ('lru' ou 'tinylfu'); None se maxsize <= 0."""
+    if maxsize <= 0:
+        return None
+    return CACHE_POLICIES[policy](maxsize)
@@ -0,0 +1,152 @@
+# grpcCalc_cache_bench.py
+#
+# Benchmark do cache de resultados da calculadora, sem rede: chama os
+# handlers do CalculatorServicer direto (como o grpcCalc_path_bench.py)
+# com operandos sorteados por uma distribuição de Zipf (poucos pares muito
+# repetidos e uma cauda longa de pares raros) e mede, para cada política e
+# tamanho de cache, a taxa de acertos e o custo por chamada.
+#   --operands int32 -> Mul com int32 (conta barata: o cache só custa)
+#   --operands big   -> MulBig com inteiros de --bits bits (padrão 1024)
+# --one-off mistura uma fração de pares que nunca se repetem (varredura),
+# o caso em que o filtro do tinylfu protege as chaves populares.
+#
+# Exemplo:
+#   py grpcCalc_cache_bench.py --operands big --sizes 1000,10000 --policies lru,tinylfu --threads 1,8
+
+import argparse
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import grpcCalc_pb2
+from grpcCalc_bigint import to_message, from_message
+from grpcCalc_cache import CACHE_POLICIES
+from grpcCalc_path_bench import NullContext
+from grpcCalc_server import CalculatorServicer, log
+
+
+def zipf_ranks(rng, universe, skew, count):
+    """count sorteios em [0, universe) com P(k) proporcional a 1 / (k + 1) ** skew."""
+    cum_weights = list(itertools.accumulate(1 / (k + 1) ** skew for k in range(universe)))
+    return rng.choices(range(universe), cum_weights=cum_weights, k=count)
+
+
+def workload(operands, universe, skew, calls, one_off, seed, bits=1024):
+    """(método, lista de requisições, lista dos resultados esperados)"""
+    rng = random.Random(seed)
+    if operands == 'big':
+        method = 'MulBig'
+        def pair():
+            return rng.getrandbits(bits), rng.getrandbits(bits) | 1
+        def request(x, y):
+            return grpcCalc_pb2.BigOperands(x=to_message(x), y=to_message(y))
+    else:
+        method = 'Mul'
+        def pair():
+            return rng.randrange(-46340, 46341), rng.randrange(-46340, 46341) # Produto cabe no int32
+        def request(x, y):
+            return grpcCalc_pb2.Operands(x=x, y=y)
+
+    pairs = [pair() for _ in range(universe)]
+    popular = [request(x, y) for x, y in pairs]
+    requests, expected = [], []
+    for rank in zipf_ranks(rng, universe, skew, calls):
+        if rng.random() < one_off:
+            x, y = pair()
+            requests.append(request(x, y))
+        else:
+            x, y = pairs[rank]
+            requests.append(popular[rank])
+        expected.append(x * y)
+    return method, requests, expected
+
+
+def timed_run(method, requests, threads, result_cache_size, policy):
+    # Um servidor novo (cache vazio) por medição; retorna (servicer, segundos)
+    servicer = CalculatorServicer(result_cache_size=result_cache_size, cache_policy=policy)
+    handler = getattr(servicer, method)
+    context = NullContext()
+    chunks = [requests[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        for request in chunk:
+            handler(request, context)
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return servicer, time.perf_counter() - start
+
+
+def run(method, requests, expected, threads, result_cache_size, policy, repeats):
+    # O melhor de 'repeats' medições, para descontar o ruído da máquina
+    runs = [timed_run(method, requests, threads, result_cache_size, policy) for _ in range(repeats)]
+    servicer, elapsed = min(runs, key=lambda run: run[1])
+    stats = servicer.results.stats() if servicer.results is not None else None
+    handler = getattr(servicer, method)
+    context = NullContext()
+
+    # Conferência: com o cache já quente, os resultados continuam certos
+    wrong = 0
+    for request, value in zip(requests[:10000], expected[:10000]):
+        result = handler(request, context).value
+        if method == 'MulBig':
+            result = from_message(result)
+        wrong += result != value
+
+    row = {
+        'method': method,
+        'policy': policy if result_cache_size else 'off',
+        'cache_size': result_cache_size,
+        'threads': threads,
+        'calls': len(requests),
+        'ns_per_call': elapsed / len(requests) * 1e9,
+        'wrong': wrong,
+    }
+    if stats is not None:
+        lookups = stats['hits'] + stats['misses']
+        row.update(stats)
+        row['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache de resultados da calculadora com operandos Zipf (sem rede)")
+    parser.add_argument('--operands', choices=['int32', 'big'], default='big',
+                        help="int32: Mul; big: MulBig com --bits bits (padrão: big)")
+    parser.add_argument('--bits', type=int, default=1024, help="Tamanho dos operandos do MulBig (padrão: 1024)")
+    parser.add_argument('--calls', type=int, default=200000, help="Chamadas por medição (padrão: 200000)")
+    parser.add_argument('--universe', type=int, default=100000, help="Pares de operandos distintos (padrão: 100000)")
+    parser.add_argument('--skew', type=float, default=1.0, help="Expoente da distribuição de Zipf (padrão: 1.0)")
+    parser.add_argument('--one-off', type=float, default=0.0,
+                        help="Fração de chamadas com pares que nunca se repetem (padrão: 0)")
+    parser.add_argument('--sizes', default='1000,10000', help="Tamanhos do cache, separados por vírgula")
+    parser.add_argument('--policies', default=','.join(CACHE_POLICIES), help="Políticas, separadas por vírgula")
+    parser.add_argument('--threads', default='1,8', help="Threads chamando os handlers, separadas por vírgula")
+    parser.add_argument('--repeats', type=int, default=3, help="Medições por configuração; vale a melhor (padrão: 3)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    log.configure(stream=open(os.devnull, 'w')) # Linhas de log por requisição descartadas
+
+    method, requests, expected = workload(args.operands, args.universe, args.skew,
+                                          args.calls, args.one_off, args.seed, args.bits)
+    configs = [('lru', 0)] + [(policy, int(size)) for policy in args.policies.split(',')
+                              for size in args.sizes.split(',')]
+    results = []
+    for threads in [int(t) for t in args.threads.split(',')]:
+        for policy, size in configs:
+            row = run(method, requests, expected, threads, size, policy, args.repeats)
+            results.append(row)
+            hits = f" | acertos {row['hit_ratio']:6.1%} | {row['evictions']:>7} remoções" if size else ""
+            print(f"[Bench] {method} | {threads:>2} threads | {row['policy']:>7} {size:>6} | "
+                  f"{row['ns_per_call']:>7.0f} ns/chamada{hits} | {row['wrong']} errados")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
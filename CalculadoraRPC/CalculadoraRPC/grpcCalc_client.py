@@ -1,70 +1,242 @@
-# grpcCalc_client.py
-
-import grpc
-# Importa os módulos gerados
-import grpcCalc_pb2
-import grpcCalc_pb2_grpc
-
-def run():
-    # Conecta ao servidor gRPC que está em 'localhost' na porta 50051
-    print("Tentando conectar ao servidor em localhost:50051...")
-    try:
-        channel = grpc.insecure_channel('localhost:50051')
-        # Cria o "stub" do cliente, que nos permite chamar as funções remotas
-        stub = grpcCalc_pb2_grpc.CalculatorStub(channel)
-    except Exception as e:
-        print(f"Não foi possível conectar ao servidor: {e}")
-        return
-
-    # Loop do menu principal
-    while True:
-        print("\n--- Calculadora RPC Interativa (gRPC) ---")
-        print("1. Somar")
-        print("2. Subtrair")
-        print("3. Multiplicar")
-        print("4. Dividir")
-        print("5. Sair")
-
-        choice = input("Escolha uma opção: ")
-
-        if choice == '5':
-            print("Saindo...")
-            break
-
-        if choice not in ['1', '2', '3', '4']:
-            print("Opção inválida. Tente novamente.")
-            continue
-
-        # Ler os operandos do usuário
-        try:
-            x = int(input("Digite o primeiro número (x): "))
-            y = int(input("Digite o segundo número (y): "))
-        except ValueError:
-            print("Entrada inválida. Por favor, digite números inteiros.")
-            continue
-
-        # Cria a mensagem de "Operands" para enviar ao servidor
-        # Note que usamos a classe "Operands" do arquivo gerado
-        operands_request = grpcCalc_pb2.Operands(x=x, y=y)
-
-        try:
-            # Chama a função remota apropriada no servidor
-            if choice == '1':
-                response = stub.Add(operands_request)
-                print(f"Resultado (Soma): {response.value}")
-            elif choice == '2':
-                response = stub.Sub(operands_request)
-                print(f"Resultado (Subtração): {response.value}")
-            elif choice == '3':
-                response = stub.Mul(operands_request)
-                print(f"Resultado (Multiplicação): {response.value}")
-            elif choice == '4':
-                response = stub.Div(operands_request)
-                print(f"Resultado (Divisão): {response.value}")
-
-        except grpc.RpcError as e:
-            # Captura erros do servidor (como divisão por zero)
-            print(f"[Cliente] Erro na chamada RPC: {e.details()}")
-
-if __name__ == '__main__':
+# grpcCalc_client.py
+
+import grpc
+# Importa os módulos gerados
+import grpcCalc_pb2
+import grpcCalc_pb2_grpc
+from grpcCalc_bigint import to_message, from_message
+
+# NumPy é opcional: só o ComputeVector (calc.vector) precisa dele
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tipos aceitos pelo ComputeVector: nome -> (DType do .proto, dtype NumPy little-endian)
+VECTOR_DTYPES = {
+    'int32': (grpcCalc_pb2.INT32, '<i4'),
+    'int64': (grpcCalc_pb2.INT64, '<i8'),
+}
+
+def big_operands(x, y):
+    return grpcCalc_pb2.BigOperands(x=to_message(x), y=to_message(y))
+
+# Monta a requisição do ComputeVector com os operandos em buffers brutos
+def vector_request(op, x, y, dtype='int32'):
+    proto_dtype, np_dtype = VECTOR_DTYPES[dtype]
+    return grpcCalc_pb2.VectorRequest(
+        op=op, dtype=proto_dtype,
+        x_data=np.asarray(x, dtype=np_dtype).tobytes(),
+        y_data=np.asarray(y, dtype=np_dtype).tobytes()
+    )
+
+# VectorResponse -> (resultados, códigos de erro por item; 0 = OK)
+def vector_result(response):
+    np_dtype = '<i8' if response.dtype == grpcCalc_pb2.INT64 else '<i4'
+    values = np.frombuffer(response.values, dtype=np_dtype)
+    if response.error_count:
+        errors = np.frombuffer(response.errors, dtype=np.uint8)
+    else:
+        errors = np.zeros(len(values), dtype=np.uint8)
+    return values, errors
+
+# Monta a requisição do Evaluate: variables (nome -> número) vale para todas
+# as linhas; columns (nome -> lista/array de números) tem um valor por linha
+def evaluate_request(expression, variables=None, columns=None):
+    return grpcCalc_pb2.EvaluateRequest(
+        expression=expression, variables=variables or {},
+        columns={name: grpcCalc_pb2.Column(values=values) for name, values in (columns or {}).items()}
+    )
+
+# EvaluateResponse -> (resultados, códigos de erro por linha; 0 = OK)
+def evaluate_result(response):
+    values = list(response.values)
+    errors = list(response.errors) if response.error_count else [0] * len(values)
+    return values, errors
+
+# Envolve o stub: um método por operação, recebendo e devolvendo inteiros.
+# A versão asyncio (mesmos métodos, com await) fica em grpcCalc_client_aio.py
+class CalculatorClient:
+
+    def __init__(self, target='localhost:50051'):
+        self.channel = grpc.insecure_channel(target)
+        # Cria o "stub" do cliente, que nos permite chamar as funções remotas
+        self.stub = grpcCalc_pb2_grpc.CalculatorStub(self.channel)
+
+    def add(self, x, y):
+        return self.stub.Add(grpcCalc_pb2.Operands(x=x, y=y)).value
+
+    def sub(self, x, y):
+        return self.stub.Sub(grpcCalc_pb2.Operands(x=x, y=y)).value
+
+    def mul(self, x, y):
+        return self.stub.Mul(grpcCalc_pb2.Operands(x=x, y=y)).value
+
+    def div(self, x, y):
+        return self.stub.Div(grpcCalc_pb2.Operands(x=x, y=y)).value
+
+    # Variantes para inteiros de qualquer tamanho (64 bits ou mais)
+    def add_big(self, x, y):
+        return from_message(self.stub.AddBig(big_operands(x, y)).value)
+
+    def sub_big(self, x, y):
+        return from_message(self.stub.SubBig(big_operands(x, y)).value)
+
+    def mul_big(self, x, y):
+        return from_message(self.stub.MulBig(big_operands(x, y)).value)
+
+    def div_big(self, x, y):
+        return from_message(self.stub.DivBig(big_operands(x, y)).value)
+
+    # Divisão real (float)
+    def div_float(self, x, y):
+        return self.stub.DivFloat(big_operands(x, y)).value
+
+    # Lista de (op, x, y), com op = grpcCalc_pb2.ADD/SUB/MUL/DIV, em uma só chamada.
+    # Devolve os OperationResult na mesma ordem (code != 0 indica erro no item).
+    def batch(self, operations):
+        request = grpcCalc_pb2.BatchRequest(operations=[
+            grpcCalc_pb2.Operation(op=op, x=x, y=y, id=i) for i, (op, x, y) in enumerate(operations)
+        ])
+        return list(self.stub.BatchCompute(request).results)
+
+    # Mesmo formato do batch, mas por um stream: as operações vão sendo
+    # enviadas enquanto os resultados chegam (iterador de OperationResult)
+    def stream(self, operations):
+        requests = (grpcCalc_pb2.Operation(op=op, x=x, y=y, id=i) for i, (op, x, y) in enumerate(operations))
+        return self.stub.ComputeStream(requests)
+
+    # Uma operação sobre dois vetores (arrays NumPy ou listas), enviados como
+    # buffers brutos. Devolve (resultados, códigos de erro por item), ambos arrays NumPy.
+    def vector(self, op, x, y, dtype='int32'):
+        response = self.stub.ComputeVector(vector_request(op, x, y, dtype))
+        return vector_result(response)
+
+    # Uma expressão inteira ("(a + b) * c / d") em uma só chamada.
+    # Sem columns devolve ([resultado], [código]); com columns, uma posição por linha.
+    def evaluate(self, expression, variables=None, columns=None):
+        response = self.stub.Evaluate(evaluate_request(expression, variables, columns))
+        return evaluate_result(response)
+
+    # Contadores dos caches do servidor: nome -> CacheStats (hits, misses, evictions...)
+    def cache_stats(self):
+        response = self.stub.GetCacheStats(grpcCalc_pb2.CacheStatsRequest())
+        return {cache.name: cache for cache in response.caches}
+
+    def close(self):
+        self.channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# Opções do menu -> (nome no resultado, método do CalculatorClient)
+MENU_OPERATIONS = {
+    '1': ('Soma', 'add'),
+    '2': ('Subtração', 'sub'),
+    '3': ('Multiplicação', 'mul'),
+    '4': ('Divisão', 'div'),
+}
+
+# Faixa do int32 (operações Add/Sub/Mul/Div)
+INT32_MIN = -2**31
+INT32_MAX = 2**31 - 1
+
+# "a=1 b=2.5" -> {'a': 1.0, 'b': 2.5} (levanta ValueError se mal formado)
+def parse_variables(text):
+    variables = {}
+    for item in text.replace(',', ' ').split():
+        name, value = item.split('=')
+        variables[name.strip()] = float(value)
+    return variables
+
+# Usa a operação int32 quando os números cabem (caminho rápido); senão, ou
+# se o resultado estourar o int32, repete com a variante *Big
+def call_auto(calc, name, x, y):
+    if INT32_MIN <= x <= INT32_MAX and INT32_MIN <= y <= INT32_MAX:
+        try:
+            return getattr(calc, name)(x, y)
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.OUT_OF_RANGE:
+                raise
+    return getattr(calc, name + '_big')(x, y)
+
+# Opção 6: lê a expressão e os valores das variáveis e avalia no servidor
+def evaluate_menu(calc):
+    expression = input("Digite a expressão (ex.: (a + b) * c / d): ")
+    try:
+        variables = parse_variables(input("Valores das variáveis (ex.: a=1 b=2 c=3 d=4): "))
+    except ValueError:
+        print("Entrada inválida. Use nome=valor separados por espaço.")
+        return
+    try:
+        values, errors = calc.evaluate(expression, variables)
+    except grpc.RpcError as e:
+        print(f"[Cliente] Erro na chamada RPC: {e.details()}")
+        return
+    if errors[0] == grpc.StatusCode.INVALID_ARGUMENT.value[0]:
+        print("[Cliente] Erro: Divisão por zero!")
+    elif errors[0]:
+        print("[Cliente] Erro: Resultado não é um número finito!")
+    else:
+        print(f"Resultado: {values[0]}")
+
+def run():
+    # Conecta ao servidor gRPC que está em 'localhost' na porta 50051
+    print("Tentando conectar ao servidor em localhost:50051...")
+    try:
+        calc = CalculatorClient('localhost:50051')
+    except Exception as e:
+        print(f"Não foi possível conectar ao servidor: {e}")
+        return
+
+    # Loop do menu principal
+    while True:
+        print("\n--- Calculadora RPC Interativa (gRPC) ---")
+        print("1. Somar")
+        print("2. Subtrair")
+        print("3. Multiplicar")
+        print("4. Dividir")
+        print("5. Dividir (resultado real)")
+        print("6. Avaliar expressão")
+        print("7. Sair")
+
+        choice = input("Escolha uma opção: ")
+
+        if choice == '7':
+            print("Saindo...")
+            calc.close()
+            break
+
+        if choice == '6':
+            evaluate_menu(calc)
+            continue
+
+        if choice not in ['1', '2', '3', '4', '5']:
+            print("Opção inválida. Tente novamente.")
+            continue
+
+        # Ler os operandos do usuário (inteiros de qualquer tamanho)
+        try:
+            x = int(input("Digite o primeiro número (x): "))
+            y = int(input("Digite o segundo número (y): "))
+        except ValueError:
+            print("Entrada inválida. Por favor, digite números inteiros.")
+            continue
+
+        try:
+            # Chama a função remota apropriada no servidor
+            if choice == '5':
+                print(f"Resultado (Divisão real): {calc.div_float(x, y)}")
+            else:
+                label, name = MENU_OPERATIONS[choice]
+                print(f"Resultado ({label}): {call_auto(calc, name, x, y)}")
+
+        except grpc.RpcError as e:
+            # Captura erros do servidor (como divisão por zero)
+            print(f"[Cliente] Erro na chamada RPC: {e.details()}")
+
+if __name__ == '__main__':
     run()
\ No newline at end of file
@@ -0,0 +1,103 @@
+# grpcCalc_client_aio.py
+#
+# Versão asyncio (grpc.aio) do cliente da calculadora.
+# Os métodos são os mesmos do CalculatorClient (grpcCalc_client.py), mas
+# são corrotinas: com asyncio.gather milhares de operações ficam em
+# andamento ao mesmo tempo sobre um único canal.
+#
+# Exemplo (10000 somas simultâneas):
+#   py grpcCalc_client_aio.py --calls 10000
+
+import argparse
+import asyncio
+import time
+import grpc
+import grpcCalc_pb2
+import grpcCalc_pb2_grpc
+from grpcCalc_bigint import from_message
+from grpcCalc_client import big_operands, vector_request, vector_result, evaluate_request, evaluate_result
+
+
+class AsyncCalculatorClient:
+
+    def __init__(self, target='localhost:50051'):
+        self.channel = grpc.aio.insecure_channel(target)
+        self.stub = grpcCalc_pb2_grpc.CalculatorStub(self.channel)
+
+    async def add(self, x, y):
+        return (await self.stub.Add(grpcCalc_pb2.Operands(x=x, y=y))).value
+
+    async def sub(self, x, y):
+        return (await self.stub.Sub(grpcCalc_pb2.Operands(x=x, y=y))).value
+
+    async def mul(self, x, y):
+        return (await self.stub.Mul(grpcCalc_pb2.Operands(x=x, y=y))).value
+
+    async def div(self, x, y):
+        return (await self.stub.Div(grpcCalc_pb2.Operands(x=x, y=y))).value
+
+    async def add_big(self, x, y):
+        return from_message((await self.stub.AddBig(big_operands(x, y))).value)
+
+    async def sub_big(self, x, y):
+        return from_message((await self.stub.SubBig(big_operands(x, y))).value)
+
+    async def mul_big(self, x, y):
+        return from_message((await self.stub.MulBig(big_operands(x, y))).value)
+
+    async def div_big(self, x, y):
+        return from_message((await self.stub.DivBig(big_operands(x, y))).value)
+
+    async def div_float(self, x, y):
+        return (await self.stub.DivFloat(big_operands(x, y))).value
+
+    async def batch(self, operations):
+        request = grpcCalc_pb2.BatchRequest(operations=[
+            grpcCalc_pb2.Operation(op=op, x=x, y=y, id=i) for i, (op, x, y) in enumerate(operations)
+        ])
+        return list((await self.stub.BatchCompute(request)).results)
+
+    async def vector(self, op, x, y, dtype='int32'):
+        response = await self.stub.ComputeVector(vector_request(op, x, y, dtype))
+        return vector_result(response)
+
+    async def evaluate(self, expression, variables=None, columns=None):
+        response = await self.stub.Evaluate(evaluate_request(expression, variables, columns))
+        return evaluate_result(response)
+
+    async def cache_stats(self):
+        response = await self.stub.GetCacheStats(grpcCalc_pb2.CacheStatsRequest())
+        return {cache.name: cache for cache in response.caches}
+
+    # Devolve a chamada: use "async for result in calc.stream(...)"
+    def stream(self, operations):
+        requests = (grpcCalc_pb2.Operation(op=op, x=x, y=y, id=i) for i, (op, x, y) in enumerate(operations))
+        return self.stub.ComputeStream(requests)
+
+    async def close(self):
+        await self.channel.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+async def run(target, calls):
+    async with AsyncCalculatorClient(target) as calc:
+        start = time.perf_counter()
+        # Todas as chamadas são disparadas juntas, no mesmo canal
+        results = await asyncio.gather(*(calc.add(i, i) for i in range(calls)))
+        elapsed = time.perf_counter() - start
+
+    wrong = sum(1 for i, value in enumerate(results) if value != 2 * i)
+    print(f"[Cliente] {calls} somas em {elapsed:.2f}s ({calls / elapsed:,.0f} chamadas/s), {wrong} erradas")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cliente asyncio da calculadora gRPC")
+    parser.add_argument('--target', default='localhost:50051', help="Endereço do servidor (padrão: localhost:50051)")
+    parser.add_argument('--calls', type=int, default=1000, help="Somas disparadas ao mesmo tempo (padrão: 1000)")
+    args = parser.parse_args()
+    asyncio.run(run(args.target, args.calls))
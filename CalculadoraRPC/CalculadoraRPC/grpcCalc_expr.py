@@ -0,0 +1,250 @@
+# grpcCalc_expr.py
+#
+# Expressões do Evaluate: "(a + b) * c / d" com as variáveis vindas na
+# requisição. O texto é analisado com o módulo ast do Python, conferido
+# contra uma lista fechada de nós (números, variáveis, + - * / // % **,
+# sinais e parênteses) e compilado para bytecode uma única vez; o
+# ExpressionCache guarda o resultado por texto (LRU), então uma fórmula
+# repetida não é analisada de novo.
+#
+# Divisões (/ // %) viram chamadas a funções do namespace de avaliação, o
+# que permite rodar o mesmo bytecode de dois jeitos:
+#   uma linha  -> floats do Python; divisão por zero levanta ZeroDivisionError
+#   várias     -> arrays NumPy (uma chamada por operação para todas as linhas),
+#                 com os divisores zero marcados numa máscara
+# Erros por linha usam os códigos do ComputeVector: INVALID_ARGUMENT na
+# divisão por zero, OUT_OF_RANGE se o resultado não é um número finito.
+
+import ast
+import math
+import operator
+import grpc
+from grpcCalc_cache import LRUCache
+
+# NumPy é opcional: sem ele várias linhas são avaliadas uma a uma
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INVALID_ARGUMENT = grpc.StatusCode.INVALID_ARGUMENT.value[0]
+OUT_OF_RANGE = grpc.StatusCode.OUT_OF_RANGE.value[0]
+
+# Limites contra expressões que custam caro só para compilar
+MAX_EXPRESSION_LENGTH = 4096
+EXPRESSION_CACHE_SIZE = 1024
+
+_ARITHMETIC = (ast.Add, ast.Sub, ast.Mult, ast.Pow)
+_DIVISIONS = {ast.Div: '_div', ast.FloorDiv: '_floordiv', ast.Mod: '_mod'}
+_UNARY = (ast.UAdd, ast.USub)
+
+
+class ExpressionError(ValueError):
+    """Expressão inválida ou variáveis que não batem (erro da chamada inteira)."""
+
+
+class _Compiler(ast.NodeTransformer):
+    # Recusa qualquer nó fora da lista; troca divisões por chamadas e
+    # constantes inteiras por float (toda a conta é em ponto flutuante)
+
+    def __init__(self):
+        self.names = set()
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"Erro: Elemento não permitido na expressão: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float):
+            raise ExpressionError(f"Erro: Constante não permitida na expressão: {node.value!r}")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node):
+        if node.id.startswith('_'):
+            raise ExpressionError(f"Erro: Nome de variável inválido: {node.id}")
+        self.names.add(node.id)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY):
+            raise ExpressionError("Erro: Operador não permitido na expressão!")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_BinOp(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        func = _DIVISIONS.get(type(node.op))
+        if func is not None:
+            call = ast.Call(func=ast.Name(func, ast.Load()), args=[left, right], keywords=[])
+            return ast.copy_location(call, node)
+        if not isinstance(node.op, _ARITHMETIC):
+            raise ExpressionError("Erro: Operador não permitido na expressão!")
+        node.left, node.right = left, right
+        return node
+
+
+class CompiledExpression:
+    """Bytecode de uma expressão já conferida e os nomes das suas variáveis."""
+
+    __slots__ = ('text', 'code', 'names')
+
+    def __init__(self, text, code, names):
+        self.text = text
+        self.code = code
+        self.names = names
+
+    def evaluate(self, variables):
+        """Uma linha: dict nome -> float. Levanta ZeroDivisionError/OverflowError."""
+        return eval(self.code, _SCALAR_NAMESPACE, variables)
+
+    def evaluate_rows(self, variables, columns):
+        """
+        Várias linhas: variables (nome -> float) valem para todas, columns
+        (nome -> sequência de floats) têm um valor por linha.
+        Retorna (lista de resultados, lista de códigos de erro; 0 = OK).
+        """
+        rows = _row_count(columns)
+        if np is not None:
+            return self._evaluate_numpy(variables, columns, rows)
+        values, errors = [], []
+        row = dict(variables)
+        for i in range(rows):
+            for name, column in columns.items():
+                row[name] = column[i]
+            value, code = _checked(self, row)
+            values.append(value)
+            errors.append(code)
+        return values, errors
+
+    def _evaluate_numpy(self, variables, columns, rows):
+        zero = np.zeros(rows, dtype=bool)
+
+        def divide(func):
+            def call(x, y):
+                nonlocal zero
+                zero = zero | (np.asarray(y) == 0)
+                return func(x, y)
+            return call
+
+        namespace = {'__builtins__': {}, '_div': divide(np.true_divide),
+                     '_floordiv': divide(np.floor_divide), '_mod': divide(np.mod)}
+        # Escalares NumPy também nas variáveis fixas: estouro vira inf, não exceção
+        arrays = {name: np.float64(value) for name, value in variables.items()}
+        for name, column in columns.items():
+            arrays[name] = np.asarray(column, dtype=np.float64)
+        with np.errstate(all='ignore'):
+            try:
+                result = eval(self.code, namespace, arrays)
+            except OverflowError:
+                result = np.inf # Só constantes, ex.: 10.0 ** 400
+            if np.iscomplexobj(result):
+                # ex.: (-8) ** 0.5 entre constantes (o NumPy já dá nan nos arrays)
+                result = np.where(np.imag(result) == 0, np.real(result), np.nan)
+            result = np.broadcast_to(result, (rows,)).astype(np.float64)
+        errors = np.zeros(rows, dtype=np.uint8)
+        errors[~np.isfinite(result)] = OUT_OF_RANGE
+        errors[zero] = INVALID_ARGUMENT
+        result[errors != 0] = 0.0
+        return result, errors
+
+
+def _python_division(func):
+    def call(x, y):
+        if y == 0:
+            raise ZeroDivisionError
+        return func(x, y)
+    return call
+
+
+# Namespace da avaliação de uma linha: nada de builtins, só as divisões
+_SCALAR_NAMESPACE = {
+    '__builtins__': {},
+    '_div': _python_division(operator.truediv),
+    '_floordiv': _python_division(operator.floordiv),
+    '_mod': _python_division(operator.mod),
+}
+
+
+def _checked(expression, variables):
+    # Uma linha com o erro virando código, como no caminho NumPy
+    try:
+        value = expression.evaluate(variables)
+    except ZeroDivisionError:
+        return 0.0, INVALID_ARGUMENT
+    except OverflowError:
+        return 0.0, OUT_OF_RANGE
+    if isinstance(value, complex) or not math.isfinite(value):
+        return 0.0, OUT_OF_RANGE # ex.: (-8) ** 0.5
+    return value, 0
+
+
+def _check_bindings(names):
+    # As variáveis viram os locals do eval: um nome como '_div' esconderia
+    # as funções de divisão do namespace (mesma regra do visit_Name)
+    for name in names:
+        if name.startswith('_') or not name.isidentifier():
+            raise ExpressionError(f"Erro: Nome de variável inválido: {name}")
+
+
+def _row_count(columns):
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ExpressionError("Erro: Colunas de variáveis com tamanhos diferentes!")
+    return lengths.pop() if lengths else 1
+
+
+def compile_expression(text):
+    """Texto -> CompiledExpression (levanta ExpressionError se a expressão não é permitida)."""
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Erro: Expressão com mais de {MAX_EXPRESSION_LENGTH} caracteres!")
+    compiler = _Compiler()
+    # Aninhamento fundo (ex.: "-" * 3000 + "1") estoura a pilha já no
+    # ast.parse, no compilador ou no compile(), mesmo abaixo do limite de tamanho
+    try:
+        try:
+            tree = ast.parse(text.strip(), mode='eval')
+        except (SyntaxError, ValueError):
+            raise ExpressionError("Erro: Expressão com sintaxe inválida!") from None
+        tree = ast.fix_missing_locations(compiler.visit(tree))
+        code = compile(tree, '<expressão>', 'eval')
+    except (RecursionError, MemoryError):
+        raise ExpressionError("Erro: Expressão aninhada demais!") from None
+    return CompiledExpression(text, code, frozenset(compiler.names))
+
+
+class ExpressionCache:
+    """Expressões compiladas por texto, num LRUCache de até maxsize entradas."""
+
+    def __init__(self, maxsize=EXPRESSION_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+
+    def get(self, text):
+        return self.cache.get_or_compute(text, compile_expression)
+
+    def stats(self):
+        return self.cache.stats()
+
+
+def evaluate_request(expression, variables, columns):
+    """
+    Avalia uma expressão compilada com as variáveis da requisição.
+    Sem colunas é uma linha só. Retorna (resultados, códigos de erro,
+    número de erros); levanta ExpressionError se falta variável ou se
+    alguma tem nome inválido.
+    """
+    _check_bindings(variables)
+    _check_bindings(columns)
+    missing = expression.names.difference(variables, columns)
+    if missing:
+        raise ExpressionError(f"Erro: Variáveis sem valor: {', '.join(sorted(missing))}")
+    if not columns:
+        value, code = _checked(expression, dict(variables))
+        return [value], [code], int(code != 0)
+    values, errors = expression.evaluate_rows(variables, columns)
+    if np is not None:
+        return values, errors, int(np.count_nonzero(errors))
+    return values, errors, len(errors) - errors.count(0)
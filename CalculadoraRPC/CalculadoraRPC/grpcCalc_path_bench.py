@@ -0,0 +1,96 @@
+# grpcCalc_path_bench.py
+#
+# Microbenchmark dos handlers da calculadora, sem rede: chama os métodos do
+# CalculatorServicer direto (com o log do servidor descartado) e mede
+# o custo por chamada de cada caminho:
+#   int32    -> Add/Mul/Div originais (o caminho comum, que não pode piorar)
+#   big/64   -> AddBig/MulBig com operandos que cabem em 64 bits (campo small)
+#   big/1024 -> MulBig com operandos de 1024 bits (bytes)
+#   float    -> DivFloat
+#   expr     -> Evaluate com a expressão já no cache, sem cache (analisa e
+#               compila a cada chamada) e com 1000 linhas de valores
+# Rode antes e depois de uma mudança para comparar o caminho int32.
+#
+# Exemplo:
+#   py grpcCalc_path_bench.py --calls 200000
+
+import argparse
+import contextlib
+import json
+import os
+import time
+import grpcCalc_pb2
+import grpcCalc_server
+from grpcCalc_server import CalculatorServicer
+from grpcCalc_bigint import to_message
+
+
+class NullContext:
+    # Só o que os handlers usam do ServicerContext
+    def set_code(self, code):
+        pass
+
+    def set_details(self, details):
+        pass
+
+
+def cases():
+    big = 3 ** 646 # ~1024 bits
+    int32 = grpcCalc_pb2.Operands(x=123456, y=789)
+    small = grpcCalc_pb2.BigOperands(x=to_message(2**40 + 5), y=to_message(12345))
+    large = grpcCalc_pb2.BigOperands(x=to_message(big), y=to_message(big - 1))
+    if not hasattr(grpcCalc_pb2, 'EvaluateRequest'):
+        formula = rows = None
+    else:
+        formula = grpcCalc_pb2.EvaluateRequest(
+            expression='(a + b) * c / d', variables={'a': 1, 'b': 2, 'c': 3, 'd': 4})
+        rows = grpcCalc_pb2.EvaluateRequest(
+            expression='(a + b) * c / d', variables={'c': 3, 'd': 4},
+            columns={'a': grpcCalc_pb2.Column(values=range(1000)),
+                     'b': grpcCalc_pb2.Column(values=range(1000))})
+    # (nome, método, requisição, argumentos do CalculatorServicer)
+    return [
+        ('int32 Add', 'Add', int32, {}),
+        ('int32 Mul', 'Mul', int32, {}),
+        ('int32 Div', 'Div', int32, {}),
+        ('big/64 AddBig', 'AddBig', small, {}),
+        ('big/64 MulBig', 'MulBig', small, {}),
+        ('big/1024 MulBig', 'MulBig', large, {}),
+        ('float DivFloat', 'DivFloat', small, {}),
+        ('expr cache', 'Evaluate', formula, {}),
+        ('expr sem cache', 'Evaluate', formula, {'expression_cache_size': 0}),
+        ('expr 1000 linhas', 'Evaluate', rows, {}),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo por chamada dos handlers da calculadora (sem rede)")
+    parser.add_argument('--calls', type=int, default=200000, help="Chamadas por caso (padrão: 200000)")
+    args = parser.parse_args()
+
+    context = NullContext()
+    results = []
+    with open(os.devnull, 'w') as devnull:
+        # Versões antigas do servidor usam print (daí o redirect_stdout abaixo)
+        server_log = getattr(grpcCalc_server, 'log', None)
+        if server_log is not None:
+            server_log.configure(stream=devnull)
+        for label, method, request, kwargs in cases():
+            if method not in vars(CalculatorServicer):
+                continue # Versão antiga do servidor, sem esta operação
+            handler = getattr(CalculatorServicer(**kwargs), method)
+            with contextlib.redirect_stdout(devnull):
+                handler(request, context) # Aquecimento
+                start = time.perf_counter()
+                for _ in range(args.calls):
+                    handler(request, context)
+                elapsed = time.perf_counter() - start
+            results.append({'case': label, 'calls': args.calls, 'ns_per_call': elapsed / args.calls * 1e9})
+            print(f"[Bench] {label:>16} | {elapsed / args.calls * 1e9:>8.0f} ns/chamada")
+        if server_log is not None:
+            server_log.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -24,17 +24,61 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0egrpcCalc.proto\" \n\x08Operands\x12\t\n\x01x\x18\x01 \x01(\x05\x12\t\n\x01y\x18\x02 \x01(\x05\"\x17\n\x06Result\x12\r\n\x05value\x18\x01 \x01(\x05\x32\x80\x01\n\nCalculator\x12\x1b\n\x03\x41\x64\x64\x12\t.Operands\x1a\x07.Result\"\x00\x12\x1b\n\x03Sub\x12\t.Operands\x1a\x07.Result\"\x00\x12\x1b\n\x03Mul\x12\t.Operands\x1a\x07.Result\"\x00\x12\x1b\n\x03\x44iv\x12\t.Operands\x1a\x07.Result\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0egrpcCalc.proto\" \n\x08Operands\x12\t\n\x01x\x18\x01 \x01(\x05\x12\t\n\x01y\x18\x02 \x01(\x05\"\x17\n\x06Result\x12\r\n\x05value\x18\x01 \x01(\x05\"1\n\x06\x42igInt\x12\x0f\n\x05small\x18\x01 \x01(\x12H\x00\x12\r\n\x03\x62ig\x18\x02 \x01(\x0cH\x00\x42\x07\n\x05value\"5\n\x0b\x42igOperands\x12\x12\n\x01x\x18\x01 \x01(\x0b\x32\x07.BigInt\x12\x12\n\x01y\x18\x02 \x01(\x0b\x32\x07.BigInt\"#\n\tBigResult\x12\x16\n\x05value\x18\x01 \x01(\x0b\x32\x07.BigInt\"\x1c\n\x0b\x46loatResult\x12\r\n\x05value\x18\x01 \x01(\x01\">\n\tOperation\x12\x0f\n\x02op\x18\x01 \x01(\x0e\x32\x03.Op\x12\t\n\x01x\x18\x02 \x01(\x05\x12\t\n\x01y\x18\x03 \x01(\x05\x12\n\n\x02id\x18\x04 \x01(\x04\"I\n\x0fOperationResult\x12\r\n\x05value\x18\x01 \x01(\x05\x12\x0c\n\x04\x63ode\x18\x02 \x01(\x05\x12\r\n\x05\x65rror\x18\x03 \x01(\t\x12\n\n\x02id\x18\x04 \x01(\x04\".\n\x0c\x42\x61tchRequest\x12\x1e\n\noperations\x18\x01 \x03(\x0b\x32\n.Operation\"2\n\rBatchResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.OperationResult\"m\n\rVectorRequest\x12\x0f\n\x02op\x18\x01 \x01(\x0e\x32\x03.Op\x12\t\n\x01x\x18\x02 \x03(\x05\x12\t\n\x01y\x18\x03 \x03(\x05\x12\x0e\n\x06x_data\x18\x04 \x01(\x0c\x12\x0e\n\x06y_data\x18\x05 \x01(\x0c\x12\x15\n\x05\x64type\x18\x06 \x01(\x0e\x32\x06.DType\"\\\n\x0eVectorResponse\x12\x0e\n\x06values\x18\x01 \x01(\x0c\x12\x15\n\x05\x64type\x18\x02 \x01(\x0e\x32\x06.DType\x12\x0e\n\x06\x65rrors\x18\x03 \x01(\x0c\x12\x13\n\x0b\x65rror_count\x18\x04 \x01(\r\"\x18\n\x06\x43olumn\x12\x0e\n\x06values\x18\x01 \x03(\x01\"\xf4\x01\n\x0f\x45valuateRequest\x12\x12\n\nexpression\x18\x01 \x01(\t\x12\x32\n\tvariables\x18\x02 \x03(\x0b\x32\x1f.EvaluateRequest.VariablesEntry\x12.\n\x07\x63olumns\x18\x03 \x03(\x0b\x32\x1d.EvaluateRequest.ColumnsEntry\x1a\x30\n\x0eVariablesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\x1a\x37\n\x0c\x43olumnsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x16\n\x05value\x18\x02 \x01(\x0b\x32\x07.Column:\x02\x38\x01\"G\n\x10\x45valuateResponse\x12\x0e\n\x06values\x18\x01 \x03(\x01\x12\x0e\n\x06\x65rrors\x18\x02 \x01(\x0c\x12\x13\n\x0b\x65rror_count\x18\x03 \x01(\r\"\x8e\x01\n\nCacheStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06policy\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x04\x12\x0f\n\x07maxsize\x18\x04 \x01(\x04\x12\x0c\n\x04hits\x18\x05 \x01(\x04\x12\x0e\n\x06misses\x18\x06 \x01(\x04\x12\x11\n\tevictions\x18\x07 \x01(\x04\x12\x12\n\nrejections\x18\x08 \x01(\x04\"\x13\n\x11\x43\x61\x63heStatsRequest\"1\n\x12\x43\x61\x63heStatsResponse\x12\x1b\n\x06\x63\x61\x63hes\x18\x01 \x03(\x0b\x32\x0b.CacheStats*<\n\x02Op\x12\x12\n\x0eOP_UNSPECIFIED\x10\x00\x12\x07\n\x03\x41\x44\x44\x10\x01\x12\x07\n\x03SUB\x10\x02\x12\x07\n\x03MUL\x10\x03\x12\x07\n\x03\x44IV\x10\x04*\x1d\n\x05\x44Type\x12\t\n\x05INT32\x10\x00\x12\t\n\x05INT64\x10\x01\x32\xcb\x04\n\nCalculator\x12\x1b\n\x03\x41\x64\x64\x12\t.Operands\x1a\x07.Result\"\x00\x12\x1b\n\x03Sub\x12\t.Operands\x1a\x07.Result\"\x00\x12\x1b\n\x03Mul\x12\t.Operands\x1a\x07.Result\"\x00\x12\x1b\n\x03\x44iv\x12\t.Operands\x1a\x07.Result\"\x00\x12$\n\x06\x41\x64\x64\x42ig\x12\x0c.BigOperands\x1a\n.BigResult\"\x00\x12$\n\x06SubBig\x12\x0c.BigOperands\x1a\n.BigResult\"\x00\x12$\n\x06MulBig\x12\x0c.BigOperands\x1a\n.BigResult\"\x00\x12$\n\x06\x44ivBig\x12\x0c.BigOperands\x1a\n.BigResult\"\x00\x12(\n\x08\x44ivFloat\x12\x0c.BigOperands\x1a\x0c.FloatResult\"\x00\x12/\n\x0c\x42\x61tchCompute\x12\r.BatchRequest\x1a\x0e.BatchResponse\"\x00\x12\x33\n\rComputeStream\x12\n.Operation\x1a\x10.OperationResult\"\x00(\x01\x30\x01\x12\x32\n\rComputeVector\x12\x0e.VectorRequest\x1a\x0f.VectorResponse\"\x00\x12\x31\n\x08\x45valuate\x12\x10.EvaluateRequest\x1a\x11.EvaluateResponse\"\x00\x12:\n\rGetCacheStats\x12\x12.CacheStatsRequest\x1a\x13.CacheStatsResponse\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'grpcCalc_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_EVALUATEREQUEST_VARIABLESENTRY']._loaded_options = None
+  _globals['_EVALUATEREQUEST_VARIABLESENTRY']._serialized_options = b'8\001'
+  _globals['_EVALUATEREQUEST_COLUMNSENTRY']._loaded_options = None
+  _globals['_EVALUATEREQUEST_COLUMNSENTRY']._serialized_options = b'8\001'
+  _globals['_OP']._serialized_start=1257
+  _globals['_OP']._serialized_end=1317
+  _globals['_DTYPE']._serialized_start=1319
+  _globals['_DTYPE']._serialized_end=1348
   _globals['_OPERANDS']._serialized_start=18
   _globals['_OPERANDS']._serialized_end=50
   _globals['_RESULT']._serialized_start=52
   _globals['_RESULT']._serialized_end=75
-  _globals['_CALCULATOR']._serialized_start=78
-  _globals['_CALCULATOR']._serialized_end=206
+  _globals['_BIGINT']._serialized_start=77
+  _globals['_BIGINT']._serialized_end=126
+  _globals['_BIGOPERANDS']._serialized_start=128
+  _globals['_BIGOPERANDS']._serialized_end=181
+  _globals['_BIGRESULT']._serialized_start=183
+  _globals['_BIGRESULT']._serialized_end=218
+  _globals['_FLOATRESULT']._serialized_start=220
+  _globals['_FLOATRESULT']._serialized_end=248
+  _globals['_OPERATION']._serialized_start=250
+  _globals['_OPERATION']._serialized_end=312
+  _globals['_OPERATIONRESULT']._serialized_start=314
+  _globals['_OPERATIONRESULT']._serialized_end=387
+  _globals['_BATCHREQUEST']._serialized_start=389
+  _globals['_BATCHREQUEST']._serialized_end=435
+  _globals['_BATCHRESPONSE']._serialized_start=437
+  _globals['_BATCHRESPONSE']._serialized_end=487
+  _globals['_VECTORREQUEST']._serialized_start=489
+  _globals['_VECTORREQUEST']._serialized_end=598
+  _globals['_VECTORRESPONSE']._serialized_start=600
+  _globals['_VECTORRESPONSE']._serialized_end=692
+  _globals['_COLUMN']._serialized_start=694
+  _globals['_COLUMN']._serialized_end=718
+  _globals['_EVALUATEREQUEST']._serialized_start=721
+  _globals['_EVALUATEREQUEST']._serialized_end=965
+  _globals['_EVALUATEREQUEST_VARIABLESENTRY']._serialized_start=860
+  _globals['_EVALUATEREQUEST_VARIABLESENTRY']._serialized_end=908
+  _globals['_EVALUATEREQUEST_COLUMNSENTRY']._serialized_start=910
+  _globals['_EVALUATEREQUEST_COLUMNSENTRY']._serialized_end=965
+  _globals['_EVALUATERESPONSE']._serialized_start=967
+  _globals['_EVALUATERESPONSE']._serialized_end=1038
+  _globals['_CACHESTATS']._serialized_start=1041
+  _globals['_CACHESTATS']._serialized_end=1183
+  _globals['_CACHESTATSREQUEST']._serialized_start=1185
+  _globals['_CACHESTATSREQUEST']._serialized_end=1204
+  _globals['_CACHESTATSRESPONSE']._serialized_start=1206
+  _globals['_CACHESTATSRESPONSE']._serialized_end=1255
+  _globals['_CALCULATOR']._serialized_start=1351
+  _globals['_CALCULATOR']._serialized_end=1938
 # @@protoc_insertion_point(module_scope)
@@ -55,6 +55,56 @@ class CalculatorStub(object):
                 request_serializer=grpcCalc__pb2.Operands.SerializeToString,
                 response_deserializer=grpcCalc__pb2.Result.FromString,
                 _registered_method=True)
+        self.AddBig = channel.unary_unary(
+                '/Calculator/AddBig',
+                request_serializer=grpcCalc__pb2.BigOperands.SerializeToString,
+                response_deserializer=grpcCalc__pb2.BigResult.FromString,
+                _registered_method=True)
+        self.SubBig = channel.unary_unary(
+                '/Calculator/SubBig',
+                request_serializer=grpcCalc__pb2.BigOperands.SerializeToString,
+                response_deserializer=grpcCalc__pb2.BigResult.FromString,
+                _registered_method=True)
+        self.MulBig = channel.unary_unary(
+                '/Calculator/MulBig',
+                request_serializer=grpcCalc__pb2.BigOperands.SerializeToString,
+                response_deserializer=grpcCalc__pb2.BigResult.FromString,
+                _registered_method=True)
+        self.DivBig = channel.unary_unary(
+                '/Calculator/DivBig',
+                request_serializer=grpcCalc__pb2.BigOperands.SerializeToString,
+                response_deserializer=grpcCalc__pb2.BigResult.FromString,
+                _registered_method=True)
+        self.DivFloat = channel.unary_unary(
+                '/Calculator/DivFloat',
+                request_serializer=grpcCalc__pb2.BigOperands.SerializeToString,
+                response_deserializer=grpcCalc__pb2.FloatResult.FromString,
+                _registered_method=True)
+        self.BatchCompute = channel.unary_unary(
+                '/Calculator/BatchCompute',
+                request_serializer=grpcCalc__pb2.BatchRequest.SerializeToString,
+                response_deserializer=grpcCalc__pb2.BatchResponse.FromString,
+                _registered_method=True)
+        self.ComputeStream = channel.stream_stream(
+                '/Calculator/ComputeStream',
+                request_serializer=grpcCalc__pb2.Operation.SerializeToString,
+                response_deserializer=grpcCalc__pb2.OperationResult.FromString,
+                _registered_method=True)
+        self.ComputeVector = channel.unary_unary(
+                '/Calculator/ComputeVector',
+                request_serializer=grpcCalc__pb2.VectorRequest.SerializeToString,
+                response_deserializer=grpcCalc__pb2.VectorResponse.FromString,
+                _registered_method=True)
+        self.Evaluate = channel.unary_unary(
+                '/Calculator/Evaluate',
+                request_serializer=grpcCalc__pb2.EvaluateRequest.SerializeToString,
+                response_deserializer=grpcCalc__pb2.EvaluateResponse.FromString,
+                _registered_method=True)
+        self.GetCacheStats = channel.unary_unary(
+                '/Calculator/GetCacheStats',
+                request_serializer=grpcCalc__pb2.CacheStatsRequest.SerializeToString,
+                response_deserializer=grpcCalc__pb2.CacheStatsResponse.FromString,
+                _registered_method=True)
 
 
 class CalculatorServicer(object):
@@ -85,6 +135,74 @@ class CalculatorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AddBig(self, request, context):
+        """Mesmas operações com inteiros de 64 bits ou de precisão arbitrária
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SubBig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def MulBig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DivBig(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DivFloat(self, request, context):
+        """Divisão real (x / y) de inteiros de qualquer tamanho
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchCompute(self, request, context):
+        """Várias operações em uma chamada; um erro afeta só o próprio item
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ComputeStream(self, request_iterator, context):
+        """Operações em fluxo contínuo: um resultado por operação, na mesma ordem
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ComputeVector(self, request, context):
+        """Uma operação sobre vetores inteiros de operandos (avaliada com NumPy)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Evaluate(self, request, context):
+        """Uma expressão inteira em uma chamada; o servidor guarda a expressão
+        compilada, então repetir a mesma fórmula não a analisa de novo
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCacheStats(self, request, context):
+        """Contadores dos caches do servidor, para escolher o tamanho
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CalculatorServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -108,6 +226,56 @@ def add_CalculatorServicer_to_server(servicer, server):
                     request_deserializer=grpcCalc__pb2.Operands.FromString,
                     response_serializer=grpcCalc__pb2.Result.SerializeToString,
             ),
+            'AddBig': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddBig,
+                    request_deserializer=grpcCalc__pb2.BigOperands.FromString,
+                    response_serializer=grpcCalc__pb2.BigResult.SerializeToString,
+            ),
+            'SubBig': grpc.unary_unary_rpc_method_handler(
+                    servicer.SubBig,
+                    request_deserializer=grpcCalc__pb2.BigOperands.FromString,
+                    response_serializer=grpcCalc__pb2.BigResult.SerializeToString,
+            ),
+            'MulBig': grpc.unary_unary_rpc_method_handler(
+                    servicer.MulBig,
+                    request_deserializer=grpcCalc__pb2.BigOperands.FromString,
+                    response_serializer=grpcCalc__pb2.BigResult.SerializeToString,
+            ),
+            'DivBig': grpc.unary_unary_rpc_method_handler(
+                    servicer.DivBig,
+                    request_deserializer=grpcCalc__pb2.BigOperands.FromString,
+                    response_serializer=grpcCalc__pb2.BigResult.SerializeToString,
+            ),
+            'DivFloat': grpc.unary_unary_rpc_method_handler(
+                    servicer.DivFloat,
+                    request_deserializer=grpcCalc__pb2.BigOperands.FromString,
+                    response_serializer=grpcCalc__pb2.FloatResult.SerializeToString,
+            ),
+            'BatchCompute': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchCompute,
+                    request_deserializer=grpcCalc__pb2.BatchRequest.FromString,
+                    response_serializer=grpcCalc__pb2.BatchResponse.SerializeToString,
+            ),
+            'ComputeStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.ComputeStream,
+                    request_deserializer=grpcCalc__pb2.Operation.FromString,
+                    response_serializer=grpcCalc__pb2.OperationResult.SerializeToString,
+            ),
+            'ComputeVector': grpc.unary_unary_rpc_method_handler(
+                    servicer.ComputeVector,
+                    request_deserializer=grpcCalc__pb2.VectorRequest.FromString,
+                    response_serializer=grpcCalc__pb2.VectorResponse.SerializeToString,
+            ),
+            'Evaluate': grpc.unary_unary_rpc_method_handler(
+                    servicer.Evaluate,
+                    request_deserializer=grpcCalc__pb2.EvaluateRequest.FromString,
+                    response_serializer=grpcCalc__pb2.EvaluateResponse.SerializeToString,
+            ),
+            'GetCacheStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCacheStats,
+                    request_deserializer=grpcCalc__pb2.CacheStatsRequest.FromString,
+                    response_serializer=grpcCalc__pb2.CacheStatsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'Calculator', rpc_method_handlers)
@@ -227,3 +395,273 @@ class Calculator(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def AddBig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/AddBig',
+            grpcCalc__pb2.BigOperands.SerializeToString,
+            grpcCalc__pb2.BigResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SubBig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/SubBig',
+            grpcCalc__pb2.BigOperands.SerializeToString,
+            grpcCalc__pb2.BigResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def MulBig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/MulBig',
+            grpcCalc__pb2.BigOperands.SerializeToString,
+            grpcCalc__pb2.BigResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DivBig(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/DivBig',
+            grpcCalc__pb2.BigOperands.SerializeToString,
+            grpcCalc__pb2.BigResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DivFloat(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/DivFloat',
+            grpcCalc__pb2.BigOperands.SerializeToString,
+            grpcCalc__pb2.FloatResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchCompute(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/BatchCompute',
+            grpcCalc__pb2.BatchRequest.SerializeToString,
+            grpcCalc__pb2.BatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ComputeStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/Calculator/ComputeStream',
+            grpcCalc__pb2.Operation.SerializeToString,
+            grpcCalc__pb2.OperationResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ComputeVector(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/ComputeVector',
+            grpcCalc__pb2.VectorRequest.SerializeToString,
+            grpcCalc__pb2.VectorResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Evaluate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/Evaluate',
+            grpcCalc__pb2.EvaluateRequest.SerializeToString,
+            grpcCalc__pb2.EvaluateResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetCacheStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Calculator/GetCacheStats',
+            grpcCalc__pb2.CacheStatsRequest.SerializeToString,
+            grpcCalc__pb2.CacheStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
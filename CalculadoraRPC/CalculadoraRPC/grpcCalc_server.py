@@ -1,71 +1,336 @@
-# grpcCalc_server.py
-
-import grpc
-# Importa os módulos que acabamos de gerar
-import grpcCalc_pb2
-import grpcCalc_pb2_grpc
-from concurrent import futures # Para o pool de threads do servidor
-import time
-
-# Esta classe implementa a lógica do servidor.
-# Ela herda da classe gerada "CalculatorServicer"
-class CalculatorServicer(grpcCalc_pb2_grpc.CalculatorServicer):
-
-    # Implementa a função Add, conforme definido no .proto
-    def Add(self, request, context):
-        print(f"[Servidor] Recebida requisição Add: ({request.x}, {request.y})")
-        result = request.x + request.y
-        # Retorna a mensagem de Resultado
-        return grpcCalc_pb2.Result(value=result)
-
-    # Implementa a função Sub
-    def Sub(self, request, context):
-        print(f"[Servidor] Recebida requisição Sub: ({request.x}, {request.y})")
-        result = request.x - request.y
-        return grpcCalc_pb2.Result(value=result)
-
-    # Implementa a função Mul
-    def Mul(self, request, context):
-        print(f"[Servidor] Recebida requisição Mul: ({request.x}, {request.y})")
-        result = request.x * request.y
-        return grpcCalc_pb2.Result(value=result)
-
-    # Implementa a função Div
-    def Div(self, request, context):
-        print(f"[Servidor] Recebida requisição Div: ({request.x}, {request.y})")
-
-        # Tratamento de divisão por zero
-        if request.y == 0:
-            # Envia um erro de volta para o cliente
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details("Erro: Divisão por zero!")
-            return grpcCalc_pb2.Result() # Retorna uma resposta vazia
-
-        result = request.x // request.y # Divisão inteira
-        return grpcCalc_pb2.Result(value=result)
-
-# Função principal para iniciar o servidor
-def serve():
-    # Cria o servidor gRPC
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-
-    # Adiciona nossa lógica (CalculatorServicer) ao servidor
-    grpcCalc_pb2_grpc.add_CalculatorServicer_to_server(
-        CalculatorServicer(), server
-    )
-
-    # Inicia o servidor na porta 50051 (pode ser qualquer porta)
-    print("Iniciando servidor gRPC na porta 50051...")
-    server.add_insecure_port('[::]:50051')
-    server.start()
-
-    # Mantém o servidor rodando
-    try:
-        while True:
-            time.sleep(86400) # Dorme por um dia
-    except KeyboardInterrupt:
-        print("Parando o servidor...")
-        server.stop(0)
-
-if __name__ == '__main__':
-    serve()
\ No newline at end of file
+# grpcCalc_server.py
+
+import argparse
+import os
+import sys
+import grpc
+# Importa os módulos que acabamos de gerar
+import grpcCalc_pb2
+import grpcCalc_pb2_grpc
+from concurrent import futures # Para o pool de threads do servidor
+import time
+import grpcCalc_vector # Caminho vetorizado (NumPy) do ComputeVector
+from grpcCalc_expr import ExpressionCache, ExpressionError, evaluate_request, EXPRESSION_CACHE_SIZE
+from grpcCalc_cache import make_cache, CACHE_POLICIES
+from grpcCalc_bigint import to_message, from_message # Inteiros das operações *Big
+
+# Módulos comuns às duas atividades (rpc_log.py) ficam na pasta de cima
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rpc_log
+import rpc_metrics
+from rpc_log import log, lazy
+
+# Faixa do int32 (tipo de x, y e do resultado no .proto)
+INT32_MIN = -2**31
+INT32_MAX = 2**31 - 1
+
+# Operações em lote / stream: Op do .proto -> função
+OPERATIONS = {
+    grpcCalc_pb2.ADD: lambda x, y: x + y,
+    grpcCalc_pb2.SUB: lambda x, y: x - y,
+    grpcCalc_pb2.MUL: lambda x, y: x * y,
+    grpcCalc_pb2.DIV: lambda x, y: x // y, # Divisão inteira
+}
+
+# Calcula um item de BatchCompute / ComputeStream.
+# Erros viram um OperationResult com code/error, sem derrubar a chamada.
+def compute(operation):
+    func = OPERATIONS.get(operation.op)
+    if func is None:
+        return grpcCalc_pb2.OperationResult(
+            id=operation.id, code=grpc.StatusCode.INVALID_ARGUMENT.value[0],
+            error="Erro: Operação desconhecida!")
+    if operation.op == grpcCalc_pb2.DIV and operation.y == 0:
+        return grpcCalc_pb2.OperationResult(
+            id=operation.id, code=grpc.StatusCode.INVALID_ARGUMENT.value[0],
+            error="Erro: Divisão por zero!")
+    value = func(operation.x, operation.y)
+    if not INT32_MIN <= value <= INT32_MAX:
+        return grpcCalc_pb2.OperationResult(
+            id=operation.id, code=grpc.StatusCode.OUT_OF_RANGE.value[0],
+            error="Erro: Resultado fora da faixa de int32!")
+    return grpcCalc_pb2.OperationResult(id=operation.id, value=value)
+
+# Operações int32 por nome do método (chaves do cache de resultados)
+INT32_METHODS = {
+    'Add': grpcCalc_pb2.ADD,
+    'Sub': grpcCalc_pb2.SUB,
+    'Mul': grpcCalc_pb2.MUL,
+    'Div': grpcCalc_pb2.DIV,
+}
+
+# Chave ('Add', x, y) do cache de resultados -> resultado
+def _int32_value(key):
+    name, x, y = key
+    return OPERATIONS[INT32_METHODS[name]](x, y)
+
+# Resposta das operações *Big. Levanta ValueError (operando inválido) ou
+# ZeroDivisionError; erros não entram no cache.
+def big_result(op, request):
+    x = from_message(request.x)
+    y = from_message(request.y)
+    return grpcCalc_pb2.BigResult(value=to_message(OPERATIONS[op](x, y)))
+
+# Resposta do DivFloat: também pode levantar OverflowError
+def float_result(request):
+    return grpcCalc_pb2.FloatResult(value=from_message(request.x) / from_message(request.y))
+
+# Resultado das operações int32: o protobuf recusa valores fora da faixa,
+# então o estouro vira um erro OUT_OF_RANGE (use as operações *Big)
+def int32_result(value, context):
+    if INT32_MIN <= value <= INT32_MAX:
+        return grpcCalc_pb2.Result(value=value)
+    context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+    context.set_details("Erro: Resultado fora da faixa de int32! Use AddBig/SubBig/MulBig/DivBig.")
+    return grpcCalc_pb2.Result()
+
+# Texto de um operando BigInt para o log (inteiros enormes só pelo tamanho)
+def show(message):
+    if message.WhichOneof('value') == 'big':
+        return f"<inteiro de {len(message.big) * 8} bits>"
+    return str(message.small)
+
+# Esta classe implementa a lógica do servidor.
+# Ela herda da classe gerada "CalculatorServicer"
+class CalculatorServicer(grpcCalc_pb2_grpc.CalculatorServicer):
+
+    # expression_cache_size: expressões compiladas guardadas pelo Evaluate (0 desliga)
+    # result_cache_size: resultados guardados por (op, x, y) para Add/Sub/Mul/Div,
+    # as variantes *Big e DivFloat (0 = sem cache); cache_policy: 'lru' ou 'tinylfu'
+    def __init__(self, expression_cache_size=EXPRESSION_CACHE_SIZE, result_cache_size=0, cache_policy='lru'):
+        self.expressions = ExpressionCache(expression_cache_size)
+        self.results = make_cache(cache_policy, result_cache_size)
+
+    # Implementa a função Add, conforme definido no .proto
+    def Add(self, request, context):
+        log.info("Recebida requisição Add: ({x}, {y})", x=request.x, y=request.y)
+        if self.results is None:
+            result = request.x + request.y
+        else: # Cache de resultados, chave (método, x, y)
+            result = self.results.get_or_compute(('Add', request.x, request.y), _int32_value)
+        # Retorna a mensagem de Resultado
+        return int32_result(result, context)
+
+    # Implementa a função Sub
+    def Sub(self, request, context):
+        log.info("Recebida requisição Sub: ({x}, {y})", x=request.x, y=request.y)
+        if self.results is None:
+            result = request.x - request.y
+        else:
+            result = self.results.get_or_compute(('Sub', request.x, request.y), _int32_value)
+        return int32_result(result, context)
+
+    # Implementa a função Mul
+    def Mul(self, request, context):
+        log.info("Recebida requisição Mul: ({x}, {y})", x=request.x, y=request.y)
+        if self.results is None:
+            result = request.x * request.y
+        else:
+            result = self.results.get_or_compute(('Mul', request.x, request.y), _int32_value)
+        return int32_result(result, context)
+
+    # Implementa a função Div
+    def Div(self, request, context):
+        log.info("Recebida requisição Div: ({x}, {y})", x=request.x, y=request.y)
+
+        # Tratamento de divisão por zero
+        if request.y == 0:
+            # Envia um erro de volta para o cliente
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Erro: Divisão por zero!")
+            return grpcCalc_pb2.Result() # Retorna uma resposta vazia
+
+        if self.results is None:
+            result = request.x // request.y # Divisão inteira
+        else:
+            result = self.results.get_or_compute(('Div', request.x, request.y), _int32_value)
+        return int32_result(result, context) # Só -2^31 // -1 não cabe
+
+    # Operações com inteiros de 64 bits ou de precisão arbitrária.
+    # Operandos que cabem em 64 bits chegam como int direto do protobuf e o
+    # resultado só é codificado em bytes se passar de 64 bits.
+    # O cache guarda a resposta pronta: um acerto não decodifica nem codifica nada.
+    def AddBig(self, request, context):
+        return self._big('AddBig', grpcCalc_pb2.ADD, request, context)
+
+    def SubBig(self, request, context):
+        return self._big('SubBig', grpcCalc_pb2.SUB, request, context)
+
+    def MulBig(self, request, context):
+        return self._big('MulBig', grpcCalc_pb2.MUL, request, context)
+
+    def DivBig(self, request, context):
+        return self._big('DivBig', grpcCalc_pb2.DIV, request, context)
+
+    def _big(self, name, op, request, context):
+        # show() só roda na thread do log, e só se a linha for gravada
+        log.info("Recebida requisição {method}: ({x}, {y})", method=name,
+                 x=lazy(show, request.x), y=lazy(show, request.y))
+        try:
+            if self.results is None:
+                return big_result(op, request)
+            # (x, y) na forma serializada: uma chamada em C, sem decodificar nada
+            key = (name, request.SerializeToString())
+            return self.results.get_or_compute(key, lambda key: big_result(op, request))
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+        except ZeroDivisionError:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Erro: Divisão por zero!")
+        return grpcCalc_pb2.BigResult()
+
+    # Divisão real: x / y com arredondamento correto, mesmo para inteiros enormes
+    def DivFloat(self, request, context):
+        log.info("Recebida requisição DivFloat: ({x}, {y})", x=lazy(show, request.x), y=lazy(show, request.y))
+        try:
+            if self.results is None:
+                return float_result(request)
+            key = ('DivFloat', request.SerializeToString())
+            return self.results.get_or_compute(key, lambda key: float_result(request))
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+        except ZeroDivisionError:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Erro: Divisão por zero!")
+        except OverflowError:
+            context.set_code(grpc.StatusCode.OUT_OF_RANGE)
+            context.set_details("Erro: Resultado grande demais para ponto flutuante!")
+        return grpcCalc_pb2.FloatResult()
+
+    # Várias operações em uma única chamada (um resultado por operação)
+    def BatchCompute(self, request, context):
+        log.info("Recebida requisição BatchCompute: {count} operações", count=len(request.operations))
+        return grpcCalc_pb2.BatchResponse(results=[compute(op) for op in request.operations])
+
+    # Stream bidirecional: cada operação recebida gera um resultado, na ordem
+    def ComputeStream(self, request_iterator, context):
+        log.info("Stream ComputeStream aberto")
+        for operation in request_iterator:
+            yield compute(operation)
+        log.info("Stream ComputeStream fechado")
+
+    # Uma operação sobre vetores inteiros, avaliada de uma vez com NumPy
+    def ComputeVector(self, request, context):
+        if grpcCalc_vector.np is None:
+            context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+            context.set_details("Erro: ComputeVector precisa do NumPy no servidor!")
+            return grpcCalc_pb2.VectorResponse()
+        try:
+            response = grpcCalc_vector.compute_vector(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return grpcCalc_pb2.VectorResponse()
+        log.info("Recebida requisição ComputeVector: {count} operações", count=grpcCalc_vector.item_count(response))
+        return response
+
+    # Uma expressão com variáveis, para uma ou várias linhas de valores
+    def Evaluate(self, request, context):
+        try:
+            expression = self.expressions.get(request.expression)
+            columns = {name: column.values for name, column in request.columns.items()}
+            values, errors, error_count = evaluate_request(expression, request.variables, columns)
+        except ExpressionError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return grpcCalc_pb2.EvaluateResponse()
+        log.info("Recebida requisição Evaluate: '{expression}' ({rows} linhas)",
+                 expression=request.expression, rows=len(values))
+        return grpcCalc_pb2.EvaluateResponse(
+            values=values, errors=bytes(errors) if error_count else b'', error_count=error_count
+        )
+
+    # Contadores dos caches ligados
+    def GetCacheStats(self, request, context):
+        return grpcCalc_pb2.CacheStatsResponse(caches=[
+            grpcCalc_pb2.CacheStats(name=name, **cache.stats()) for name, cache in self._caches()
+        ])
+
+    def _caches(self):
+        caches = [('expressions', self.expressions.cache)]
+        if self.results is not None:
+            caches.append(('results', self.results))
+        return caches
+
+    # Contadores dos caches no /metrics (lidos a cada coleta)
+    def register_metrics(self, registry):
+        def field(key):
+            return lambda: {(name,): cache.stats()[key] for name, cache in self._caches()}
+        for key, help in (('hits', "Acertos"), ('misses', "Faltas"), ('evictions', "Remoções"),
+                          ('rejections', "Itens novos recusados pela política")):
+            registry.counter(f'calc_cache_{key}_total', f"{help} do cache", ('cache',), callback=field(key))
+        registry.gauge('calc_cache_size', "Itens no cache", ('cache',), callback=field('size'))
+        registry.gauge('calc_cache_maxsize', "Capacidade do cache", ('cache',), callback=field('maxsize'))
+
+    # Resumo dos caches no log (ao parar o servidor)
+    def log_cache_stats(self):
+        for name, cache in self._caches():
+            stats = cache.stats()
+            lookups = stats['hits'] + stats['misses']
+            log.info("Cache {cache} ({policy}, {size}/{maxsize}): {hits} acertos, {misses} faltas "
+                     "({hit_ratio:.1%}), {evictions} remoções, {rejections} recusas",
+                     cache=name, hit_ratio=stats['hits'] / lookups if lookups else 0.0, **stats)
+
+def start_metrics(metrics, servicer, port):
+    """Acrescenta os caches às métricas gRPC e serve /metrics na porta dada."""
+    servicer.register_metrics(metrics.registry)
+    print(f"Métricas em http://127.0.0.1:{port}/metrics")
+    return rpc_metrics.start_http_server(metrics.registry, port)
+
+# Função principal para iniciar o servidor
+def serve(expression_cache_size=EXPRESSION_CACHE_SIZE, result_cache_size=0, cache_policy='lru', metrics_port=0):
+    # Cria o servidor gRPC (com o interceptor de métricas, se pedido)
+    executor = futures.ThreadPoolExecutor(max_workers=10)
+    metrics = rpc_metrics.ServerMetrics() if metrics_port else None
+    server = grpc.server(executor, interceptors=[metrics.interceptor()] if metrics else None)
+
+    # Adiciona nossa lógica (CalculatorServicer) ao servidor
+    servicer = CalculatorServicer(expression_cache_size, result_cache_size, cache_policy)
+    grpcCalc_pb2_grpc.add_CalculatorServicer_to_server(servicer, server)
+    metrics_server = None
+    if metrics:
+        metrics.watch_executor(executor)
+        metrics_server = start_metrics(metrics, servicer, metrics_port)
+
+    # Inicia o servidor na porta 50051 (pode ser qualquer porta)
+    print("Iniciando servidor gRPC na porta 50051...")
+    server.add_insecure_port('[::]:50051')
+    server.start()
+
+    # Mantém o servidor rodando
+    try:
+        while True:
+            time.sleep(86400) # Dorme por um dia
+    except KeyboardInterrupt:
+        print("Parando o servidor...")
+        server.stop(0)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        servicer.log_cache_stats()
+        log.close() # Grava o que ainda está na fila do log
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor da calculadora gRPC")
+    parser.add_argument('--mode', choices=['threads', 'aio'], default='threads',
+                        help="threads: pool de threads (padrão); aio: servidor asyncio (grpc.aio)")
+    parser.add_argument('--expr-cache', type=int, default=EXPRESSION_CACHE_SIZE,
+                        help=f"Expressões compiladas guardadas pelo Evaluate (padrão: {EXPRESSION_CACHE_SIZE}; 0 desliga)")
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help="Resultados guardados por (op, x, y) em Add/Sub/Mul/Div, *Big e DivFloat (padrão: 0, sem cache)")
+    parser.add_argument('--cache-policy', choices=sorted(CACHE_POLICIES), default='lru',
+                        help="Política do cache de resultados (padrão: lru)")
+    rpc_log.add_arguments(parser)
+    rpc_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    rpc_log.configure_from_args(args)
+    if args.mode == 'aio':
+        import asyncio
+        from grpcCalc_server_aio import serve_async
+        try:
+            asyncio.run(serve_async(args.expr_cache, args.cache_size, args.cache_policy, args.metrics_port))
+        except KeyboardInterrupt:
+            pass # serve_async já parou o servidor
+    else:
+        serve(args.expr_cache, args.cache_size, args.cache_policy, args.metrics_port)
\ No newline at end of file
@@ -0,0 +1,92 @@
+# grpcCalc_server_aio.py
+#
+# Versão asyncio (grpc.aio) do servidor da calculadora.
+# No servidor com pool de threads no máximo 10 chamadas andam ao mesmo
+# tempo; aqui cada chamada é uma corrotina no event loop, então milhares
+# podem ficar em andamento no mesmo canal.
+#
+# Uso:
+#   py grpcCalc_server.py --mode aio
+
+import asyncio
+import grpc
+import grpcCalc_pb2_grpc
+from grpcCalc_server import CalculatorServicer, compute, log, start_metrics
+import rpc_metrics # Pasta de cima, já no sys.path pelo import acima
+from grpcCalc_expr import EXPRESSION_CACHE_SIZE
+
+
+# As operações não bloqueiam, então as corrotinas reaproveitam a lógica
+# do servidor síncrono (inclusive o erro de divisão por zero)
+class AsyncCalculatorServicer(CalculatorServicer):
+
+    async def Add(self, request, context):
+        return super().Add(request, context)
+
+    async def Sub(self, request, context):
+        return super().Sub(request, context)
+
+    async def Mul(self, request, context):
+        return super().Mul(request, context)
+
+    async def Div(self, request, context):
+        return super().Div(request, context)
+
+    async def AddBig(self, request, context):
+        return super().AddBig(request, context)
+
+    async def SubBig(self, request, context):
+        return super().SubBig(request, context)
+
+    async def MulBig(self, request, context):
+        return super().MulBig(request, context)
+
+    async def DivBig(self, request, context):
+        return super().DivBig(request, context)
+
+    async def DivFloat(self, request, context):
+        return super().DivFloat(request, context)
+
+    async def BatchCompute(self, request, context):
+        return super().BatchCompute(request, context)
+
+    async def ComputeVector(self, request, context):
+        return super().ComputeVector(request, context)
+
+    async def Evaluate(self, request, context):
+        return super().Evaluate(request, context)
+
+    async def GetCacheStats(self, request, context):
+        return super().GetCacheStats(request, context)
+
+    async def ComputeStream(self, request_iterator, context):
+        log.info("Stream ComputeStream aberto")
+        async for operation in request_iterator:
+            yield compute(operation)
+        log.info("Stream ComputeStream fechado")
+
+
+async def serve_async(expression_cache_size=EXPRESSION_CACHE_SIZE, result_cache_size=0, cache_policy='lru',
+                      metrics_port=0):
+    # Sem pool de threads: das métricas gRPC só não há a fila do pool
+    metrics = rpc_metrics.ServerMetrics() if metrics_port else None
+    server = grpc.aio.server(interceptors=[metrics.aio_interceptor()] if metrics else None)
+    servicer = AsyncCalculatorServicer(expression_cache_size, result_cache_size, cache_policy)
+    grpcCalc_pb2_grpc.add_CalculatorServicer_to_server(servicer, server)
+    metrics_server = start_metrics(metrics, servicer, metrics_port) if metrics else None
+
+    print("Iniciando servidor gRPC (asyncio) na porta 50051...")
+    server.add_insecure_port('[::]:50051')
+    await server.start()
+
+    try:
+        await server.wait_for_termination()
+    except asyncio.CancelledError:
+        # Ctrl+C: asyncio.run cancela esta corrotina
+        print("Parando o servidor...")
+        await server.stop(0)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        servicer.log_cache_stats()
+        log.close() # Grava o que ainda está na fila do log
@@ -0,0 +1,123 @@
+# grpcCalc_vector.py
+#
+# Avaliação vetorizada (NumPy) das operações da calculadora, usada pelo
+# ComputeVector. A operação inteira roda em poucas chamadas NumPy sobre os
+# buffers da requisição: nenhum objeto Python por elemento.
+#
+# Erros por item (mesmos códigos do BatchCompute) são detectados com
+# máscaras: divisor zero -> INVALID_ARGUMENT; resultado que não cabe no
+# tipo -> OUT_OF_RANGE. O resultado desses itens fica 0.
+
+import grpc
+import grpcCalc_pb2
+
+# NumPy é opcional: só o ComputeVector precisa dele
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INVALID_ARGUMENT = grpc.StatusCode.INVALID_ARGUMENT.value[0]
+OUT_OF_RANGE = grpc.StatusCode.OUT_OF_RANGE.value[0]
+
+# DType do .proto -> dtype NumPy (little-endian, o formato dos buffers)
+DTYPES = {
+    grpcCalc_pb2.INT32: '<i4',
+    grpcCalc_pb2.INT64: '<i8',
+}
+
+
+def _int64_overflow(op, x, y, r):
+    # Em int64 o NumPy dá a volta em silêncio; estas máscaras acham quem deu.
+    # r é o resultado já calculado (com a volta).
+    if op == grpcCalc_pb2.ADD:
+        return ((x ^ r) & (y ^ r)) < 0 # Sinais iguais nos operandos e diferente no resultado
+    if op == grpcCalc_pb2.SUB:
+        return ((x ^ y) & (x ^ r)) < 0
+    if op == grpcCalc_pb2.MUL:
+        min64 = np.iinfo(np.int64).min
+        safe_x = np.where(x == 0, 1, x)
+        # r / x != y denuncia a volta; MIN * -1 é o único caso que a divisão não pega
+        return (((x != 0) & (r // safe_x != y))
+                | ((x == -1) & (y == min64)) | ((y == -1) & (x == min64)))
+    # DIV: só MIN // -1 não cabe
+    return (x == np.iinfo(np.int64).min) & (y == -1)
+
+
+def evaluate(op, x, y, dtype):
+    """
+    Aplica op elemento a elemento. x e y são arrays NumPy do dtype dado.
+    Retorna (resultados no dtype, códigos de erro uint8 por item).
+    """
+    if op == grpcCalc_pb2.DIV:
+        zero = y == 0
+        y = np.where(zero, 1, y) # Divide por 1 onde o divisor é zero; o item vira erro
+    else:
+        zero = None
+
+    if np.dtype(dtype).itemsize == 4:
+        # int32: calcula em int64, onde nada estoura, e confere a faixa
+        wide_x, wide_y = x.astype(np.int64), y.astype(np.int64)
+        result = _apply(op, wide_x, wide_y)
+        overflow = (result < np.iinfo(np.int32).min) | (result > np.iinfo(np.int32).max)
+    else:
+        with np.errstate(over='ignore'):
+            result = _apply(op, x, y)
+            overflow = _int64_overflow(op, x, y, result)
+
+    errors = np.zeros(len(x), dtype=np.uint8)
+    errors[overflow] = OUT_OF_RANGE
+    if zero is not None:
+        errors[zero] = INVALID_ARGUMENT
+    result[errors != 0] = 0
+    return result.astype(dtype, copy=False), errors
+
+
+def _apply(op, x, y):
+    if op == grpcCalc_pb2.ADD:
+        return x + y
+    if op == grpcCalc_pb2.SUB:
+        return x - y
+    if op == grpcCalc_pb2.MUL:
+        return x * y
+    return np.floor_divide(x, y) # Divisão inteira, igual ao // do Python
+
+
+def operands(request):
+    """
+    Lê x e y da requisição como arrays NumPy (sem cópia no caso dos buffers).
+    Retorna (x, y, dtype) ou levanta ValueError com a mensagem para o cliente.
+    """
+    dtype = DTYPES.get(request.dtype)
+    if dtype is None:
+        raise ValueError("Erro: Tipo de dado desconhecido!")
+    if request.x_data or request.y_data:
+        itemsize = np.dtype(dtype).itemsize
+        if len(request.x_data) % itemsize or len(request.y_data) % itemsize:
+            raise ValueError(f"Erro: Buffer com tamanho que não é múltiplo de {itemsize} bytes!")
+        x = np.frombuffer(request.x_data, dtype=dtype)
+        y = np.frombuffer(request.y_data, dtype=dtype)
+    else:
+        # Campos repeated (int32): uma cópia para array, convertida no dtype pedido
+        x = np.array(request.x, dtype=dtype)
+        y = np.array(request.y, dtype=dtype)
+    if len(x) != len(y):
+        raise ValueError("Erro: x e y com tamanhos diferentes!")
+    return x, y, dtype
+
+
+def compute_vector(request):
+    """VectorRequest -> VectorResponse (levanta ValueError para erros da chamada)."""
+    if request.op not in (grpcCalc_pb2.ADD, grpcCalc_pb2.SUB, grpcCalc_pb2.MUL, grpcCalc_pb2.DIV):
+        raise ValueError("Erro: Operação desconhecida!")
+    x, y, dtype = operands(request)
+    values, errors = evaluate(request.op, x, y, dtype)
+    error_count = int(np.count_nonzero(errors))
+    return grpcCalc_pb2.VectorResponse(
+        values=values.tobytes(), dtype=request.dtype,
+        errors=errors.tobytes() if error_count else b'', error_count=error_count
+    )
+
+
+def item_count(response):
+    return len(response.values) // np.dtype(DTYPES[response.dtype]).itemsize
@@ -0,0 +1,134 @@
+# miner_bench.py
+#
+# Benchmark do motor de mineração, sem servidor.
+# Para cada estratégia, número de processos e nível de desafio (1..N),
+# minera várias rodadas e mede hashes/s, tempo até a solução (mediana e
+# p95) e utilização de CPU. O resultado sai em JSON ou CSV, para comparar
+# versões e pegar regressões.
+#
+# Exemplo:
+#   py miner_bench.py --levels 5 --workers 1,4 --strategies scalar,batch --repeats 5 --output bench.json
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from miner_engine import MiningEngine, STRATEGIES
+from miner_hash import is_valid_solution
+
+
+def percentile(values, p):
+    """Percentil pelo método nearest-rank (p entre 0 e 100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100)) # Teto de len*p/100
+    return ordered[int(rank) - 1]
+
+
+def bench_config(engine, level, repeats):
+    """Minera 'repeats' rodadas no nível dado e agrega as métricas."""
+    times = []
+    total_hashes = 0
+    total_elapsed = 0.0
+    total_cpu = 0.0
+
+    for rep in range(repeats):
+        # Prefixo diferente por rodada (mas fixo entre execuções): rodadas
+        # variadas e ainda assim reproduzíveis.
+        result = engine.mine(level, prefix=f"bench-{level}-{rep}-")
+        if result.solution is None or not is_valid_solution(result.solution, level):
+            raise RuntimeError(f"Rodada sem solução válida (nível {level}, rodada {rep})")
+        times.append(result.elapsed)
+        total_hashes += result.hashes
+        total_elapsed += result.elapsed
+        total_cpu += result.cpu_time
+
+    return {
+        'strategy': engine.strategy,
+        'workers': engine.num_workers,
+        'level': level,
+        'runs': repeats,
+        'hashes': total_hashes,
+        'hashes_per_sec': total_hashes / total_elapsed if total_elapsed > 0 else 0.0,
+        'median_time_s': statistics.median(times),
+        'p95_time_s': percentile(times, 95),
+        # Fração da capacidade dos processos que virou trabalho de CPU
+        'cpu_utilization': total_cpu / (total_elapsed * engine.num_workers) if total_elapsed > 0 else 0.0,
+    }
+
+
+def run_benchmark(levels, workers_list, strategies, repeats):
+    rows = []
+    for strategy in strategies:
+        for num_workers in workers_list:
+            with MiningEngine(num_workers, strategy) as engine:
+                # Uma rodada de aquecimento: os processos terminam de subir
+                # (imports, spawn) fora da medição.
+                engine.mine(1, prefix="warmup-")
+                for level in range(1, levels + 1):
+                    row = bench_config(engine, level, repeats)
+                    rows.append(row)
+                    print(f"[Bench] {strategy:>6} | {num_workers:>3} proc | nível {level} | "
+                          f"{row['hashes_per_sec']:>12,.0f} hashes/s | "
+                          f"mediana {row['median_time_s']:.3f}s | p95 {row['p95_time_s']:.3f}s | "
+                          f"CPU {row['cpu_utilization']:.0%}", file=sys.stderr)
+    return rows
+
+
+def write_json(rows, out):
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': rows,
+    }
+    json.dump(report, out, indent=2)
+    out.write('\n')
+
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline do motor de mineração")
+    parser.add_argument('--levels', type=int, default=4, help="Mede os níveis de desafio 1..N (padrão: 4)")
+    parser.add_argument('--workers', default=str(os.cpu_count() or 1),
+                        help="Lista de números de processos, separada por vírgula (padrão: núcleos da CPU)")
+    parser.add_argument('--strategies', default='scalar',
+                        help=f"Lista de estratégias, separada por vírgula ({', '.join(sorted(STRATEGIES))})")
+    parser.add_argument('--repeats', type=int, default=5, help="Rodadas por configuração (padrão: 5)")
+    parser.add_argument('--format', choices=['json', 'csv'], default=None,
+                        help="Formato da saída (padrão: pela extensão de --output, senão json)")
+    parser.add_argument('--output', default=None, help="Arquivo de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    workers_list = [int(w) for w in args.workers.split(',')]
+    strategies = args.strategies.split(',')
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            parser.error(f"Estratégia desconhecida: {strategy}")
+
+    fmt = args.format
+    if fmt is None:
+        fmt = 'csv' if args.output and args.output.endswith('.csv') else 'json'
+
+    rows = run_benchmark(args.levels, workers_list, strategies, args.repeats)
+
+    writer = write_csv if fmt == 'csv' else write_json
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            writer(rows, out)
+        print(f"[Bench] Resultados salvos em {args.output}", file=sys.stderr)
+    else:
+        writer(rows, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
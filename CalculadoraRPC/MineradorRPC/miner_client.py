@@ -1,248 +1,395 @@
-# miner_client.py
-
-import grpc
-import miner_pb2
-import miner_pb2_grpc
-import hashlib
-import threading
-import random
-import string
-import sys # Para pegar o endereço do servidor
-import time
-
-# --- Variáveis Globais para Mineração ---
-# Variável para sinalizar às threads que a solução foi encontrada
-solution_found_event = threading.Event()
-# Variável para armazenar a solução encontrada
-global_solution = ""
-
-# --- Lógica de Mineração (Worker) ---
-def mine_worker(client_id, t_id, challenge_level, stub):
-    """
-    Esta função é executada por cada thread.
-    Ela tenta encontrar a solução aleatoriamente.
-    """
-    global global_solution
-    
-    print(f"[Thread-{client_id}] Iniciando mineração para T_ID {t_id} (Challenge: {challenge_level})")
-    
-    target_zeros = '0' * challenge_level
-    
-    while not solution_found_event.is_set():
-        # Gera uma string aleatória (nossa tentativa de solução)
-        # Vamos usar 8 caracteres aleatórios
-        attempt = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-        
-        # Calcula o hash
-        hash_object = hashlib.sha1(attempt.encode('utf-8'))
-        hash_hex = hash_object.hexdigest()
-        
-        # A solução é válida?
-        if hash_hex.endswith(target_zeros):
-            # SUCESSO! Encontramos uma solução.
-            
-            # Sinaliza para todas as outras threads pararem
-            solution_found_event.set() 
-            
-            # Armazena a solução
-            global_solution = attempt
-            
-            print(f"\n[Thread-{client_id}] SOLUÇÃO ENCONTRADA! '{attempt}' -> Hash: {hash_hex}")
-            break
-            
-    # print(f"[Thread-{client_id}] Parando.")
-
-
-# --- Função Principal do Cliente ---
-def run(host, client_id):
-    global global_solution # Para acessar a variável global
-    
-    # Conecta ao servidor
-    print(f"Tentando conectar ao servidor em {host}...")
-    try:
-        channel = grpc.insecure_channel(host)
-        # Testa a conexão (espera ficar PRONTA)
-        grpc.channel_ready_future(channel).result(timeout=10)
-        stub = miner_pb2_grpc.MinerStub(channel)
-        print("Conectado!")
-    except Exception as e:
-        print(f"Não foi possível conectar ao servidor: {e}")
-        return
-
-    # Loop do menu
-    while True:
-        print("\n--- Minerador RPC ---")
-        print(f"Seu ClientID: {client_id}")
-        print("1. getTransactionID (Ver transação atual)")
-        print("2. getChallenge (Ver desafio de uma transação)")
-        print("3. getTransactionStatus (Ver status de uma transação)")
-        print("4. getWinner (Ver vencedor de uma transação)")
-        print("5. getSolution (Ver solução de uma transação)")
-        print("6. Mine (Tentar resolver o desafio atual)")
-        print("7. Sair")
-        
-        choice = input("Escolha uma opção: ")
-
-        try:
-            if choice == '1':
-                # 1. getTransactionID
-                response = stub.GetTransactionID(miner_pb2.Empty())
-                print(f"-> Transação atual pendente: {response.transactionID}")
-            
-            elif choice == '2':
-                # 2. getChallenge
-                tid = int(input("Digite o TransactionID: "))
-                req = miner_pb2.TransactionRequest(transactionID=tid)
-                response = stub.GetChallenge(req)
-                if response.challenge == -1:
-                    print(f"-> Erro: TransactionID {tid} é inválido.")
-                else:
-                    print(f"-> Desafio (Challenge) para T_ID {tid}: {response.challenge} (zeros)")
-
-            elif choice == '3':
-                # 3. getTransactionStatus
-                tid = int(input("Digite o TransactionID: "))
-                req = miner_pb2.TransactionRequest(transactionID=tid)
-                response = stub.GetTransactionStatus(req)
-                if response.status == -1:
-                    print(f"-> Status: Inválido (T_ID {tid})")
-                elif response.status == 0:
-                    print(f"-> Status: Resolvido (T_ID {tid})")
-                elif response.status == 1:
-                    print(f"-> Status: Pendente (T_ID {tid})")
-
-            elif choice == '4':
-                # 4. getWinner
-                tid = int(input("Digite o TransactionID: "))
-                req = miner_pb2.TransactionRequest(transactionID=tid)
-                response = stub.GetWinner(req)
-                if response.clientID == -1:
-                    print(f"-> Vencedor: Inválido (T_ID {tid})")
-                elif response.clientID == 0:
-                    print(f"-> Vencedor: Nenhum (T_ID {tid} ainda pendente)")
-                else:
-                    print(f"-> Vencedor: Cliente {response.clientID}")
-
-            elif choice == '5':
-                # 5. getSolution
-                tid = int(input("Digite o TransactionID: "))
-                req = miner_pb2.TransactionRequest(transactionID=tid)
-                response = stub.GetSolution(req)
-                if response.status == -1:
-                    print(f"-> Erro: TransactionID {tid} é inválido.")
-                else:
-                    print(f"-> Solução para T_ID {tid}:")
-                    print(f"   - Challenge: {response.challenge}")
-                    print(f"   - Solution: '{response.solution}' (Vazio se não resolvido)")
-
-            elif choice == '6':
-                # 6. Mine (O processo complexo)
-                print("[Mine] Iniciando processo de mineração...")
-                
-                # 1. Buscar transactionID atual
-                print("[Mine] 1/6: Buscando T_ID atual...")
-                tid_response = stub.GetTransactionID(miner_pb2.Empty())
-                current_tid = tid_response.transactionID
-                if current_tid == -1:
-                    print("[Mine] Erro: Nenhuma transação disponível para minerar.")
-                    continue
-                print(f"[Mine] -> T_ID atual é: {current_tid}")
-                
-                # 2. Buscar a challenge (desafio)
-                print(f"[Mine] 2/6: Buscando Challenge para T_ID {current_tid}...")
-                challenge_req = miner_pb2.TransactionRequest(transactionID=current_tid)
-                challenge_response = stub.GetChallenge(challenge_req)
-                current_challenge = challenge_response.challenge
-                if current_challenge == -1:
-                    print("[Mine] Erro: T_ID inválido (o desafio pode ter acabado de ser resolvido).")
-                    continue
-                print(f"[Mine] -> Desafio é: {current_challenge} (zeros)")
-
-                # 3. Buscar, localmente, uma solução (COM MÚLTIPLAS THREADS)
-                print(f"[Mine] 3/6: Iniciando 4 threads de mineração local...")
-                
-                # Reseta os controles de thread
-                solution_found_event.clear()
-                global_solution = ""
-                threads = []
-                NUM_THREADS = 4 # Sugestão: use 4 threads
-                
-                start_time = time.time()
-                
-                for i in range(NUM_THREADS):
-                    # Passamos (ID da thread, T_ID, Nível, Stub)
-                    # O 'stub' não é usado no worker, mas poderia ser
-                    # se quiséssemos que a thread submetesse.
-                    t = threading.Thread(
-                        target=mine_worker, 
-                        args=(i, current_tid, current_challenge, stub)
-                    )
-                    threads.append(t)
-                    t.start()
-                
-                # Espera todas as threads terminarem (ou seja, solution_found_event.set())
-                for t in threads:
-                    t.join()
-                
-                end_time = time.time()
-                
-                if not global_solution:
-                    # Isso não deve acontecer se a lógica estiver correta
-                    print("[Mine] Erro: Threads terminaram sem solução.")
-                    continue
-
-                print(f"[Mine] -> Mineração local levou {end_time - start_time:.2f} segundos.")
-
-                # 4. Imprimir localmente a solução encontrada
-                print(f"[Mine] 4/6: Solução local encontrada: '{global_solution}'")
-
-                # 5. Submeter a solução ao servidor
-                print("[Mine] 5/6: Submetendo solução ao servidor...")
-                submit_req = miner_pb2.SubmitRequest(
-                    transactionID=current_tid,
-                    clientID=client_id,
-                    solution=global_solution
-                )
-                submit_response = stub.SubmitChallenge(submit_req)
-
-                # 6. Imprimir/Decodificar resposta do servidor
-                print("[Mine] 6/6: Resposta do servidor recebida!")
-                status = submit_response.status
-                if status == 1:
-                    print("="*30)
-                    print("  VITÓRIA! Nossa solução foi a primeira!")
-                    print("  O servidor aceitou a solução.")
-                    print("="*30)
-                elif status == 0:
-                    print("-> FALHA. O servidor disse que nossa solução estava errada (hash inválido).")
-                elif status == 2:
-                    print("-> TARDE DEMAIS. Outro cliente resolveu este T_ID primeiro.")
-                elif status == -1:
-                    print("-> ERRO. O T_ID enviado era inválido.")
-
-            elif choice == '7':
-                print("Saindo...")
-                break
-            else:
-                print("Opção inválida.")
-        
-        except grpc.RpcError as e:
-            print(f"[ERRO RPC] Falha na comunicação com o servidor: {e.code()} - {e.details()}")
-        except Exception as e:
-            print(f"[ERRO INESPERADO] {e}")
-
-
-if __name__ == '__main__':
-    # O cliente deve receber o endereço do servidor (host:porta)
-    if len(sys.argv) < 2:
-        print("Erro: Forneça o endereço do servidor.")
-        print(f"Uso: py {sys.argv[0]} <host>:<porta>")
-        print(f"Exemplo: py {sys.argv[0]} localhost:50052")
-        sys.exit(1)
-        
-    server_address = sys.argv[1]
-    
-    # Gera um ClientID aleatório para este usuário (entre 100 e 999)
-    my_client_id = random.randint(100, 999)
-    
-    run(server_address, my_client_id)
\ No newline at end of file
+# miner_client.py
+
+import grpc
+import miner_pb2
+import miner_pb2_grpc
+import random
+import time
+import threading
+import argparse # Para ler os argumentos da linha de comando
+from miner_engine import MiningEngine, STRATEGIES
+
+# Textos para os status de SubmitChallenge
+SUBMIT_STATUS = {1: "VITÓRIA", 0: "INVÁLIDA", 2: "TARDE DEMAIS", -1: "T_ID INVÁLIDO"}
+# T_IDs resolvidos lembrados pelo ChallengeWatcher
+MAX_SOLVED = 4096
+# Segundos entre consultas quando o servidor recusa o stream de eventos
+POLL_INTERVAL = 0.5
+
+
+def connect(host):
+    """Abre o canal e espera o servidor ficar pronto. Retorna o stub ou None."""
+    print(f"Tentando conectar ao servidor em {host}...")
+    try:
+        channel = grpc.insecure_channel(host)
+        # Testa a conexão (espera ficar PRONTA)
+        grpc.channel_ready_future(channel).result(timeout=10)
+        stub = miner_pb2_grpc.MinerStub(channel)
+        print("Conectado!")
+        return stub
+    except Exception as e:
+        print(f"Não foi possível conectar ao servidor: {e}")
+        return None
+
+
+def submit(stub, request, max_retries=5):
+    """
+    SubmitChallenge que respeita o limite de tentativas do servidor: numa
+    recusa (RESOURCE_EXHAUSTED) espera o retry-after-ms informado e tenta de
+    novo, até max_retries vezes. Retorna o status da resposta.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return stub.SubmitChallenge(request).status
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.RESOURCE_EXHAUSTED or attempt == max_retries:
+                raise
+            wait_ms = dict(e.trailing_metadata() or ()).get('retry-after-ms', '1000')
+            print(f"[Submit] Servidor recusou ({e.details()}); nova tentativa em {wait_ms}ms...")
+            time.sleep(int(wait_ms) / 1000)
+
+
+# --- Assinatura dos eventos do servidor ---
+class ChallengeWatcher(threading.Thread):
+    """
+    Thread que assina o stream WatchChallenges e cancela a mineração local
+    assim que o servidor avisa que a transação sendo minerada foi resolvida.
+    Se o servidor recusar o stream (limite de streams do servidor com
+    threads), consulta o status do T_ID atual a cada POLL_INTERVAL segundos.
+    """
+    EVENT_SOLVED = 2 # Ver ChallengeEvent em miner.proto
+
+    def __init__(self, stub, engine):
+        super().__init__(daemon=True)
+        self.stub = stub
+        self.engine = engine
+        self.lock = threading.Lock()
+        self.current_tid = -1 # T_ID sendo minerado agora (-1 = nenhum)
+        self.solved = set()   # T_IDs que o servidor já anunciou como resolvidos
+        self.call = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            self.call = self.stub.WatchChallenges(miner_pb2.Empty())
+            for event in self.call:
+                if event.type == self.EVENT_SOLVED:
+                    self._on_solved(event.transactionID, event.clientID)
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.RESOURCE_EXHAUSTED and not self.stopped.is_set():
+                print(f"[Watcher] Servidor recusou o stream de eventos ({e.details()}); "
+                      f"consultando a cada {POLL_INTERVAL}s.")
+                self._poll()
+            elif e.code() != grpc.StatusCode.CANCELLED:
+                print(f"[Watcher] Stream de eventos encerrado: {e.code()}")
+
+    def _poll(self):
+        # Só o T_ID sendo minerado interessa; fora de uma rodada não há consulta
+        while not self.stopped.wait(POLL_INTERVAL):
+            t_id = self.current_tid
+            if t_id == -1:
+                continue
+            request = miner_pb2.TransactionRequest(transactionID=t_id)
+            try:
+                if self.stub.GetTransactionStatus(request).status == 0: # Resolvido
+                    self._on_solved(t_id, self.stub.GetWinner(request).clientID)
+            except grpc.RpcError:
+                continue # Servidor fora do ar: o laço principal também vai perceber
+
+    def _on_solved(self, t_id, winner):
+        with self.lock:
+            self.solved.add(t_id)
+            if t_id == self.current_tid:
+                print(f"\n[Watcher] T_ID {t_id} resolvido pelo Cliente {winner}; abortando mineração.")
+                self.engine.cancel()
+
+    def begin(self, t_id):
+        """Marca t_id como em mineração. Retorna False se ele já foi resolvido."""
+        with self.lock:
+            # Com shards o servidor pode oferecer um T_ID menor que o anterior,
+            # então o conjunto só é podado quando cresce demais
+            if len(self.solved) > MAX_SOLVED:
+                self.solved = set(sorted(self.solved)[-MAX_SOLVED // 2:])
+            if t_id in self.solved:
+                return False
+            # Um aviso do T_ID anterior pode ter chegado depois do fim de
+            # mine() e antes de end(): sem isso ele abortaria esta rodada.
+            # Com a trava, um aviso de t_id chega depois daqui e ainda vale.
+            self.engine.reset()
+            self.current_tid = t_id
+            return True
+
+    def end(self):
+        with self.lock:
+            self.current_tid = -1
+
+    def stop(self):
+        self.stopped.set()
+        if self.call is not None:
+            self.call.cancel()
+
+
+# --- Modo Headless (mineração contínua, sem menu) ---
+def run_headless(host, client_id, num_workers=None, strategy='scalar', rounds=0):
+    """
+    Minera sem parar: busca a transação atual, minera, submete e já passa
+    para a próxima. Canal e processos ficam abertos entre as rodadas.
+    rounds=0 minera até Ctrl+C. Cada rodada loga o tempo de busca
+    (fetch), mineração (mine) e submissão (submit).
+    """
+    stub = connect(host)
+    if stub is None:
+        return
+
+    engine = MiningEngine(num_workers, strategy)
+    engine.start()
+    print(f"[Headless] ClientID {client_id}, {engine.num_workers} processos (modo {engine.strategy}).")
+    watcher = ChallengeWatcher(stub, engine)
+    watcher.start()
+
+    done = 0
+    wins = 0
+    try:
+        while rounds == 0 or done < rounds:
+            t0 = time.perf_counter()
+            work = stub.GetWork(miner_pb2.WorkRequest(clientID=client_id))
+            # Servidores antigos não mandam bits: o alvo é o desafio em zeros hexadecimais
+            tid, bits = work.transactionID, work.bits or 4 * work.challenge
+            if tid == -1:
+                print("[Headless] Nenhuma transação disponível, tentando de novo...")
+                time.sleep(1)
+                continue
+            t1 = time.perf_counter()
+
+            if not watcher.begin(tid):
+                continue # Já resolvido por outro cliente
+            result = engine.mine(work.challenge, prefix=f"{client_id}-{tid}-", bits=bits)
+            watcher.end()
+            t2 = time.perf_counter()
+            if result.solution is None:
+                # Cancelado pelo watcher: outro cliente resolveu este T_ID
+                print(f"[Rodada -] T_ID {tid} | desafio {bits} bits | abortado após "
+                      f"{(t2 - t1) * 1000:.1f}ms | resolvido por outro cliente")
+                continue
+
+            status = submit(stub, miner_pb2.SubmitRequest(
+                transactionID=tid, clientID=client_id, solution=result.solution
+            ))
+            t3 = time.perf_counter()
+
+            done += 1
+            if status == 1:
+                wins += 1
+            print(f"[Rodada {done}] T_ID {tid} | desafio {bits} bits | "
+                  f"fetch {(t1 - t0) * 1000:.1f}ms | mine {(t2 - t1) * 1000:.1f}ms | "
+                  f"submit {(t3 - t2) * 1000:.1f}ms | {result.hash_rate:,.0f} hashes/s | "
+                  f"{SUBMIT_STATUS.get(status, status)}")
+    except KeyboardInterrupt:
+        print("\n[Headless] Interrompido.")
+    except grpc.RpcError as e:
+        print(f"[ERRO RPC] Falha na comunicação com o servidor: {e.code()} - {e.details()}")
+    finally:
+        watcher.stop()
+        engine.close()
+        print(f"[Headless] {done} rodadas, {wins} vitórias.")
+
+
+# --- Função Principal do Cliente ---
+def run(host, client_id, num_workers=None, strategy='scalar'):
+    # Conecta ao servidor
+    stub = connect(host)
+    if stub is None:
+        return
+
+    # Pool de processos de mineração (fica ativo entre as rodadas)
+    engine = MiningEngine(num_workers, strategy)
+    engine.start()
+    # Escuta o servidor para abortar a mineração se outro cliente resolver antes
+    watcher = ChallengeWatcher(stub, engine)
+    watcher.start()
+
+    # Loop do menu
+    while True:
+        print("\n--- Minerador RPC ---")
+        print(f"Seu ClientID: {client_id}")
+        print("1. getTransactionID (Ver transação atual)")
+        print("2. getChallenge (Ver desafio de uma transação)")
+        print("3. getTransactionStatus (Ver status de uma transação)")
+        print("4. getWinner (Ver vencedor de uma transação)")
+        print("5. getSolution (Ver solução de uma transação)")
+        print("6. Mine (Tentar resolver o desafio atual)")
+        print("7. listTransactions (Histórico de transações, em lote)")
+        print("8. Sair")
+        
+        choice = input("Escolha uma opção: ")
+
+        try:
+            if choice == '1':
+                # 1. getTransactionID
+                response = stub.GetTransactionID(miner_pb2.Empty())
+                print(f"-> Transação atual pendente: {response.transactionID}")
+            
+            elif choice == '2':
+                # 2. getChallenge
+                tid = int(input("Digite o TransactionID: "))
+                req = miner_pb2.TransactionRequest(transactionID=tid)
+                response = stub.GetChallenge(req)
+                if response.challenge == -1:
+                    print(f"-> Erro: TransactionID {tid} é inválido.")
+                else:
+                    print(f"-> Desafio (Challenge) para T_ID {tid}: {response.challenge} (zeros), "
+                          f"{response.bits or 4 * response.challenge} bits")
+
+            elif choice == '3':
+                # 3. getTransactionStatus
+                tid = int(input("Digite o TransactionID: "))
+                req = miner_pb2.TransactionRequest(transactionID=tid)
+                response = stub.GetTransactionStatus(req)
+                if response.status == -1:
+                    print(f"-> Status: Inválido (T_ID {tid})")
+                elif response.status == 0:
+                    print(f"-> Status: Resolvido (T_ID {tid})")
+                elif response.status == 1:
+                    print(f"-> Status: Pendente (T_ID {tid})")
+
+            elif choice == '4':
+                # 4. getWinner
+                tid = int(input("Digite o TransactionID: "))
+                req = miner_pb2.TransactionRequest(transactionID=tid)
+                response = stub.GetWinner(req)
+                if response.clientID == -1:
+                    print(f"-> Vencedor: Inválido (T_ID {tid})")
+                elif response.clientID == 0:
+                    print(f"-> Vencedor: Nenhum (T_ID {tid} ainda pendente)")
+                else:
+                    print(f"-> Vencedor: Cliente {response.clientID}")
+
+            elif choice == '5':
+                # 5. getSolution
+                tid = int(input("Digite o TransactionID: "))
+                req = miner_pb2.TransactionRequest(transactionID=tid)
+                response = stub.GetSolution(req)
+                if response.status == -1:
+                    print(f"-> Erro: TransactionID {tid} é inválido.")
+                else:
+                    print(f"-> Solução para T_ID {tid}:")
+                    print(f"   - Challenge: {response.challenge} ({response.bits or 4 * response.challenge} bits)")
+                    print(f"   - Solution: '{response.solution}' (Vazio se não resolvido)")
+
+            elif choice == '6':
+                # 6. Mine (O processo complexo)
+                print("[Mine] Iniciando processo de mineração...")
+                
+                # 1. Buscar transactionID atual e o desafio (uma única chamada)
+                print("[Mine] 1/6: Buscando trabalho (T_ID e Challenge atuais)...")
+                work = stub.GetWork(miner_pb2.WorkRequest(clientID=client_id))
+                current_tid = work.transactionID
+                current_challenge = work.challenge
+                current_bits = work.bits or 4 * current_challenge
+                if current_tid == -1:
+                    print("[Mine] Erro: Nenhuma transação disponível para minerar.")
+                    continue
+                print(f"[Mine] -> T_ID atual é: {current_tid}")
+                
+                # 2. Mostrar a challenge (desafio), que veio junto com o T_ID
+                print(f"[Mine] 2/6: Desafio é: {current_challenge} (zeros), {current_bits} bits")
+
+                # 3. Buscar, localmente, uma solução (COM MÚLTIPLOS PROCESSOS)
+                print(f"[Mine] 3/6: Iniciando {engine.num_workers} processos de mineração local (modo {engine.strategy})...")
+                if not watcher.begin(current_tid):
+                    print("[Mine] -> TARDE DEMAIS. O T_ID acabou de ser resolvido por outro cliente.")
+                    continue
+                # O prefixo (ClientID e T_ID) separa nosso espaço de busca do de outros clientes
+                result = engine.mine(current_challenge, prefix=f"{client_id}-{current_tid}-", bits=current_bits)
+                watcher.end()
+
+                if result.solution is None:
+                    # O servidor avisou (WatchChallenges) que outro cliente resolveu
+                    print(f"[Mine] -> Mineração abortada após {result.elapsed:.2f} segundos: "
+                          "outro cliente resolveu este T_ID primeiro.")
+                    continue
+
+                print(f"[Mine] -> Mineração local levou {result.elapsed:.2f} segundos "
+                      f"({result.hashes} hashes, {result.hash_rate:,.0f} hashes/s).")
+
+                # 4. Imprimir localmente a solução encontrada
+                print(f"[Mine] 4/6: Solução local encontrada: '{result.solution}' (processo {result.worker_id}, nonce {result.nonce})")
+
+                # 5. Submeter a solução ao servidor
+                print("[Mine] 5/6: Submetendo solução ao servidor...")
+                submit_req = miner_pb2.SubmitRequest(
+                    transactionID=current_tid,
+                    clientID=client_id,
+                    solution=result.solution
+                )
+                status = submit(stub, submit_req)
+
+                # 6. Imprimir/Decodificar resposta do servidor
+                print("[Mine] 6/6: Resposta do servidor recebida!")
+                if status == 1:
+                    print("="*30)
+                    print("  VITÓRIA! Nossa solução foi a primeira!")
+                    print("  O servidor aceitou a solução.")
+                    print("="*30)
+                elif status == 0:
+                    print("-> FALHA. O servidor disse que nossa solução estava errada (hash inválido).")
+                elif status == 2:
+                    print("-> TARDE DEMAIS. Outro cliente resolveu este T_ID primeiro.")
+                elif status == -1:
+                    print("-> ERRO. O T_ID enviado era inválido.")
+
+            elif choice == '7':
+                # 7. listTransactions: uma única chamada (stream) para todo o intervalo
+                start = int(input("A partir de qual TransactionID: "))
+                limit = int(input("Quantas transações (0 = todas): "))
+                req = miner_pb2.ListTransactionsRequest(start=start, limit=limit)
+                total = 0
+                for page in stub.ListTransactions(req):
+                    for rec in page.records:
+                        target = f"Challenge {rec.challenge} ({rec.bits or 4 * rec.challenge} bits)"
+                        if rec.status == 0:
+                            print(f"   T_ID {rec.transactionID}: Resolvido | {target} | "
+                                  f"Vencedor {rec.clientID} | Solution '{rec.solution}'")
+                        else:
+                            print(f"   T_ID {rec.transactionID}: Pendente | {target}")
+                    total += len(page.records)
+                print(f"-> {total} transações listadas.")
+
+            elif choice == '8':
+                print("Saindo...")
+                break
+            else:
+                print("Opção inválida.")
+        
+        except grpc.RpcError as e:
+            print(f"[ERRO RPC] Falha na comunicação com o servidor: {e.code()} - {e.details()}")
+        except Exception as e:
+            print(f"[ERRO INESPERADO] {e}")
+
+    watcher.stop()
+    engine.close()
+
+
+if __name__ == '__main__':
+    # O cliente deve receber o endereço do servidor (host:porta)
+    parser = argparse.ArgumentParser(description="Cliente do Minerador RPC")
+    parser.add_argument('host', help="Endereço do servidor, ex.: localhost:50052")
+    parser.add_argument('workers', nargs='?', type=int, default=None,
+                        help="Número de processos de mineração (padrão: um por núcleo da CPU)")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='scalar',
+                        help="Busca local: 'scalar' (um candidato por vez) ou 'batch' (blocos com NumPy)")
+    parser.add_argument('--headless', action='store_true',
+                        help="Sem menu: minera continuamente, rodada após rodada")
+    parser.add_argument('--rounds', type=int, default=0,
+                        help="Com --headless, para após N rodadas (padrão: 0 = até Ctrl+C)")
+    parser.add_argument('--client-id', type=int, default=None,
+                        help="ClientID fixo (padrão: aleatório entre 100 e 999)")
+    args = parser.parse_args()
+    
+    # Gera um ClientID aleatório para este usuário (entre 100 e 999)
+    my_client_id = args.client_id if args.client_id is not None else random.randint(100, 999)
+    
+    if args.headless:
+        run_headless(args.host, my_client_id, args.workers, args.strategy, args.rounds)
+    else:
+        run(args.host, my_client_id, args.workers, args.strategy)
\ No newline at end of file
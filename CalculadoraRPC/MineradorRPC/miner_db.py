@@ -0,0 +1,384 @@
+# miner_db.py
+#
+# "Banco de dados" de transações do servidor do minerador.
+#
+# Armazenamento compacto: em vez de um dict { t_id: [challenge, solution, winner] },
+# cada campo é uma coluna densa (array) indexada pelo próprio t_id, que é
+# sequencial a partir de 0. As soluções ficam concatenadas em um único
+# bytearray (pool), com offset e tamanho por transação.
+#
+# Leituras não usam trava:
+#  * o desafio pendente fica num snapshot imutável (self.current), trocado
+#    por inteiro quando a transação é resolvida;
+#  * ao resolver uma transação, a solução é gravada ANTES do vencedor; o
+#    leitor olha o vencedor primeiro, então nunca vê um vencedor sem a
+#    solução correspondente.
+# A trava só protege as escritas (criar desafio e registrar o vencedor), e a
+# verificação do SHA-1 acontece fora dela.
+#
+# Shards (várias transações abertas ao mesmo tempo): com shards=K o banco
+# mantém K desafios pendentes, um por shard. Cada shard tem a sua trava, que
+# decide o vencedor da sua transação; a trava da tabela (self.lock) só cobre
+# o trecho curto que mexe nas colunas compartilhadas e no log (gravar a
+# solução e acrescentar o próximo desafio). Os mineradores são distribuídos
+# entre os shards por shard_for(clientID): pelo hash do clientID (cada
+# cliente fica sempre no mesmo shard) ou em rodízio a cada pedido.
+# Com uma transação só, toda a frota corre atrás do mesmo desafio e, quando
+# ele é fácil, quase todas as submissões chegam tarde; com K shards K
+# mineradores (ou grupos) ganham em paralelo.
+#
+# Os desafios são guardados como alvo em bits (ver miner_hash); sem controle
+# de dificuldade são sorteados entre 1 e 5 zeros hexadecimais (4 a 20 bits).
+# Com um DifficultyController (miner_difficulty.py) o alvo de cada desafio
+# novo vem dele, e cada solução lhe informa o tempo que a transação levou.
+#
+# Persistência é opcional: com um log ligado (miner_wal.open_database) cada
+# escrita também vai para o log, e o vencedor só recebe a resposta depois
+# que a sua solução está no disco.
+
+import asyncio
+import itertools
+import random
+import threading
+import time
+import queue
+from array import array
+from collections import namedtuple
+from miner_hash import solution_digest, hex_zeros, DifficultyTarget # Mesma validação usada pelo cliente
+
+# Tipos de evento do stream WatchChallenges (ver miner.proto)
+EVENT_NEW_CHALLENGE = 1
+EVENT_SOLVED = 2
+
+# Snapshot da transação aberta para mineração. challenge é o alvo em bits;
+# opened_at (time.monotonic()) é quando o desafio foi aberto neste processo,
+# None se veio da recuperação.
+CurrentTransaction = namedtuple('CurrentTransaction', ['transaction_id', 'challenge', 'opened_at'],
+                                defaults=[None])
+
+# Modos de distribuição dos mineradores entre os shards
+ASSIGN_MODES = ('hash', 'round-robin')
+# Constante do hash de Fibonacci (2^32 / razão áurea): clientIDs seguidos
+# caem em shards diferentes
+_FIB_HASH = 2654435769
+
+# Evento publicado para os assinantes (clientID só vale em EVENT_SOLVED)
+ChallengeEvent = namedtuple('ChallengeEvent', ['type', 'transaction_id', 'challenge', 'client_id'])
+
+
+class TransactionView:
+    """
+    Visão somente leitura de uma linha da tabela: [Challenge, Solution, WinnerClientID].
+    Montada a partir das colunas a cada leitura (winner -1 = pendente).
+    """
+    __slots__ = ('transaction_id', 'challenge', 'solution', 'winner')
+
+    def __init__(self, transaction_id, challenge, solution, winner):
+        self.transaction_id = transaction_id
+        self.challenge = challenge
+        self.solution = solution
+        self.winner = winner
+
+    def __repr__(self):
+        return (f"TransactionView(transaction_id={self.transaction_id}, challenge={self.challenge}, "
+                f"solution={self.solution!r}, winner={self.winner})")
+
+
+class Shard:
+    """
+    Uma transação aberta para mineração. current é o snapshot imutável
+    (trocado por inteiro); lock decide o vencedor da transação do shard.
+    """
+    __slots__ = ('index', 'lock', 'current')
+
+    def __init__(self, index):
+        self.index = index
+        self.lock = threading.Lock()
+        self.current = CurrentTransaction(-1, -1)
+
+
+# --- Difusão de eventos para os mineradores ---
+class ChallengeBroadcaster:
+    """
+    Cada assinante de WatchChallenges recebe uma fila própria;
+    publish() coloca o evento em todas as filas.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            self.subscribers.discard(q)
+
+    def publish(self, event):
+        with self.lock:
+            for q in self.subscribers:
+                q.put(event)
+
+
+class TransactionDatabase:
+    def __init__(self, shards=1, assign='hash'):
+        # A tabela de transações, em colunas indexadas pelo transactionID
+        self.challenges = array('B')        # Challenge (bits zerados exigidos)
+        self.winners = array('i')           # WinnerClientID (-1 = pendente)
+        self.solution_offsets = array('q')  # Início da solução em solution_data
+        self.solution_lengths = array('I')  # Tamanho da solução em bytes (UTF-8)
+        self.solution_data = bytearray()    # Pool com todas as soluções concatenadas
+        # Trava (lock) apenas para as ESCRITAS nas colunas (e a ordem do log)
+        self.lock = threading.Lock()
+        # Transações abertas, uma por shard (-1 = nenhuma). Leitores só fazem shard.current.
+        self.shards = [Shard(i) for i in range(max(1, shards))]
+        self.assign = assign
+        self.round_robin = itertools.count()
+        # T_ID aberto -> shard dele. Pendentes sem shard (o servidor rodava
+        # com mais shards antes de reiniciar) usam 'orphans', que não abre
+        # um desafio novo quando a transação é resolvida.
+        self.open = {}
+        self.orphans = Shard(-1)
+        # Avisa os mineradores conectados sobre novos desafios e soluções
+        self.events = ChallengeBroadcaster()
+        # Log de escritas (miner_wal.TransactionLog); None = só em memória
+        self.log = None
+        # Controle de dificuldade (miner_difficulty.DifficultyController); None = sorteio
+        self.difficulty = None
+
+    @property
+    def current(self):
+        # Transação aberta do primeiro shard (a única, sem shards)
+        return self.shards[0].current
+
+    @property
+    def current_transaction_id(self):
+        return self.current.transaction_id
+
+    def shard_for(self, client_id=None):
+        """Shard de um minerador: pelo hash do clientID, ou em rodízio (também sem clientID)."""
+        shards = self.shards
+        if len(shards) == 1:
+            return shards[0]
+        if self.assign == 'hash' and client_id is not None:
+            return shards[((client_id * _FIB_HASH) & 0xFFFFFFFF) * len(shards) >> 32]
+        return shards[next(self.round_robin) % len(shards)]
+
+    def open_transactions(self):
+        """Snapshots das transações abertas (uma por shard que já tem desafio)."""
+        return [shard.current for shard in self.shards if shard.current.transaction_id != -1]
+
+    def shard_of(self, t_id):
+        """Shard em que a transação está aberta (orphans se não está em nenhum)."""
+        return self.open.get(t_id, self.orphans)
+
+    @property
+    def next_transaction_id(self):
+        # IDs são sequenciais: o próximo é o tamanho da tabela
+        return len(self.challenges)
+
+    def _append(self, challenge):
+        # Chamar com self.lock adquirida. A coluna 'challenges' cresce por
+        # último: é ela que define quais IDs existem para os leitores.
+        self.winners.append(-1)
+        self.solution_offsets.append(0)
+        self.solution_lengths.append(0)
+        self.challenges.append(challenge)
+
+    def _record_solution(self, t_id, solution, client_id):
+        # Chamar com self.lock adquirida. O vencedor é gravado por último.
+        # Retorna a sequência do registro no log (0 sem log).
+        data = solution.encode('utf-8')
+        self.solution_offsets[t_id] = len(self.solution_data)
+        self.solution_lengths[t_id] = len(data)
+        self.solution_data += data
+        self.winners[t_id] = client_id
+        if self.log is not None:
+            return self.log.log_solved(t_id, client_id, data)
+        return 0
+
+    def _new_challenge(self):
+        # Chamar com self.lock adquirida: acrescenta a linha e grava no log
+        t_id = self.next_transaction_id
+        if self.difficulty is not None:
+            challenge = self.difficulty.next_bits()
+        else:
+            challenge = 4 * random.randint(1, 5) # Desafio [1..5] zeros
+        self._append(challenge)
+        if self.log is not None:
+            self.log.log_created(t_id, challenge)
+        return t_id, challenge
+
+    def _assign(self, shard, t_id, challenge, opened_at=None):
+        # Troca atômica do snapshot: a partir daqui os leitores veem o novo desafio
+        shard.current = CurrentTransaction(t_id, challenge, opened_at)
+        self.open[t_id] = shard
+        self.events.publish(ChallengeEvent(EVENT_NEW_CHALLENGE, t_id, challenge, 0))
+
+    def _open_challenge(self, shard=None):
+        # Chamar com self.lock adquirida
+        t_id, challenge = self._new_challenge()
+        self._assign(shard or self.shards[0], t_id, challenge, time.monotonic())
+        return t_id, challenge
+
+    def create_new_challenge(self, shard=None):
+        with self.lock:
+            t_id, challenge = self._open_challenge(shard)
+        print(f"[Servidor] Novo desafio criado! ID: {t_id}, Challenge: {hex_zeros(challenge)} ({challenge} bits)")
+        return t_id, challenge
+
+    def fill_shards(self):
+        """Abre um desafio em cada shard sem transação pendente (banco novo, ou mais shards que antes)."""
+        for shard in self.shards:
+            if shard.current.transaction_id == -1:
+                self.create_new_challenge(shard)
+
+    def reopen_pending(self):
+        """
+        Depois da recuperação: devolve as transações pendentes aos shards, das
+        mais antigas para as mais novas. As que sobrarem continuam aceitando
+        soluções (pelo shard orphans), mas não são mais oferecidas.
+        """
+        pending = []
+        pos = 0
+        while len(pending) < len(self.shards):
+            try:
+                pos = self.winners.index(-1, pos) # Busca em C, sem laço Python
+            except ValueError:
+                break
+            pending.append(pos)
+            pos += 1
+        for shard, t_id in zip(self.shards, pending):
+            self._assign(shard, t_id, self.challenges[t_id])
+
+    def _claim(self, shard, t_id, client_id, solution, challenge):
+        """
+        Compare-and-set do vencedor na trava do shard: só o primeiro que
+        chegar aqui vence. Retorna a sequência do registro no log, ou None se
+        a transação já tinha vencedor.
+        """
+        with shard.lock:
+            if self.winners[t_id] != -1:
+                return None
+            reopen = shard is not self.orphans
+            opened_at = shard.current.opened_at if reopen else None
+            with self.lock: # Só as colunas compartilhadas, o log e a dificuldade
+                seq = self._record_solution(t_id, solution, client_id)
+                if self.difficulty is not None and opened_at is not None:
+                    self.difficulty.record(challenge, time.monotonic() - opened_at)
+                if reopen:
+                    new_tid, new_challenge = self._new_challenge()
+            self.open.pop(t_id, None)
+            self.events.publish(ChallengeEvent(EVENT_SOLVED, t_id, challenge, client_id))
+            # O desafio deste shard agora é outro!
+            if reopen:
+                self._assign(shard, new_tid, new_challenge, time.monotonic())
+        return seq
+
+    # --- Leituras (sem trava) ---
+    def get(self, t_id):
+        """TransactionView do ID, ou None se o ID não existe."""
+        if not 0 <= t_id < len(self.challenges):
+            return None
+        winner = self.winners[t_id]
+        solution = ""
+        if winner != -1:
+            start = self.solution_offsets[t_id]
+            solution = self.solution_data[start:start + self.solution_lengths[t_id]].decode('utf-8')
+        return TransactionView(t_id, self.challenges[t_id], solution, winner)
+
+    # Função helper para verificar se um ID existe
+    def is_valid_tid(self, t_id):
+        return 0 <= t_id < len(self.challenges)
+
+    # Função helper para verificar se um ID já foi resolvido
+    def is_solved(self, t_id):
+        return self.is_valid_tid(t_id) and self.winners[t_id] != -1 # Se Winner != -1, está resolvido
+
+    # --- Escrita ---
+    def submit(self, t_id, client_id, solution):
+        """
+        Valida e registra uma solução.
+        Retorna (status, digest): 1 (válida), 0 (inválida), 2 (já solucionado),
+        -1 (ID inválido); digest é None quando a solução nem foi verificada.
+        """
+        if not self.is_valid_tid(t_id):
+            return -1, None
+        if self.winners[t_id] != -1:
+            return 2, None
+
+        # Verificação FORA da trava: o desafio de uma transação nunca muda
+        challenge = self.challenges[t_id]
+        digest = solution_digest(solution)
+        if not DifficultyTarget(challenge).check(digest):
+            return 0, digest
+
+        seq = self._claim(self.shard_of(t_id), t_id, client_id, solution, challenge)
+        if seq is None:
+            return 2, digest
+
+        # Com persistência, só responde depois que a solução está no disco
+        if self.log is not None:
+            self.log.wait(seq)
+        return 1, digest
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+
+# --- Variante asyncio (servidor grpc.aio, ver miner_server_aio.py) ---
+class AsyncChallengeBroadcaster(ChallengeBroadcaster):
+    """
+    Igual ao ChallengeBroadcaster, mas com asyncio.Queue: os assinantes
+    esperam eventos com await, sem prender uma thread cada.
+    Só pode ser usado de dentro do event loop.
+    """
+    def subscribe(self):
+        q = asyncio.Queue()
+        self.subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        self.subscribers.discard(q)
+
+    def publish(self, event):
+        for q in self.subscribers:
+            q.put_nowait(event)
+
+
+class AsyncTransactionDatabase(TransactionDatabase):
+    """
+    TransactionDatabase para o event loop do grpc.aio.
+    Todas as escritas acontecem na thread do loop e não há await entre o
+    teste do vencedor e o registro, então o compare-and-set continua
+    atômico. As travas só são disputadas com o snapshot do log (miner_wal),
+    que roda em outra thread. A espera pelo fsync não bloqueia o loop.
+    """
+    def __init__(self, shards=1, assign='hash'):
+        super().__init__(shards, assign)
+        self.events = AsyncChallengeBroadcaster()
+
+    async def submit(self, t_id, client_id, solution):
+        """Mesmo contrato de TransactionDatabase.submit, como corrotina."""
+        if not self.is_valid_tid(t_id):
+            return -1, None
+        if self.winners[t_id] != -1:
+            return 2, None
+
+        challenge = self.challenges[t_id]
+        digest = solution_digest(solution)
+        if not DifficultyTarget(challenge).check(digest):
+            return 0, digest
+
+        seq = self._claim(self.shard_of(t_id), t_id, client_id, solution, challenge)
+        if seq is None:
+            return 2, digest
+
+        if self.log is not None:
+            # O fsync acontece na thread do log; aqui só esperamos sem bloquear o loop
+            await asyncio.get_running_loop().run_in_executor(None, self.log.wait, seq)
+        return 1, digest
@@ -0,0 +1,170 @@
+# miner_db_bench.py
+#
+# Benchmark de contenção do TransactionDatabase (sem gRPC).
+# Threads leitoras fazem o que GetWork/GetTransactionStatus fazem, enquanto
+# threads submissoras enviam soluções sem parar. Mede a latência das
+# leituras nos dois desenhos:
+#   locked   -> o desenho antigo: leituras pegam DB.lock e o SubmitChallenge
+#               segura a trava durante o SHA-1 e o log
+#   lockfree -> o desenho atual (miner_db): leituras sem trava, verificação
+#               fora da trava e só o compare-and-set do vencedor travado
+#
+# Exemplo:
+#   py miner_db_bench.py --readers 8 --submitters 8 --duration 5
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from miner_db import TransactionDatabase
+from miner_hash import solution_digest, DifficultyTarget
+from miner_engine import mine_worker
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+# --- Leituras ---
+def read_locked(db):
+    with db.lock:
+        current = db.current
+        record = db.get(current.transaction_id)
+    return current, record
+
+
+def read_lockfree(db):
+    current = db.current
+    return current, db.get(current.transaction_id)
+
+
+# --- Submissões ---
+def submit_locked(db, t_id, client_id, solution, log):
+    # Como o SubmitChallenge antigo: tudo (inclusive o SHA-1 e o log) sob a trava
+    with db.lock:
+        record = db.get(t_id)
+        if record is None:
+            return -1
+        if record.winner != -1:
+            return 2
+        digest = solution_digest(solution)
+        if DifficultyTarget(record.challenge).check(digest):
+            print(f"[Servidor] SUCESSO! Cliente {client_id} resolveu o T_ID {t_id} com o hash {digest.hex()}", file=log)
+            db._record_solution(t_id, solution, client_id)
+            db._open_challenge()
+            return 1
+        print(f"[Servidor] FALHA. Cliente {client_id} errou. Hash: {digest.hex()}", file=log)
+        return 0
+
+
+def submit_lockfree(db, t_id, client_id, solution, log):
+    status, digest = db.submit(t_id, client_id, solution)
+    if digest is not None:
+        print(f"[Servidor] Cliente {client_id}, T_ID {t_id}, status {status}, hash {digest.hex()}", file=log)
+    return status
+
+
+MODES = {
+    'locked': (read_locked, submit_locked),
+    'lockfree': (read_lockfree, submit_lockfree),
+}
+
+
+def premine_solutions(max_level=5):
+    """
+    Uma solução válida por nível de desafio, minerada antes da medição e
+    indexada pelo alvo em bits (como a coluna de desafios do banco).
+    A validade só depende do desafio, então a mesma string serve para
+    qualquer T_ID com aquele nível.
+    """
+    solutions = {}
+    for level in range(1, max_level + 1):
+        solution, _, _ = mine_worker(4 * level, f"bench-{level}-", 0, 1 << 40, threading.Event())
+        solutions[4 * level] = solution
+    return solutions
+
+
+def run_mode(mode, readers, submitters, duration, valid_every, valid_solutions):
+    read, submit = MODES[mode]
+    db = TransactionDatabase()
+    db.create_new_challenge()
+    stop = threading.Event()
+    latencies = [[] for _ in range(readers)]
+    submits = [0] * submitters
+    log = open(os.devnull, 'w')
+
+    def reader(i):
+        lat = latencies[i]
+        perf = time.perf_counter_ns
+        while not stop.is_set():
+            t0 = perf()
+            read(db)
+            lat.append(perf() - t0)
+
+    def submitter(i):
+        n = 0
+        while not stop.is_set():
+            current = db.current
+            n += 1
+            if n % valid_every == 0:
+                # De vez em quando uma solução válida (gera escrita e novo desafio)
+                solution = valid_solutions[current.challenge]
+            else:
+                solution = f"{i}-{n}-invalida"
+            submit(db, current.transaction_id, i + 1, solution, log)
+            submits[i] += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=submitter, args=(i,)) for i in range(submitters)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    log.close()
+
+    all_lat = [x for lat in latencies for x in lat]
+    return {
+        'mode': mode,
+        'readers': readers,
+        'submitters': submitters,
+        'duration_s': duration,
+        'reads': len(all_lat),
+        'reads_per_sec': len(all_lat) / duration,
+        'submits': sum(submits),
+        'submits_per_sec': sum(submits) / duration,
+        'solved': db.next_transaction_id - 1,
+        'read_p50_us': statistics.median(all_lat) / 1000,
+        'read_p99_us': percentile(all_lat, 99) / 1000,
+        'read_max_us': max(all_lat) / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de contenção do TransactionDatabase")
+    parser.add_argument('--readers', type=int, default=8, help="Threads leitoras (padrão: 8)")
+    parser.add_argument('--submitters', type=int, default=8, help="Threads submissoras (padrão: 8)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Segundos por modo (padrão: 5)")
+    parser.add_argument('--valid-every', type=int, default=200,
+                        help="Uma a cada N submissões é uma solução válida (padrão: 200)")
+    parser.add_argument('--modes', default='locked,lockfree', help="Modos, separados por vírgula")
+    args = parser.parse_args()
+
+    valid_solutions = premine_solutions()
+    results = []
+    for mode in args.modes.split(','):
+        row = run_mode(mode, args.readers, args.submitters, args.duration, args.valid_every, valid_solutions)
+        results.append(row)
+        print(f"[Bench] {mode:>8} | {row['reads_per_sec']:>10,.0f} leituras/s | "
+              f"p50 {row['read_p50_us']:.1f}us | p99 {row['read_p99_us']:.1f}us | "
+              f"max {row['read_max_us']:.0f}us | {row['submits_per_sec']:,.0f} submits/s")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
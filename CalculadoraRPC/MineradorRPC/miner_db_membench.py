@@ -0,0 +1,102 @@
+# miner_db_membench.py
+#
+# Benchmark de memória da tabela de transações.
+# Preenche N transações já resolvidas em dois formatos e mede os bytes
+# alocados (tracemalloc):
+#   dict    -> o formato antigo: { t_id: [challenge, solution, winner] }
+#   columns -> o formato atual (miner_db): colunas array + pool de soluções
+# Também mede o custo das leituras (get / is_solved) em cada formato.
+#
+# Exemplo:
+#   py miner_db_membench.py --count 10000000
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from miner_db import TransactionDatabase
+
+
+def solution_for(t_id):
+    # Mesmo formato das soluções do cliente: "<clientID>-<T_ID>-<nonce hex>"
+    return f"{t_id % 100 + 1}-{t_id}-{t_id * 2654435761 % (1 << 64):016x}"
+
+
+def fill_dict(count):
+    table = {}
+    for t_id in range(count):
+        table[t_id] = [random.randint(1, 5), solution_for(t_id), t_id % 100 + 1]
+    return table
+
+
+def fill_columns(count):
+    db = TransactionDatabase()
+    with db.lock:
+        for t_id in range(count):
+            db._append(4 * random.randint(1, 5)) # Alvo em bits, como o servidor grava
+            db._record_solution(t_id, solution_for(t_id), t_id % 100 + 1)
+    return db
+
+
+def measure(fill, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = fill(count)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return table, size, elapsed
+
+
+def time_reads(lookup, count, samples):
+    ids = [random.randrange(count) for _ in range(samples)]
+    start = time.perf_counter()
+    for t_id in ids:
+        lookup(t_id)
+    return (time.perf_counter() - start) / samples * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória da tabela de transações")
+    parser.add_argument('--count', type=int, default=10_000_000, help="Transações (padrão: 10.000.000)")
+    parser.add_argument('--samples', type=int, default=1_000_000, help="Leituras medidas (padrão: 1.000.000)")
+    args = parser.parse_args()
+
+    results = []
+
+    table, size, elapsed = measure(fill_dict, args.count)
+    results.append({
+        'format': 'dict',
+        'count': args.count,
+        'bytes': size,
+        'bytes_per_tx': size / args.count,
+        'fill_s': elapsed,
+        'get_ns': time_reads(table.get, args.count, args.samples),
+        'is_solved_ns': time_reads(lambda t: t in table and table[t][2] != -1, args.count, args.samples),
+    })
+    del table
+
+    db, size, elapsed = measure(fill_columns, args.count)
+    results.append({
+        'format': 'columns',
+        'count': args.count,
+        'bytes': size,
+        'bytes_per_tx': size / args.count,
+        'fill_s': elapsed,
+        'get_ns': time_reads(db.get, args.count, args.samples),
+        'is_solved_ns': time_reads(db.is_solved, args.count, args.samples),
+    })
+    del db
+
+    for row in results:
+        print(f"[Bench] {row['format']:>7} | {row['count']:,} transações | "
+              f"{row['bytes'] / 2**20:,.1f} MiB ({row['bytes_per_tx']:.1f} B/transação) | "
+              f"get {row['get_ns']:.0f}ns | is_solved {row['is_solved_ns']:.0f}ns")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# miner_difficulty.py
+#
+# Controle de dificuldade do minerador (miner_server.py --target-time).
+# Sem ele cada desafio é sorteado entre 1 e 5 zeros hexadecimais: o tempo
+# até a solução vai de microssegundos (1 zero, 16 hashes em média) a
+# minutos (5 zeros, ~1 milhão), seja qual for o tamanho da frota.
+#
+# Com o controle, cada transação resolvida informa quanto trabalho ela
+# pedia (2^bits hashes, em média) e quanto tempo levou desde a abertura.
+# A taxa de hashes da frota (por transação aberta, com --shards) é estimada
+# sobre as últimas 'window' soluções como soma dos trabalhos / soma dos
+# tempos, o que amortece a variância dos tempos individuais (que seguem uma
+# exponencial). A dificuldade desejada é log2(taxa * tempo alvo) bits,
+# limitada a MAX_STEP bits de mudança por solução.
+#
+# A dificuldade é contínua, mas cada desafio tem um número inteiro de
+# bits: next_bits() sorteia entre floor(d) e floor(d) + 1 de modo que o
+# trabalho esperado seja 2^d. Ex.: d = 18,5 -> 19 bits em 41% dos desafios.
+#
+# Os métodos são chamados com a trava da tabela do banco (ao resolver e ao
+# criar desafios), então não há trava própria.
+
+import math
+import random
+from collections import deque
+from miner_hash import MAX_BITS
+
+# Soluções usadas na estimativa da taxa de hashes
+WINDOW = 32
+# Maior mudança da dificuldade (em bits) por solução recebida
+MAX_STEP = 1.0
+# Dificuldade inicial num banco novo (em bits; 16 = 4 zeros, ~65 mil hashes)
+INITIAL_BITS = 16
+MIN_BITS = 1
+# Acima disso nenhuma frota de CPUs resolve um SHA-1 em tempo útil
+DEFAULT_MAX_BITS = 48
+
+
+class DifficultyController:
+    """
+    Dificuldade (em bits) que mira target_time segundos por transação.
+    initial_bits=None deixa a escolha para quem abre o banco (set_bits com
+    o alvo da última transação, para continuar de onde parou).
+    """
+
+    def __init__(self, target_time, initial_bits=None, window=WINDOW,
+                 min_bits=MIN_BITS, max_bits=DEFAULT_MAX_BITS, rng=None):
+        self.target_time = target_time
+        self.min_bits = min_bits
+        self.max_bits = min(max_bits, MAX_BITS)
+        self.bits = None
+        if initial_bits is not None:
+            self.set_bits(initial_bits)
+        self.samples = deque(maxlen=window) # (trabalho esperado, segundos)
+        self.rng = rng or random.Random()
+
+    def set_bits(self, bits):
+        self.bits = float(min(max(bits, self.min_bits), self.max_bits))
+
+    @property
+    def hash_rate(self):
+        """Hashes/s estimados por transação aberta (0 sem soluções ainda)."""
+        elapsed = sum(seconds for _, seconds in self.samples)
+        if not self.samples or elapsed <= 0:
+            return 0.0
+        return sum(work for work, _ in self.samples) / elapsed
+
+    def record(self, bits, elapsed):
+        """Uma transação com alvo de 'bits' bits foi resolvida em 'elapsed' segundos."""
+        self.samples.append((2.0 ** bits, elapsed))
+        rate = self.hash_rate
+        if rate <= 0:
+            return
+        desired = math.log2(rate * self.target_time) if rate * self.target_time > 1 else 0.0
+        step = max(-MAX_STEP, min(MAX_STEP, desired - self.bits))
+        self.bits = max(self.min_bits, min(self.max_bits, self.bits + step))
+
+    def next_bits(self):
+        """Alvo inteiro do próximo desafio, com média de trabalho 2^self.bits."""
+        whole = math.floor(self.bits)
+        # 2^whole * (1 + p) = 2^bits
+        if whole < self.max_bits and self.rng.random() < 2.0 ** (self.bits - whole) - 1:
+            whole += 1
+        return int(whole)
+
+
+def add_arguments(parser):
+    """Opções do controle de dificuldade (desligado por padrão)."""
+    parser.add_argument('--target-time', type=float, default=0.0,
+                        help="Segundos desejados por transação; liga o controle de dificuldade "
+                             "(padrão: 0, desafio sorteado entre 1 e 5 zeros)")
+    parser.add_argument('--initial-bits', type=int, default=None,
+                        help=f"Dificuldade inicial em bits (padrão: a da última transação, ou {INITIAL_BITS})")
+    parser.add_argument('--min-bits', type=int, default=MIN_BITS, help=f"Menor dificuldade (padrão: {MIN_BITS})")
+    parser.add_argument('--max-bits', type=int, default=DEFAULT_MAX_BITS,
+                        help=f"Maior dificuldade (padrão: {DEFAULT_MAX_BITS})")
+    parser.add_argument('--difficulty-window', type=int, default=WINDOW,
+                        help=f"Soluções usadas na estimativa da taxa de hashes (padrão: {WINDOW})")
+
+
+def from_args(args):
+    """DifficultyController das opções da linha de comando, ou None se --target-time não foi dado."""
+    if args.target_time <= 0:
+        return None
+    return DifficultyController(args.target_time, args.initial_bits, args.difficulty_window,
+                                args.min_bits, args.max_bits)
@@ -0,0 +1,296 @@
+# miner_engine.py
+#
+# Motor de mineração com múltiplos PROCESSOS.
+# Com threads o SHA-1 em Python fica preso ao GIL e mais threads não
+# aumentam a taxa de hashes; com processos cada núcleo minera de verdade.
+
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from miner_hash import DifficultyTarget, PrefixHasher, DIGEST_SIZE
+
+# NumPy é opcional: só o modo "batch" precisa dele
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Cada candidato é: prefixo + nonce com NONCE_DIGITS dígitos hexadecimais.
+# Ex.: prefixo "123-0-" e nonce 42 -> "123-0-000000000000002a"
+NONCE_DIGITS = 16
+NONCE_SPACE = 16 ** NONCE_DIGITS
+HEX_DIGITS = b'0123456789abcdef'
+
+# Quantas tentativas cada worker faz entre duas verificações do sinal de parada.
+# Consultar o Event entre processos a cada hash custaria caro.
+CHECK_INTERVAL = 4096
+
+# Nonces por bloco no modo "batch"
+BATCH_SIZE = 4096
+
+# Processos sempre via "spawn": o cliente já tem threads do gRPC rodando e
+# fork() com o gRPC ativo não é seguro (no Windows spawn já é o padrão).
+_mp = multiprocessing.get_context('spawn')
+
+
+class MiningResult(namedtuple('MiningResult', ['solution', 'worker_id', 'nonce', 'hashes', 'elapsed', 'cpu_time'])):
+    """
+    Resultado de uma rodada: solução (ou None se cancelada), quem achou e
+    estatísticas (cpu_time soma o tempo de CPU gasto por todos os workers).
+    """
+    __slots__ = ()
+
+    @property
+    def hash_rate(self):
+        # Hashes por segundo somando todos os workers
+        if self.elapsed <= 0:
+            return 0.0
+        return self.hashes / self.elapsed
+
+
+def nonce_ranges(num_workers, start_nonce=0, end_nonce=NONCE_SPACE):
+    """
+    Divide [start_nonce, end_nonce) em num_workers faixas disjuntas.
+    Retorna uma lista de (início, fim) — a faixa i pertence ao worker i.
+    """
+    span = (end_nonce - start_nonce) // num_workers
+    ranges = []
+    for i in range(num_workers):
+        begin = start_nonce + i * span
+        end = end_nonce if i == num_workers - 1 else begin + span
+        ranges.append((begin, end))
+    return ranges
+
+
+# --- Lógica de Mineração (executada em cada processo) ---
+def mine_worker(bits, prefix, nonce_start, nonce_end, stop_event):
+    """
+    Testa os nonces de [nonce_start, nonce_end) em ordem, até encontrar uma
+    solução (SHA-1 terminando em 'bits' bits zerados), esgotar a faixa ou
+    stop_event ser sinalizado.
+    O prefixo é processado pelo SHA-1 uma única vez (PrefixHasher); por
+    tentativa só o nonce é hasheado e o digest é checado em bytes.
+    O nonce vive em um bytearray reutilizado: o último dígito é trocado
+    no lugar a cada tentativa e o resto só é reescrito a cada 16.
+    Retorna (solução ou None, nonce da solução ou -1, número de hashes).
+    """
+    target = DifficultyTarget(bits)
+    zero_bytes = target.zero_bytes
+    copy = PrefixHasher(prefix.encode('utf-8')).base.copy
+    buf = bytearray(NONCE_DIGITS)
+    last = NONCE_DIGITS - 1
+    nonce = nonce_start
+    hashes = 0
+
+    while nonce < nonce_end and not stop_event.is_set():
+        batch_end = min(nonce + CHECK_INTERVAL, nonce_end)
+        while nonce < batch_end:
+            buf[:] = b'%016x' % nonce
+            low = nonce & 0xF
+            count = min(16 - low, batch_end - nonce)
+            for digit in range(low, low + count):
+                buf[last] = HEX_DIGITS[digit]
+                h = copy()
+                h.update(buf)
+                digest = h.digest()
+                # Filtro rápido nos bytes inteiros; o teste completo só roda se passar
+                if digest.endswith(zero_bytes) and target.check(digest):
+                    # Avisa os outros processos para pararem
+                    stop_event.set()
+                    found = nonce - low + digit
+                    return prefix + buf.decode('ascii'), found, hashes + (found - nonce) + 1
+            nonce += count
+            hashes += count
+
+    return None, -1, hashes
+
+
+def _nonce_block(start, count):
+    """Gera 'count' nonces consecutivos já em hex, num único buffer contíguo."""
+    nonces = np.arange(count, dtype=np.uint64) + np.uint64(start)
+    shifts = np.arange(4 * (NONCE_DIGITS - 1), -4, -4, dtype=np.uint64)
+    digits = (nonces[:, None] >> shifts) & np.uint64(0xF)
+    return np.frombuffer(HEX_DIGITS, dtype=np.uint8)[digits].tobytes()
+
+
+def _block_hits(target, digests):
+    """
+    Índices dos digests do bloco que satisfazem o alvo.
+    'digests' é a concatenação dos digests; a matriz é só uma visão sobre ele.
+    """
+    arr = np.frombuffer(digests, dtype=np.uint8).reshape(-1, DIGEST_SIZE)
+    full, rem = divmod(target.bits, 8)
+    ok = np.ones(len(arr), dtype=bool)
+    if full:
+        ok = ~arr[:, DIGEST_SIZE - full:].any(axis=1)
+    if rem:
+        ok &= (arr[:, DIGEST_SIZE - full - 1] & ((1 << rem) - 1)) == 0
+    return np.flatnonzero(ok)
+
+
+def mine_worker_batch(bits, prefix, nonce_start, nonce_end, stop_event):
+    """
+    Mesma busca de mine_worker, mas em blocos de BATCH_SIZE nonces: os
+    candidatos do bloco são gerados de uma vez com NumPy, hasheados, e o
+    teste de zeros roda sobre o bloco inteiro. Só quando há acerto o
+    candidato é conferido individualmente (DifficultyTarget.check).
+    Retorna (solução ou None, nonce da solução ou -1, número de hashes).
+    """
+    target = DifficultyTarget(bits)
+    copy = PrefixHasher(prefix.encode('utf-8')).base.copy
+    nonce = nonce_start
+    hashes = 0
+
+    while nonce < nonce_end and not stop_event.is_set():
+        count = min(BATCH_SIZE, nonce_end - nonce)
+        block = _nonce_block(nonce, count)
+        digests = []
+        append = digests.append
+        for i in range(0, count * NONCE_DIGITS, NONCE_DIGITS):
+            h = copy()
+            h.update(block[i:i + NONCE_DIGITS])
+            append(h.digest())
+        hashes += count
+
+        for i in _block_hits(target, b''.join(digests)):
+            if target.check(digests[i]):
+                stop_event.set()
+                candidate = block[i * NONCE_DIGITS:(i + 1) * NONCE_DIGITS].decode('ascii')
+                return prefix + candidate, nonce + int(i), hashes
+        nonce += count
+
+    return None, -1, hashes
+
+
+# Estratégias de busca disponíveis (veja MiningEngine)
+STRATEGIES = {
+    'scalar': mine_worker,
+    'batch': mine_worker_batch,
+}
+
+
+def _worker_loop(worker_id, jobs, results, stop_event):
+    # Avisa que o processo terminou de subir (imports, spawn)
+    results.put(None)
+    # Processo fica vivo entre rodadas, esperando novos jobs
+    while True:
+        job = jobs.get()
+        if job is None: # Sinal de encerramento
+            break
+        strategy, bits, prefix, nonce_start, nonce_end = job
+        worker = STRATEGIES[strategy]
+        cpu_start = time.process_time()
+        solution, nonce, hashes = worker(bits, prefix, nonce_start, nonce_end, stop_event)
+        cpu_time = time.process_time() - cpu_start
+        results.put((worker_id, solution, nonce, hashes, cpu_time))
+
+
+class MiningEngine:
+    """
+    Pool de processos de mineração.
+    Os processos são criados uma vez (start) e reaproveitados em cada
+    chamada a mine(); close() encerra todos.
+    strategy escolhe a busca: 'scalar' (um candidato por iteração) ou
+    'batch' (blocos verificados com NumPy).
+    """
+
+    def __init__(self, num_workers=None, strategy='scalar'):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estratégia desconhecida: {strategy}")
+        if strategy == 'batch' and np is None:
+            raise ValueError("A estratégia 'batch' precisa do NumPy (pip install numpy)")
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.strategy = strategy
+        self.stop_event = _mp.Event()
+        self.results = _mp.Queue()
+        self.job_queues = []
+        self.processes = []
+        # Faixas de nonce usadas na última rodada (uma por worker)
+        self.ranges = []
+
+    def start(self):
+        if self.processes:
+            return
+        self.stop_event.clear()
+        for i in range(self.num_workers):
+            jobs = _mp.Queue()
+            p = _mp.Process(
+                target=_worker_loop,
+                args=(i, jobs, self.results, self.stop_event),
+                daemon=True
+            )
+            p.start()
+            self.job_queues.append(jobs)
+            self.processes.append(p)
+        # Espera todos ficarem prontos, para a primeira rodada não pagar o
+        # tempo de inicialização dos processos
+        for _ in range(self.num_workers):
+            self.results.get()
+
+    def mine(self, challenge_level, prefix='', start_nonce=0, bits=None):
+        """
+        Distribui o desafio para todos os workers e espera a primeira solução.
+        bits é o alvo exato, quando o servidor o informa (WorkResponse.bits);
+        sem ele vale o desafio em zeros hexadecimais (4 bits cada).
+        Com o mesmo prefixo e start_nonce cada worker percorre sempre a mesma
+        faixa (veja self.ranges), o que torna as rodadas reproduzíveis.
+        """
+        self.start()
+        self.ranges = nonce_ranges(self.num_workers, start_nonce)
+        bits = bits or 4 * challenge_level
+
+        start_time = time.time()
+        for jobs, (begin, end) in zip(self.job_queues, self.ranges):
+            jobs.put((self.strategy, bits, prefix, begin, end))
+
+        # Espera TODOS os workers responderem, para somar os hashes de cada um
+        solution = None
+        winner = -1
+        winner_nonce = -1
+        total_hashes = 0
+        total_cpu = 0.0
+        for _ in range(self.num_workers):
+            worker_id, worker_solution, nonce, hashes, cpu_time = self.results.get()
+            total_hashes += hashes
+            total_cpu += cpu_time
+            if worker_solution is not None and solution is None:
+                solution = worker_solution
+                winner = worker_id
+                winner_nonce = nonce
+
+        end_time = time.time()
+        # O sinal é limpo no FIM da rodada (e não no início): assim um
+        # cancel() que chegue logo antes de mine() ainda vale para ela.
+        # Um cancel() que chegue depois daqui vale para a próxima rodada;
+        # quem cancela por T_ID chama reset() ao escolher o próximo.
+        self.stop_event.clear()
+        return MiningResult(solution, winner, winner_nonce, total_hashes, end_time - start_time, total_cpu)
+
+    def cancel(self):
+        # Interrompe a rodada atual (ou a próxima, se nenhuma estiver
+        # rodando); mine() retorna com solution=None. Pode ser chamado de
+        # outra thread.
+        self.stop_event.set()
+
+    def reset(self):
+        # Descarta um cancel() pendente, vindo de uma rodada que já acabou.
+        # Chamar antes de publicar qual é a próxima rodada (veja
+        # ChallengeWatcher.begin), para que um cancel() dela ainda valha.
+        self.stop_event.clear()
+
+    def close(self):
+        self.stop_event.set()
+        for jobs in self.job_queues:
+            jobs.put(None)
+        for p in self.processes:
+            p.join(timeout=5)
+        self.job_queues = []
+        self.processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,72 @@
+# miner_hash.py
+#
+# Núcleo de hashing compartilhado entre cliente (miner_engine) e servidor
+# (miner_server), para que os dois validem soluções exatamente do mesmo jeito.
+#
+# Regra do desafio: SHA-1(solução) em hexadecimal termina com N zeros.
+# Cada zero hexadecimal é um nibble (4 bits) zerado no FIM do digest, então
+# a verificação é feita direto nos bytes de digest(), sem gerar a string hex.
+# O alvo é guardado em bits (DifficultyTarget), o que permite dificuldades
+# entre dois números de zeros (ex.: 18 bits = 4,5 zeros); o desafio em
+# zeros hexadecimais é o número de bits / 4, arredondado para cima.
+
+import hashlib
+
+# Tamanho do digest do SHA-1 em bytes
+DIGEST_SIZE = 20
+# Maior alvo possível: todos os bits do digest
+MAX_BITS = 8 * DIGEST_SIZE
+
+
+class DifficultyTarget:
+    """Alvo de dificuldade: quantidade de bits zerados no fim do digest."""
+    __slots__ = ('bits', 'mask', 'zero_bytes')
+
+    def __init__(self, bits):
+        self.bits = bits
+        # Máscara com os 'bits' menos significativos ligados
+        self.mask = (1 << bits) - 1
+        # Bytes inteiros que precisam ser zero (filtro rápido com endswith)
+        self.zero_bytes = b'\x00' * (bits // 8)
+
+    @classmethod
+    def from_challenge(cls, challenge_level):
+        # Challenge = número de zeros hexadecimais = 4 bits cada
+        return cls(4 * challenge_level)
+
+    def check(self, digest):
+        # endswith descarta quase todos os candidatos; o teste com a máscara
+        # só cobre o nibble/bits que sobram quando bits não é múltiplo de 8
+        return digest.endswith(self.zero_bytes) and not (int.from_bytes(digest, 'big') & self.mask)
+
+
+class PrefixHasher:
+    """
+    SHA-1 com o prefixo já processado ("midstate").
+    O prefixo é passado ao hash uma única vez; para cada nonce basta
+    copiar o estado e alimentar só os bytes do nonce.
+    Laços quentes podem usar base.copy() diretamente para evitar a chamada.
+    """
+    __slots__ = ('base',)
+
+    def __init__(self, prefix):
+        self.base = hashlib.sha1(prefix)
+
+    def digest(self, suffix):
+        h = self.base.copy()
+        h.update(suffix)
+        return h.digest()
+
+
+def hex_zeros(bits):
+    """Desafio em zeros hexadecimais que cobre um alvo de 'bits' bits."""
+    return -(-bits // 4)
+
+
+def solution_digest(solution):
+    return hashlib.sha1(solution.encode('utf-8')).digest()
+
+
+def is_valid_solution(solution, challenge_level):
+    """Valida uma solução (string) contra um challenge (número de zeros hex)."""
+    return DifficultyTarget.from_challenge(challenge_level).check(solution_digest(solution))
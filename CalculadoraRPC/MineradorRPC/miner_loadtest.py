@@ -0,0 +1,145 @@
+# miner_loadtest.py
+#
+# Teste de carga de conexões: servidor com pool de threads x servidor asyncio.
+# Para cada modo o script sobe o servidor (miner_server.py --mode ...) e
+# simula N mineradores ociosos, cada um com a sua própria conexão: um
+# stream WatchChallenges aberto (como o cliente real) e uma consulta
+# GetTransactionStatus a cada --interval segundos. Mede quantas consultas
+# terminam dentro do prazo e a latência (p50/p99) para cada N.
+#
+# Exemplo:
+#   py miner_loadtest.py --modes threads,aio --connections 50,200,1000 --duration 5
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import grpc
+import miner_pb2
+import miner_pb2_grpc
+from miner_db_bench import percentile
+
+SERVER_ADDRESS = 'localhost:50052'
+# Sem isso canais iguais compartilham a mesma conexão TCP
+CHANNEL_OPTIONS = [('grpc.use_local_subchannel_pool', 1)]
+
+
+def raise_fd_limit():
+    # Cada conexão é um descritor de arquivo no cliente e no servidor
+    try:
+        import resource
+    except ImportError:
+        return # Windows
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def start_server(mode):
+    server = subprocess.Popen(
+        [sys.executable, 'miner_server.py', '--mode', mode],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    channel = grpc.insecure_channel(SERVER_ADDRESS)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    channel.close()
+    return server
+
+
+async def miner(stop, deadline, interval, watch, latencies, errors, watching):
+    async with grpc.aio.insecure_channel(SERVER_ADDRESS, options=CHANNEL_OPTIONS) as channel:
+        stub = miner_pb2_grpc.MinerStub(channel)
+
+        async def watcher(call):
+            try:
+                async for _ in call:
+                    watching.add(id(channel))
+            except (grpc.aio.AioRpcError, asyncio.CancelledError):
+                pass
+
+        watch_call = stub.WatchChallenges(miner_pb2.Empty()) if watch else None
+        watch_task = asyncio.create_task(watcher(watch_call)) if watch else None
+        perf = time.perf_counter
+        while not stop.is_set():
+            t0 = perf()
+            try:
+                await stub.GetTransactionStatus(miner_pb2.TransactionRequest(transactionID=0), timeout=deadline)
+                latencies.append(perf() - t0)
+            except grpc.aio.AioRpcError as e:
+                errors[e.code().name] = errors.get(e.code().name, 0) + 1
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+        if watch_call is not None:
+            # Cancela a chamada (e não só a task), para o canal fechar limpo
+            watch_call.cancel()
+            await watch_task
+
+
+async def run_level(connections, duration, deadline, interval, watch):
+    stop = asyncio.Event()
+    latencies = []
+    errors = {}
+    watching = set()
+    tasks = [asyncio.create_task(miner(stop, deadline, interval, watch, latencies, errors, watching))
+             for _ in range(connections)]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    ok = len(latencies)
+    failed = sum(errors.values())
+    return {
+        'connections': connections,
+        'duration_s': duration,
+        'calls_ok': ok,
+        'calls_failed': failed,
+        'errors': errors,
+        'watch_streams': len(watching),
+        'calls_per_sec': ok / duration,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga: servidor com threads x asyncio")
+    parser.add_argument('--modes', default='threads,aio', help="Modos do servidor, separados por vírgula")
+    parser.add_argument('--connections', default='50,200,1000',
+                        help="Números de conexões simultâneas, separados por vírgula")
+    parser.add_argument('--duration', type=float, default=5.0, help="Segundos por medição (padrão: 5)")
+    parser.add_argument('--deadline', type=float, default=2.0, help="Prazo de cada consulta em segundos (padrão: 2)")
+    parser.add_argument('--interval', type=float, default=0.1,
+                        help="Segundos entre consultas de cada minerador (padrão: 0.1)")
+    parser.add_argument('--no-watch', action='store_true', help="Não abre streams WatchChallenges")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    results = []
+    for mode in args.modes.split(','):
+        server = start_server(mode)
+        try:
+            for connections in [int(c) for c in args.connections.split(',')]:
+                row = asyncio.run(run_level(connections, args.duration, args.deadline,
+                                            args.interval, not args.no_watch))
+                row['mode'] = mode
+                results.append(row)
+                p50 = f"{row['p50_ms']:.1f}ms" if row['p50_ms'] is not None else "-"
+                p99 = f"{row['p99_ms']:.1f}ms" if row['p99_ms'] is not None else "-"
+                print(f"[Carga] {mode:>7} | {connections:>5} conexões | {row['watch_streams']:>5} streams | "
+                      f"{row['calls_per_sec']:>8,.0f} consultas/s | p50 {p50} | p99 {p99} | "
+                      f"{row['calls_failed']} falhas", file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bminer.proto\"\x07\n\x05\x45mpty\"+\n\x12TransactionRequest\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\"J\n\rSubmitRequest\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\x12\x10\n\x08\x63lientID\x18\x02 \x01(\x05\x12\x10\n\x08solution\x18\x03 \x01(\t\".\n\x15TransactionIDResponse\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\"&\n\x11\x43hallengeResponse\x12\x11\n\tchallenge\x18\x01 \x01(\x05\" \n\x0eStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\x05\" \n\x0eSubmitResponse\x12\x0e\n\x06status\x18\x01 \x01(\x05\"\"\n\x0eWinnerResponse\x12\x10\n\x08\x63lientID\x18\x01 \x01(\x05\"G\n\x10SolutionResponse\x12\x0e\n\x06status\x18\x01 \x01(\x05\x12\x10\n\x08solution\x18\x02 \x01(\t\x12\x11\n\tchallenge\x18\x03 \x01(\x05\x32\xdc\x02\n\x05Miner\x12\x34\n\x10GetTransactionID\x12\x06.Empty\x1a\x16.TransactionIDResponse\"\x00\x12\x39\n\x0cGetChallenge\x12\x13.TransactionRequest\x1a\x12.ChallengeResponse\"\x00\x12>\n\x14GetTransactionStatus\x12\x13.TransactionRequest\x1a\x0f.StatusResponse\"\x00\x12\x34\n\x0fSubmitChallenge\x12\x0e.SubmitRequest\x1a\x0f.SubmitResponse\"\x00\x12\x33\n\tGetWinner\x12\x13.TransactionRequest\x1a\x0f.WinnerResponse\"\x00\x12\x37\n\x0bGetSolution\x12\x13.TransactionRequest\x1a\x11.SolutionResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bminer.proto\"\x07\n\x05\x45mpty\"+\n\x12TransactionRequest\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\"J\n\rSubmitRequest\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\x12\x10\n\x08\x63lientID\x18\x02 \x01(\x05\x12\x10\n\x08solution\x18\x03 \x01(\t\".\n\x15TransactionIDResponse\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\"4\n\x11\x43hallengeResponse\x12\x11\n\tchallenge\x18\x01 \x01(\x05\x12\x0c\n\x04\x62its\x18\x02 \x01(\x05\" \n\x0eStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\x05\" \n\x0eSubmitResponse\x12\x0e\n\x06status\x18\x01 \x01(\x05\"\"\n\x0eWinnerResponse\x12\x10\n\x08\x63lientID\x18\x01 \x01(\x05\"U\n\x10SolutionResponse\x12\x0e\n\x06status\x18\x01 \x01(\x05\x12\x10\n\x08solution\x18\x02 \x01(\t\x12\x11\n\tchallenge\x18\x03 \x01(\x05\x12\x0c\n\x04\x62its\x18\x04 \x01(\x05\"\x1f\n\x0bWorkRequest\x12\x10\n\x08\x63lientID\x18\x01 \x01(\x05\"Y\n\x0cWorkResponse\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\x12\x11\n\tchallenge\x18\x02 \x01(\x05\x12\x11\n\ttimestamp\x18\x03 \x01(\x03\x12\x0c\n\x04\x62its\x18\x04 \x01(\x05\"M\n\x17TransactionBatchRequest\x12\x16\n\x0etransactionIDs\x18\x01 \x03(\x05\x12\r\n\x05start\x18\x02 \x01(\x05\x12\x0b\n\x03\x65nd\x18\x03 \x01(\x05\"=\n\x13StatusBatchResponse\x12\x16\n\x0etransactionIDs\x18\x01 \x03(\x05\x12\x0e\n\x06status\x18\x02 \x03(\x05\"@\n\x13WinnerBatchResponse\x12\x16\n\x0etransactionIDs\x18\x01 \x03(\x05\x12\x11\n\tclientIDs\x18\x02 \x03(\x05\"\x7f\n\x11TransactionRecord\x12\x15\n\rtransactionID\x18\x01 \x01(\x05\x12\x0e\n\x06status\x18\x02 \x01(\x05\x12\x11\n\tchallenge\x18\x03 \x01(\x05\x12\x10\n\x08solution\x18\x04 \x01(\t\x12\x10\n\x08\x63lientID\x18\x05 \x01(\x05\x12\x0c\n\x04\x62its\x18\x06 \x01(\x05\"<\n\x15SolutionBatchResponse\x12#\n\x07records\x18\x01 \x03(\x0b\x32\x12.TransactionRecord\"I\n\x17ListTransactionsRequest\x12\r\n\x05start\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12\x10\n\x08pageSize\x18\x03 \x01(\x05\"6\n\x0fTransactionPage\x12#\n\x07records\x18\x01 \x03(\x0b\x32\x12.TransactionRecord\"h\n\x0e\x43hallengeEvent\x12\x0c\n\x04type\x18\x01 \x01(\x05\x12\x15\n\rtransactionID\x18\x02 \x01(\x05\x12\x11\n\tchallenge\x18\x03 \x01(\x05\x12\x10\n\x08\x63lientID\x18\x04 \x01(\x05\x12\x0c\n\x04\x62its\x18\x05 \x01(\x05\x32\xd5\x05\n\x05Miner\x12\x34\n\x10GetTransactionID\x12\x06.Empty\x1a\x16.TransactionIDResponse\"\x00\x12\x39\n\x0cGetChallenge\x12\x13.TransactionRequest\x1a\x12.ChallengeResponse\"\x00\x12>\n\x14GetTransactionStatus\x12\x13.TransactionRequest\x1a\x0f.StatusResponse\"\x00\x12\x34\n\x0fSubmitChallenge\x12\x0e.SubmitRequest\x1a\x0f.SubmitResponse\"\x00\x12\x33\n\tGetWinner\x12\x13.TransactionRequest\x1a\x0f.WinnerResponse\"\x00\x12\x37\n\x0bGetSolution\x12\x13.TransactionRequest\x1a\x11.SolutionResponse\"\x00\x12(\n\x07GetWork\x12\x0c.WorkRequest\x1a\r.WorkResponse\"\x00\x12M\n\x19GetTransactionStatusBatch\x12\x18.TransactionBatchRequest\x1a\x14.StatusBatchResponse\"\x00\x12\x42\n\x0eGetWinnerBatch\x12\x18.TransactionBatchRequest\x1a\x14.WinnerBatchResponse\"\x00\x12\x46\n\x10GetSolutionBatch\x12\x18.TransactionBatchRequest\x1a\x16.SolutionBatchResponse\"\x00\x12\x42\n\x10ListTransactions\x12\x18.ListTransactionsRequest\x1a\x10.TransactionPage\"\x00\x30\x01\x12.\n\x0fWatchChallenges\x12\x06.Empty\x1a\x0f.ChallengeEvent\"\x00\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -40,15 +40,35 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_TRANSACTIONIDRESPONSE']._serialized_start=145
   _globals['_TRANSACTIONIDRESPONSE']._serialized_end=191
   _globals['_CHALLENGERESPONSE']._serialized_start=193
-  _globals['_CHALLENGERESPONSE']._serialized_end=231
-  _globals['_STATUSRESPONSE']._serialized_start=233
-  _globals['_STATUSRESPONSE']._serialized_end=265
-  _globals['_SUBMITRESPONSE']._serialized_start=267
-  _globals['_SUBMITRESPONSE']._serialized_end=299
-  _globals['_WINNERRESPONSE']._serialized_start=301
-  _globals['_WINNERRESPONSE']._serialized_end=335
-  _globals['_SOLUTIONRESPONSE']._serialized_start=337
-  _globals['_SOLUTIONRESPONSE']._serialized_end=408
-  _globals['_MINER']._serialized_start=411
-  _globals['_MINER']._serialized_end=759
+  _globals['_CHALLENGERESPONSE']._serialized_end=245
+  _globals['_STATUSRESPONSE']._serialized_start=247
+  _globals['_STATUSRESPONSE']._serialized_end=279
+  _globals['_SUBMITRESPONSE']._serialized_start=281
+  _globals['_SUBMITRESPONSE']._serialized_end=313
+  _globals['_WINNERRESPONSE']._serialized_start=315
+  _globals['_WINNERRESPONSE']._serialized_end=349
+  _globals['_SOLUTIONRESPONSE']._serialized_start=351
+  _globals['_SOLUTIONRESPONSE']._serialized_end=436
+  _globals['_WORKREQUEST']._serialized_start=438
+  _globals['_WORKREQUEST']._serialized_end=469
+  _globals['_WORKRESPONSE']._serialized_start=471
+  _globals['_WORKRESPONSE']._serialized_end=560
+  _globals['_TRANSACTIONBATCHREQUEST']._serialized_start=562
+  _globals['_TRANSACTIONBATCHREQUEST']._serialized_end=639
+  _globals['_STATUSBATCHRESPONSE']._serialized_start=641
+  _globals['_STATUSBATCHRESPONSE']._serialized_end=702
+  _globals['_WINNERBATCHRESPONSE']._serialized_start=704
+  _globals['_WINNERBATCHRESPONSE']._serialized_end=768
+  _globals['_TRANSACTIONRECORD']._serialized_start=770
+  _globals['_TRANSACTIONRECORD']._serialized_end=897
+  _globals['_SOLUTIONBATCHRESPONSE']._serialized_start=899
+  _globals['_SOLUTIONBATCHRESPONSE']._serialized_end=959
+  _globals['_LISTTRANSACTIONSREQUEST']._serialized_start=961
+  _globals['_LISTTRANSACTIONSREQUEST']._serialized_end=1034
+  _globals['_TRANSACTIONPAGE']._serialized_start=1036
+  _globals['_TRANSACTIONPAGE']._serialized_end=1090
+  _globals['_CHALLENGEEVENT']._serialized_start=1092
+  _globals['_CHALLENGEEVENT']._serialized_end=1196
+  _globals['_MINER']._serialized_start=1199
+  _globals['_MINER']._serialized_end=1924
 # @@protoc_insertion_point(module_scope)
@@ -65,6 +65,36 @@ class MinerStub(object):
                 request_serializer=miner__pb2.TransactionRequest.SerializeToString,
                 response_deserializer=miner__pb2.SolutionResponse.FromString,
                 _registered_method=True)
+        self.GetWork = channel.unary_unary(
+                '/Miner/GetWork',
+                request_serializer=miner__pb2.WorkRequest.SerializeToString,
+                response_deserializer=miner__pb2.WorkResponse.FromString,
+                _registered_method=True)
+        self.GetTransactionStatusBatch = channel.unary_unary(
+                '/Miner/GetTransactionStatusBatch',
+                request_serializer=miner__pb2.TransactionBatchRequest.SerializeToString,
+                response_deserializer=miner__pb2.StatusBatchResponse.FromString,
+                _registered_method=True)
+        self.GetWinnerBatch = channel.unary_unary(
+                '/Miner/GetWinnerBatch',
+                request_serializer=miner__pb2.TransactionBatchRequest.SerializeToString,
+                response_deserializer=miner__pb2.WinnerBatchResponse.FromString,
+                _registered_method=True)
+        self.GetSolutionBatch = channel.unary_unary(
+                '/Miner/GetSolutionBatch',
+                request_serializer=miner__pb2.TransactionBatchRequest.SerializeToString,
+                response_deserializer=miner__pb2.SolutionBatchResponse.FromString,
+                _registered_method=True)
+        self.ListTransactions = channel.unary_stream(
+                '/Miner/ListTransactions',
+                request_serializer=miner__pb2.ListTransactionsRequest.SerializeToString,
+                response_deserializer=miner__pb2.TransactionPage.FromString,
+                _registered_method=True)
+        self.WatchChallenges = channel.unary_stream(
+                '/Miner/WatchChallenges',
+                request_serializer=miner__pb2.Empty.SerializeToString,
+                response_deserializer=miner__pb2.ChallengeEvent.FromString,
+                _registered_method=True)
 
 
 class MinerServicer(object):
@@ -119,6 +149,53 @@ class MinerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetWork(self, request, context):
+        """Nome: getWork()
+        Retorna, de forma atômica, o transactionID pendente e seu desafio
+        (equivale a getTransactionID + getChallenge em uma única chamada).
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetTransactionStatusBatch(self, request, context):
+        """Versões em lote de getTransactionStatus(), getWinner() e getSolution():
+        uma chamada para vários IDs (lista e/ou faixa), com a mesma semântica
+        das consultas individuais para cada ID.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetWinnerBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSolutionBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListTransactions(self, request, context):
+        """Nome: listTransactions()
+        Percorre a tabela de transações em páginas, num único stream.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchChallenges(self, request, context):
+        """Nome: watchChallenges()
+        Stream com cada novo desafio criado e cada transação resolvida.
+        O primeiro evento é sempre o desafio pendente no momento da assinatura.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_MinerServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -152,6 +229,36 @@ def add_MinerServicer_to_server(servicer, server):
                     request_deserializer=miner__pb2.TransactionRequest.FromString,
                     response_serializer=miner__pb2.SolutionResponse.SerializeToString,
             ),
+            'GetWork': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetWork,
+                    request_deserializer=miner__pb2.WorkRequest.FromString,
+                    response_serializer=miner__pb2.WorkResponse.SerializeToString,
+            ),
+            'GetTransactionStatusBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetTransactionStatusBatch,
+                    request_deserializer=miner__pb2.TransactionBatchRequest.FromString,
+                    response_serializer=miner__pb2.StatusBatchResponse.SerializeToString,
+            ),
+            'GetWinnerBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetWinnerBatch,
+                    request_deserializer=miner__pb2.TransactionBatchRequest.FromString,
+                    response_serializer=miner__pb2.WinnerBatchResponse.SerializeToString,
+            ),
+            'GetSolutionBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSolutionBatch,
+                    request_deserializer=miner__pb2.TransactionBatchRequest.FromString,
+                    response_serializer=miner__pb2.SolutionBatchResponse.SerializeToString,
+            ),
+            'ListTransactions': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListTransactions,
+                    request_deserializer=miner__pb2.ListTransactionsRequest.FromString,
+                    response_serializer=miner__pb2.TransactionPage.SerializeToString,
+            ),
+            'WatchChallenges': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchChallenges,
+                    request_deserializer=miner__pb2.Empty.FromString,
+                    response_serializer=miner__pb2.ChallengeEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'Miner', rpc_method_handlers)
@@ -325,3 +432,165 @@ class Miner(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetWork(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Miner/GetWork',
+            miner__pb2.WorkRequest.SerializeToString,
+            miner__pb2.WorkResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetTransactionStatusBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Miner/GetTransactionStatusBatch',
+            miner__pb2.TransactionBatchRequest.SerializeToString,
+            miner__pb2.StatusBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetWinnerBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Miner/GetWinnerBatch',
+            miner__pb2.TransactionBatchRequest.SerializeToString,
+            miner__pb2.WinnerBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSolutionBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/Miner/GetSolutionBatch',
+            miner__pb2.TransactionBatchRequest.SerializeToString,
+            miner__pb2.SolutionBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListTransactions(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/Miner/ListTransactions',
+            miner__pb2.ListTransactionsRequest.SerializeToString,
+            miner__pb2.TransactionPage.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchChallenges(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/Miner/WatchChallenges',
+            miner__pb2.Empty.SerializeToString,
+            miner__pb2.ChallengeEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
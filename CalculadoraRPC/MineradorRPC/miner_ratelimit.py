@@ -0,0 +1,256 @@
+# miner_ratelimit.py
+#
+# Limite de taxa do SubmitChallenge por cliente, como interceptor do
+# servidor gRPC (com threads ou grpc.aio).
+# Um cliente que manda soluções erradas sem parar ocupa threads do pool,
+# CPU com SHA-1 e linhas de log que os outros mineradores também disputam.
+# O interceptor decide antes do handler: uma tentativa recusada não passa
+# pelo hash, pelo log nem pela trava do banco; custa uma consulta a um
+# dicionário sob uma trava pequena, só do limitador.
+#
+# Duas regras, por chave (o clientID da requisição ou, com --rate-key peer,
+# o endereço de origem da conexão, que o cliente não escolhe):
+#   * balde de fichas: --submit-rate tentativas por segundo, com rajadas de
+#     até --submit-burst; sem ficha a tentativa é recusada (motivo "rate")
+#   * punição crescente: depois de --invalid-threshold respostas status 0
+#     (solução inválida) seguidas, a chave fica bloqueada por --backoff-base
+#     segundos, e o bloqueio dobra a cada nova inválida, até --backoff-max
+#     (motivo "backoff"). Uma solução válida zera a contagem.
+# A recusa é RESOURCE_EXHAUSTED com o tempo de espera (ms) no metadata
+# final "retry-after-ms"; miner_client.py espera esse tempo e tenta de novo.
+#
+# Contadores (no /metrics quando ligado, e no log ao parar o servidor):
+#   miner_ratelimit_rejected_total{reason="rate|backoff"}  tentativas recusadas
+#   miner_ratelimit_backoffs_total                          entradas em punição
+#   miner_ratelimit_keys                                    chaves acompanhadas
+
+import threading
+import time
+import grpc
+import miner_pb2
+from rpc_log import log # Pasta de cima, já no sys.path pelo miner_server
+
+# Nome completo da RPC limitada (as outras passam direto)
+SUBMIT_METHOD = '/{}/SubmitChallenge'.format(miner_pb2.DESCRIPTOR.services_by_name['Miner'].full_name)
+# Acima desse número de chaves as ociosas são descartadas; se ainda assim
+# não couber, as chaves novas dividem um balde só (clientIDs inventados
+# em massa não fazem a tabela crescer sem limite)
+MAX_KEYS = 100_000
+OVERFLOW_KEY = '*'
+# Segundos sem tentativas para uma chave (sem bloqueio ativo) ser descartada
+IDLE_SECONDS = 60.0
+REASONS = ('rate', 'backoff')
+
+
+class _Bucket:
+    __slots__ = ('tokens', 'stamp', 'strikes', 'blocked_until')
+
+    def __init__(self, tokens, now):
+        self.tokens = tokens
+        self.stamp = now
+        self.strikes = 0          # Respostas status 0 seguidas
+        self.blocked_until = 0.0  # Fim da punição atual (time.monotonic)
+
+
+class SubmitLimiter:
+    """
+    Estado do limite: um _Bucket por chave, sob uma trava própria (nunca a
+    do banco). admit() antes do handler, record() com o status da resposta.
+    rate=0 desliga o balde; invalid_threshold=0 desliga a punição.
+    """
+
+    def __init__(self, rate=0.0, burst=0, invalid_threshold=0, backoff_base=0.5, backoff_max=60.0,
+                 key='client', max_keys=MAX_KEYS):
+        self.rate = rate
+        self.burst = burst if burst > 0 else max(1.0, rate)
+        self.invalid_threshold = invalid_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.key = key
+        self.max_keys = max_keys
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.rejected = dict.fromkeys(REASONS, 0)
+        self.backoffs = 0
+
+    def key_of(self, request, context):
+        if self.key == 'peer':
+            # 'ipv4:127.0.0.1:54321' -> 'ipv4:127.0.0.1' (a porta muda a cada conexão)
+            return context.peer().rsplit(':', 1)[0]
+        return request.clientID
+
+    def _bucket(self, key, now):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self._prune(now)
+                if len(self.buckets) >= self.max_keys:
+                    key = OVERFLOW_KEY
+                    bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = _Bucket(self.burst, now)
+        return bucket
+
+    def _prune(self, now):
+        idle = [key for key, bucket in self.buckets.items()
+                if now - bucket.stamp > IDLE_SECONDS and bucket.blocked_until <= now]
+        for key in idle:
+            del self.buckets[key]
+
+    def admit(self, key):
+        """None se a tentativa pode seguir; senão (motivo, segundos até poder tentar de novo)."""
+        now = time.monotonic()
+        with self.lock:
+            bucket = self._bucket(key, now)
+            if bucket.blocked_until > now:
+                self.rejected['backoff'] += 1
+                return 'backoff', bucket.blocked_until - now
+            if self.rate:
+                tokens = min(self.burst, bucket.tokens + (now - bucket.stamp) * self.rate)
+                bucket.stamp = now
+                if tokens < 1:
+                    bucket.tokens = tokens
+                    self.rejected['rate'] += 1
+                    return 'rate', (1 - tokens) / self.rate
+                bucket.tokens = tokens - 1
+            else:
+                bucket.stamp = now
+            return None
+
+    def record(self, key, status):
+        """Conta o resultado de uma tentativa admitida (status do SubmitResponse)."""
+        if not self.invalid_threshold or status not in (0, 1):
+            return
+        with self.lock:
+            bucket = self.buckets.get(key) or self.buckets.get(OVERFLOW_KEY)
+            if bucket is None: # Descartada entre admit() e record()
+                return
+            if status == 1:
+                bucket.strikes = 0
+                return
+            bucket.strikes += 1
+            excess = bucket.strikes - self.invalid_threshold
+            if excess < 0:
+                return
+            penalty = min(self.backoff_max, self.backoff_base * 2 ** min(excess, 32))
+            bucket.blocked_until = time.monotonic() + penalty
+            self.backoffs += 1
+        log.warning("Cliente {key} bloqueado por {penalty:.1f}s após {strikes} soluções inválidas seguidas",
+                    key=key, penalty=penalty, strikes=excess + self.invalid_threshold)
+
+    def register_metrics(self, registry):
+        """Contadores do limitador no /metrics (lidos só quando alguém consulta)."""
+        registry.counter('miner_ratelimit_rejected_total', "Tentativas de SubmitChallenge recusadas, por motivo",
+                         ('reason',), callback=lambda: {(reason,): count for reason, count in self.rejected.items()})
+        registry.counter('miner_ratelimit_backoffs_total', "Vezes que uma chave entrou em punição",
+                         callback=lambda: {(): self.backoffs})
+        registry.gauge('miner_ratelimit_keys', "Chaves (clientes) acompanhadas pelo limitador",
+                       callback=lambda: {(): len(self.buckets)})
+
+    def summary(self):
+        return (f"{sum(self.rejected.values())} tentativas recusadas (taxa {self.rejected['rate']}, "
+                f"punição {self.rejected['backoff']}), {self.backoffs} punições")
+
+    def interceptor(self):
+        return RateLimitInterceptor(self)
+
+    def aio_interceptor(self):
+        return AsyncRateLimitInterceptor(self)
+
+
+def _reject(context, reason, wait):
+    context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+    if reason == 'rate':
+        context.set_details("Limite de tentativas por segundo excedido")
+    else:
+        context.set_details("Muitas soluções inválidas seguidas; aguarde")
+    context.set_trailing_metadata((('retry-after-ms', str(max(1, round(wait * 1000)))),))
+    return miner_pb2.SubmitResponse()
+
+
+class RateLimitInterceptor(grpc.ServerInterceptor):
+    """Interceptor do servidor síncrono: só o SubmitChallenge é embrulhado."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.wrapped = None # (handler original, handler limitado)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler_call_details.method != SUBMIT_METHOD:
+            return handler
+        cached = self.wrapped
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        behavior = handler.unary_unary
+        limiter = self.limiter
+
+        def submit(request, context):
+            key = limiter.key_of(request, context)
+            refused = limiter.admit(key)
+            if refused is not None:
+                return _reject(context, *refused)
+            response = behavior(request, context)
+            limiter.record(key, response.status)
+            return response
+
+        wrapped = grpc.unary_unary_rpc_method_handler(submit, handler.request_deserializer,
+                                                      handler.response_serializer)
+        self.wrapped = (handler, wrapped)
+        return wrapped
+
+
+class AsyncRateLimitInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor do servidor grpc.aio (a trava do limitador nunca espera um await)."""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.wrapped = None
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler_call_details.method != SUBMIT_METHOD:
+            return handler
+        cached = self.wrapped
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        behavior = handler.unary_unary
+        limiter = self.limiter
+
+        async def submit(request, context):
+            key = limiter.key_of(request, context)
+            refused = limiter.admit(key)
+            if refused is not None:
+                return _reject(context, *refused)
+            response = await behavior(request, context)
+            limiter.record(key, response.status)
+            return response
+
+        wrapped = grpc.unary_unary_rpc_method_handler(submit, handler.request_deserializer,
+                                                      handler.response_serializer)
+        self.wrapped = (handler, wrapped)
+        return wrapped
+
+
+def add_arguments(parser):
+    """Opções do limite de tentativas (desligado por padrão)."""
+    parser.add_argument('--submit-rate', type=float, default=0.0,
+                        help="Tentativas de SubmitChallenge por segundo por cliente (padrão: 0, sem limite)")
+    parser.add_argument('--submit-burst', type=float, default=0.0,
+                        help="Rajada máxima de tentativas (padrão: igual a --submit-rate, mínimo 1)")
+    parser.add_argument('--invalid-threshold', type=int, default=0,
+                        help="Soluções inválidas seguidas até o cliente ser bloqueado (padrão: 0, sem punição)")
+    parser.add_argument('--backoff-base', type=float, default=0.5,
+                        help="Primeiro bloqueio em segundos; dobra a cada nova inválida (padrão: 0.5)")
+    parser.add_argument('--backoff-max', type=float, default=60.0,
+                        help="Bloqueio máximo em segundos (padrão: 60)")
+    parser.add_argument('--rate-key', choices=['client', 'peer'], default='client',
+                        help="client: por clientID da requisição; peer: por endereço de origem")
+
+
+def from_args(args):
+    """SubmitLimiter das opções da linha de comando, ou None se as duas regras estão desligadas."""
+    if args.submit_rate <= 0 and args.invalid_threshold <= 0:
+        return None
+    return SubmitLimiter(args.submit_rate, args.submit_burst, args.invalid_threshold,
+                         args.backoff_base, args.backoff_max, args.rate_key)
@@ -1,192 +1,433 @@
-# miner_server.py
-
-import grpc
-import miner_pb2
-import miner_pb2_grpc
-from concurrent import futures
-import time
-import random
-import hashlib # Para o SHA-1
-import threading # Para travar o acesso à tabela
-
-# --- Estrutura de Dados do Servidor ---
-# Vamos usar uma classe para agrupar os dados e a trava
-class TransactionDatabase:
-    def __init__(self):
-        # A tabela de transações.
-        # Estrutura: { transactionID: [Challenge, Solution, WinnerClientID] }
-        self.table = {}
-        # Trava (lock) para evitar que dois clientes escrevam na tabela ao mesmo tempo
-        self.lock = threading.Lock()
-        # O ID da transação atual que está aberta para mineração
-        self.current_transaction_id = -1
-        # Contador para gerar novos IDs
-        self.next_transaction_id = 0
-
-    def create_new_challenge(self):
-        with self.lock: # Trava a tabela
-            # Gera um novo desafio
-            t_id = self.next_transaction_id
-            challenge = random.randint(1, 5) # Desafio [1..5]
-            solution = "" # Solução ainda não encontrada
-            winner = -1   # Ninguém venceu ainda
-
-            # Armazena na tabela
-            self.table[t_id] = [challenge, solution, winner]
-            
-            # Define este como o desafio atual
-            self.current_transaction_id = t_id
-            
-            # Incrementa o contador para a próxima vez
-            self.next_transaction_id += 1
-            
-            print(f"[Servidor] Novo desafio criado! ID: {t_id}, Challenge: {t_id}")
-            return t_id, challenge
-    
-    # Função helper para verificar se um ID existe
-    def is_valid_tid(self, t_id):
-        return t_id in self.table
-
-    # Função helper para verificar se um ID já foi resolvido
-    def is_solved(self, t_id):
-        if not self.is_valid_tid(t_id):
-            return False
-        return self.table[t_id][2] != -1 # Se Winner != -1, está resolvido
-
-
-# Instância global do nosso "banco de dados"
-DB = TransactionDatabase()
-# --- Fim da Estrutura de Dados ---
-
-
-# --- Implementação do Servidor gRPC ---
-class MinerServicer(miner_pb2_grpc.MinerServicer):
-
-    def GetTransactionID(self, request, context):
-        # Retorna o ID da transação que ainda está pendente
-        # Usamos DB.lock para ler com segurança, embora aqui não seja 100%
-        # necessário, é uma boa prática.
-        with DB.lock:
-            tid = DB.current_transaction_id
-        return miner_pb2.TransactionIDResponse(transactionID=tid)
-
-    def GetChallenge(self, request, context):
-        t_id = request.transactionID
-        
-        # Acessa a tabela (apenas leitura, não precisa de trava)
-        if not DB.is_valid_tid(t_id):
-            return miner_pb2.ChallengeResponse(challenge=-1) # ID Inválido
-        
-        challenge = DB.table[t_id][0]
-        return miner_pb2.ChallengeResponse(challenge=challenge)
-
-    def GetTransactionStatus(self, request, context):
-        t_id = request.transactionID
-        
-        if not DB.is_valid_tid(t_id):
-            return miner_pb2.StatusResponse(status=-1) # ID Inválido
-        
-        if DB.is_solved(t_id):
-            return miner_pb2.StatusResponse(status=0) # Resolvido
-        else:
-            return miner_pb2.StatusResponse(status=1) # Pendente
-
-    def GetWinner(self, request, context):
-        t_id = request.transactionID
-        
-        if not DB.is_valid_tid(t_id):
-            return miner_pb2.WinnerResponse(clientID=-1) # ID Inválido
-        
-        winner_id = DB.table[t_id][2] # Pega o ID do vencedor
-        
-        if winner_id == -1:
-            return miner_pb2.WinnerResponse(clientID=0) # Sem vencedor ainda
-        else:
-            return miner_pb2.WinnerResponse(clientID=winner_id)
-
-    def GetSolution(self, request, context):
-        t_id = request.transactionID
-        
-        if not DB.is_valid_tid(t_id):
-            # Retorna status inválido e dados vazios
-            return miner_pb2.SolutionResponse(status=-1, solution="", challenge=0)
-        
-        # Pega os dados da tabela
-        challenge, solution, winner = DB.table[t_id]
-        
-        return miner_pb2.SolutionResponse(status=1, solution=solution, challenge=challenge)
-
-    def SubmitChallenge(self, request, context):
-        t_id = request.transactionID
-        client_id = request.clientID
-        solution = request.solution
-
-        print(f"[Servidor] Recebida tentativa de solução para T_ID {t_id} do Cliente {client_id} (Sol: '{solution}')")
-
-        # --- Ponto Crítico ---
-        # Precisamos travar o banco de dados, pois vamos LER e ESCREVER
-        with DB.lock:
-            if not DB.is_valid_tid(t_id):
-                return miner_pb2.SubmitResponse(status=-1) # ID Inválido
-
-            # Verifica se já foi solucionado
-            if DB.is_solved(t_id):
-                return miner_pb2.SubmitResponse(status=2) # Já solucionado
-
-            # Se chegou aqui, o T_ID é válido e está pendente.
-            # Vamos verificar a solução.
-            challenge_level = DB.table[t_id][0]
-            
-            # --- Lógica de Validação ---
-            # O desafio é: encontrar uma 'solution' (string) que, 
-            # quando aplicada ao SHA-1, o resultado (hash) termine
-            # com N zeros, onde N é o 'challenge_level'.
-            
-            hash_object = hashlib.sha1(solution.encode('utf-8'))
-            hash_hex = hash_object.hexdigest()
-            
-            # O "target" (alvo) é uma string de N zeros
-            target_zeros = '0' * challenge_level
-            
-            # A solução é válida?
-            if hash_hex.endswith(target_zeros):
-                # SOLUÇÃO VÁLIDA!
-                print(f"[Servidor] SUCESSO! Cliente {client_id} resolveu o T_ID {t_id} com o hash {hash_hex}")
-                
-                # Atualiza a tabela
-                DB.table[t_id][1] = solution # Salva a solução
-                DB.table[t_id][2] = client_id # Salva o Vencedor
-                
-                # O desafio atual agora é outro!
-                # Criamos um novo desafio para o futuro
-                DB.create_new_challenge()
-                
-                return miner_pb2.SubmitResponse(status=1) # 1 = Solução Válida
-            else:
-                # SOLUÇÃO INVÁLIDA!
-                print(f"[Servidor] FALHA. Cliente {client_id} errou. Hash: {hash_hex}")
-                return miner_pb2.SubmitResponse(status=0) # 0 = Solução Inválida
-
-# --- Fim da Implementação gRPC ---
-
-
-def serve():
-    # 1. Inicia o banco de dados criando o primeiro desafio (TransactionID = 0)
-    print("[Servidor] Carregando...")
-    DB.create_new_challenge() # Isso cria o T_ID 0
-
-    # 2. Inicia o servidor gRPC
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    miner_pb2_grpc.add_MinerServicer_to_server(MinerServicer(), server)
-    server.add_insecure_port('[::]:50052') # Usando porta 50052 (diferente da calculadora)
-    print("[Servidor] Servidor gRPC iniciado na porta 50052.")
-    server.start()
-    
-    try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
-        print("Parando o servidor...")
-        server.stop(0)
-
-if __name__ == '__main__':
-    serve()
\ No newline at end of file
+# miner_server.py
+
+import argparse
+import functools
+import os
+import sys
+import grpc
+import miner_pb2
+import miner_pb2_grpc
+from concurrent import futures
+import time
+import queue # Filas dos assinantes de WatchChallenges
+import threading
+from miner_db import TransactionDatabase, EVENT_NEW_CHALLENGE, ASSIGN_MODES
+from miner_wal import open_database
+from miner_hash import hex_zeros
+import miner_difficulty
+
+# Módulos comuns às duas atividades (rpc_log.py) ficam na pasta de cima
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rpc_log
+import rpc_metrics
+from rpc_log import log
+import miner_ratelimit
+
+# Tamanho do pool de threads do servidor
+MAX_WORKERS = 64
+# Streams WatchChallenges simultâneos no servidor com threads. Cada um prende
+# uma thread enquanto o minerador está conectado; o resto do pool fica para
+# as RPCs unárias (GetWork, SubmitChallenge...). Acima do limite o stream é
+# recusado e o miner_client.py passa a consultar o status por polling.
+# O servidor asyncio (--mode aio) não tem limite: lá um stream é uma fila.
+MAX_WATCHERS = MAX_WORKERS // 2
+# Limite de transações por consulta em lote (e por página de ListTransactions)
+MAX_BATCH_SIZE = 10000
+# Transações por página de ListTransactions quando o cliente não informa
+DEFAULT_PAGE_SIZE = 500
+# Status do SubmitChallenge -> rótulo result de miner_submits_total
+SUBMIT_RESULTS = {1: 'valid', 0: 'invalid', 2: 'late', -1: 'unknown_id'}
+# Limites (segundos) do histograma do tempo até a solução
+TIME_TO_SOLVE_BUCKETS = (0.01, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 1800, 3600)
+
+
+# --- Estrutura de Dados do Servidor ---
+# A tabela, a trava e os eventos ficam em miner_db.TransactionDatabase
+# Instância global do nosso "banco de dados" (criada em serve())
+DB = None
+# --- Fim da Estrutura de Dados ---
+
+
+def challenge_event(type, t_id, bits, client_id=0):
+    """Evento do WatchChallenges: desafio em zeros hexadecimais e o alvo exato em bits."""
+    return miner_pb2.ChallengeEvent(type=type, transactionID=t_id, challenge=hex_zeros(bits),
+                                    bits=bits, clientID=client_id)
+
+
+# --- Implementação do Servidor gRPC ---
+class MinerServicer(miner_pb2_grpc.MinerServicer):
+
+    def __init__(self, db, max_watchers=None):
+        # O "banco de dados" usado pelas RPCs (normalmente o DB global)
+        self.db = db
+        # Vagas de streams WatchChallenges (None = sem limite)
+        self.watch_slots = threading.BoundedSemaphore(max_watchers) if max_watchers else None
+        self.watch_rejected = 0
+        # Métricas das submissões (ver register_metrics); None = desligadas
+        self.submit_counts = None
+        self.time_to_solve = None
+
+    def GetTransactionID(self, request, context):
+        # Retorna o ID da transação que ainda está pendente (com shards, uma
+        # das abertas, em rodízio). Leitura do snapshot: não precisa de trava.
+        return miner_pb2.TransactionIDResponse(transactionID=self.db.shard_for().current.transaction_id)
+
+    def GetChallenge(self, request, context):
+        t_id = request.transactionID
+        
+        # Acessa a tabela (apenas leitura, não precisa de trava)
+        record = self.db.get(t_id)
+        if record is None:
+            return miner_pb2.ChallengeResponse(challenge=-1) # ID Inválido
+        
+        return miner_pb2.ChallengeResponse(challenge=hex_zeros(record.challenge), bits=record.challenge)
+
+    def GetTransactionStatus(self, request, context):
+        t_id = request.transactionID
+        
+        if not self.db.is_valid_tid(t_id):
+            return miner_pb2.StatusResponse(status=-1) # ID Inválido
+        
+        if self.db.is_solved(t_id):
+            return miner_pb2.StatusResponse(status=0) # Resolvido
+        else:
+            return miner_pb2.StatusResponse(status=1) # Pendente
+
+    def GetWinner(self, request, context):
+        t_id = request.transactionID
+        
+        record = self.db.get(t_id)
+        if record is None:
+            return miner_pb2.WinnerResponse(clientID=-1) # ID Inválido
+        
+        winner_id = record.winner # Pega o ID do vencedor
+        
+        if winner_id == -1:
+            return miner_pb2.WinnerResponse(clientID=0) # Sem vencedor ainda
+        else:
+            return miner_pb2.WinnerResponse(clientID=winner_id)
+
+    def GetSolution(self, request, context):
+        t_id = request.transactionID
+        
+        # Uma única leitura da tupla: solução e desafio sempre consistentes
+        record = self.db.get(t_id)
+        if record is None:
+            # Retorna status inválido e dados vazios
+            return miner_pb2.SolutionResponse(status=-1, solution="", challenge=0)
+        
+        return miner_pb2.SolutionResponse(status=1, solution=record.solution,
+                                          challenge=hex_zeros(record.challenge), bits=record.challenge)
+
+    def SubmitChallenge(self, request, context):
+        t_id = request.transactionID
+        client_id = request.clientID
+        solution = request.solution
+
+        log.info("Recebida tentativa de solução para T_ID {t_id} do Cliente {client_id} (Sol: '{solution}')",
+                 t_id=t_id, client_id=client_id, solution=solution)
+
+        # --- Lógica de Validação ---
+        # O desafio é: encontrar uma 'solution' (string) que, 
+        # quando aplicada ao SHA-1, o resultado (hash) termine
+        # com N zeros, onde N é o 'challenge_level'.
+        # self.db.submit verifica o hash SEM a trava e só trava para o
+        # compare-and-set do vencedor (ver miner_db.py).
+        shard = self.db.shard_of(t_id)
+        opened = shard.current # Para o tempo até a solução
+        status, digest = self.db.submit(t_id, client_id, solution)
+
+        # Logs e métricas fora de qualquer trava (e só enfileirados; ver rpc_log.py)
+        self.log_submit(status, t_id, client_id, digest, shard)
+        if self.submit_counts is not None:
+            self.record_submit(status, t_id, opened)
+        return miner_pb2.SubmitResponse(status=status)
+
+    def log_submit(self, status, t_id, client_id, digest, shard):
+        if status == 1:
+            log.info("SUCESSO! Cliente {client_id} resolveu o T_ID {t_id} com o hash {digest}",
+                     client_id=client_id, t_id=t_id, digest=digest.hex())
+            current = shard.current
+            if current.transaction_id != -1: # Pendente recuperado sem shard: não abre outro
+                log.info("Novo desafio criado! ID: {t_id}, Challenge: {challenge} ({bits} bits)",
+                         t_id=current.transaction_id, challenge=hex_zeros(current.challenge),
+                         bits=current.challenge)
+        elif status == 0:
+            log.info("FALHA. Cliente {client_id} errou. Hash: {digest}", client_id=client_id, digest=digest.hex())
+
+    def record_submit(self, status, t_id, opened):
+        self.submit_counts[status].inc()
+        if status == 1 and opened.transaction_id == t_id and opened.opened_at is not None:
+            self.time_to_solve.observe(time.monotonic() - opened.opened_at)
+
+    def register_metrics(self, registry):
+        """Métricas do minerador no /metrics, ao lado das métricas gRPC."""
+        submits = registry.counter('miner_submits_total', "Soluções recebidas, por resultado", ('result',))
+        self.submit_counts = {status: submits.labels(result) for status, result in SUBMIT_RESULTS.items()}
+        self.time_to_solve = registry.histogram(
+            'miner_time_to_solve_seconds', "Tempo entre abrir um desafio e receber a solução válida",
+            buckets=TIME_TO_SOLVE_BUCKETS).labels()
+        registry.gauge('miner_current_transaction_id', "Transação aberta para mineração, por shard", ('shard',),
+                       callback=lambda: {(s.index,): s.current.transaction_id for s in self.db.shards})
+        registry.gauge('miner_current_challenge', "Desafio da transação aberta (zeros hexadecimais), por shard",
+                       ('shard',), callback=lambda: {(s.index,): hex_zeros(s.current.challenge) for s in self.db.shards})
+        registry.gauge('miner_current_bits', "Alvo da transação aberta em bits, por shard", ('shard',),
+                       callback=lambda: {(s.index,): s.current.challenge for s in self.db.shards})
+        difficulty = self.db.difficulty
+        if difficulty is not None:
+            registry.gauge('miner_difficulty_bits', "Dificuldade desejada pelo controle (bits, contínua)",
+                           callback=lambda: {(): difficulty.bits})
+            registry.gauge('miner_hash_rate_estimate', "Hashes/s estimados por transação aberta",
+                           callback=lambda: {(): difficulty.hash_rate})
+        registry.gauge('miner_transactions', "Transações na tabela",
+                       callback=lambda: {(): self.db.next_transaction_id})
+        registry.gauge('miner_watchers', "Streams WatchChallenges abertos",
+                       callback=lambda: {(): len(self.db.events.subscribers)})
+        registry.counter('miner_watchers_rejected_total', "Streams WatchChallenges recusados pelo limite",
+                         callback=lambda: {(): self.watch_rejected})
+
+    def GetWork(self, request, context):
+        # ID e desafio vêm do mesmo snapshot: o par é sempre consistente.
+        # Com shards, cada cliente recebe a transação do seu shard
+        current = self.db.shard_for(request.clientID).current
+        return miner_pb2.WorkResponse(
+            transactionID=current.transaction_id, challenge=hex_zeros(current.challenge),
+            timestamp=int(time.time() * 1000), bits=current.challenge
+        )
+
+    # --- Consultas em lote ---
+    # Mesma semântica das consultas individuais acima, aplicada a cada ID.
+
+    def _status_of(self, t_id):
+        record = self.db.get(t_id)
+        if record is None:
+            return -1 # ID Inválido
+        return 1 if record.winner == -1 else 0
+
+    def _winner_of(self, t_id):
+        record = self.db.get(t_id)
+        if record is None:
+            return -1 # ID Inválido
+        return 0 if record.winner == -1 else record.winner
+
+    def _record_of(self, t_id):
+        record = self.db.get(t_id)
+        if record is None:
+            return miner_pb2.TransactionRecord(transactionID=t_id, status=-1, clientID=-1)
+        challenge, solution, winner = record.challenge, record.solution, record.winner
+        return miner_pb2.TransactionRecord(
+            transactionID=t_id,
+            status=1 if winner == -1 else 0,
+            challenge=hex_zeros(challenge),
+            solution=solution,
+            clientID=0 if winner == -1 else winner,
+            bits=challenge
+        )
+
+    def _batch_ids(self, request, context):
+        """IDs pedidos (lista + faixa), ou None se passar de MAX_BATCH_SIZE."""
+        ids = list(request.transactionIDs)
+        if request.end > request.start:
+            # A faixa é limitada às transações que existem
+            ids.extend(range(max(request.start, 0), min(request.end, self.db.next_transaction_id)))
+        if len(ids) > MAX_BATCH_SIZE:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Erro: no máximo {MAX_BATCH_SIZE} transações por chamada!")
+            return None
+        return ids
+
+    def GetTransactionStatusBatch(self, request, context):
+        ids = self._batch_ids(request, context)
+        if ids is None:
+            return miner_pb2.StatusBatchResponse()
+        return miner_pb2.StatusBatchResponse(
+            transactionIDs=ids, status=[self._status_of(t_id) for t_id in ids]
+        )
+
+    def GetWinnerBatch(self, request, context):
+        ids = self._batch_ids(request, context)
+        if ids is None:
+            return miner_pb2.WinnerBatchResponse()
+        return miner_pb2.WinnerBatchResponse(
+            transactionIDs=ids, clientIDs=[self._winner_of(t_id) for t_id in ids]
+        )
+
+    def GetSolutionBatch(self, request, context):
+        ids = self._batch_ids(request, context)
+        if ids is None:
+            return miner_pb2.SolutionBatchResponse()
+        return miner_pb2.SolutionBatchResponse(records=[self._record_of(t_id) for t_id in ids])
+
+    def ListTransactions(self, request, context):
+        # O fim é fixado no início: transações criadas durante a varredura ficam de fora
+        end = self.db.next_transaction_id
+        if request.limit > 0:
+            end = min(end, request.start + request.limit)
+        page_size = request.pageSize if request.pageSize > 0 else DEFAULT_PAGE_SIZE
+        page_size = min(page_size, MAX_BATCH_SIZE)
+
+        for page_start in range(max(request.start, 0), end, page_size):
+            if not context.is_active():
+                break
+            page_end = min(page_start + page_size, end)
+            yield miner_pb2.TransactionPage(
+                records=[self._record_of(t_id) for t_id in range(page_start, page_end)]
+            )
+
+    def WatchChallenges(self, request, context):
+        # Cada assinante ocupa uma thread do pool enquanto o stream estiver
+        # aberto: sem vaga, recusa na hora em vez de esgotar o pool
+        slots = self.watch_slots
+        if slots is not None and not slots.acquire(blocking=False):
+            self.watch_rejected += 1
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details("Limite de streams WatchChallenges atingido; consulte o status por polling")
+            return
+        q = self.db.events.subscribe()
+        try:
+            # Primeiros eventos: os desafios pendentes agora (um por shard)
+            for current in self.db.open_transactions():
+                yield challenge_event(EVENT_NEW_CHALLENGE, current.transaction_id, current.challenge)
+            while context.is_active():
+                try:
+                    # Timeout para perceber quando o cliente desconecta
+                    event = q.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                yield challenge_event(event.type, event.transaction_id, event.challenge, event.client_id)
+        finally:
+            self.db.events.unsubscribe(q)
+            if slots is not None:
+                slots.release()
+
+# --- Fim da Implementação gRPC ---
+
+
+def load_database(data_dir=None, sync_interval=0.0, database_class=TransactionDatabase, shards=1, assign='hash',
+                  difficulty=None):
+    """
+    Abre o banco de dados: do disco (snapshot + log) se houver data_dir,
+    senão vazio em memória. Liga o controle de dificuldade, se houver, e
+    garante que cada shard tenha um desafio pendente.
+    """
+    print("[Servidor] Carregando...")
+    database_class = functools.partial(database_class, shards, assign)
+    if data_dir:
+        start = time.perf_counter()
+        db = open_database(data_dir, sync_interval=sync_interval, database_class=database_class)
+        print(f"[Servidor] {db.next_transaction_id} transações recuperadas de {data_dir} "
+              f"em {time.perf_counter() - start:.2f}s.")
+    else:
+        db = database_class()
+    for current in db.open_transactions():
+        print(f"[Servidor] Desafio pendente: ID {current.transaction_id}, "
+              f"Challenge {hex_zeros(current.challenge)} ({current.challenge} bits)")
+    if difficulty is not None:
+        if difficulty.bits is None: # Continua da dificuldade da última transação
+            count = db.next_transaction_id
+            difficulty.set_bits(db.challenges[count - 1] if count else miner_difficulty.INITIAL_BITS)
+        db.difficulty = difficulty
+        print(f"[Servidor] Controle de dificuldade: alvo de {difficulty.target_time}s por transação, "
+              f"começando em {difficulty.bits:.1f} bits.")
+    db.fill_shards() # Shards sem transação pendente: cria os próximos (T_ID 0 num banco novo)
+    if len(db.shards) > 1:
+        print(f"[Servidor] {len(db.shards)} transações abertas ao mesmo tempo (distribuição: {assign}).")
+    return db
+
+
+def start_metrics(metrics, servicer, port, limiter=None):
+    """Acrescenta as métricas do minerador às métricas gRPC e serve /metrics na porta dada."""
+    servicer.register_metrics(metrics.registry)
+    if limiter is not None:
+        limiter.register_metrics(metrics.registry)
+    print(f"[Servidor] Métricas em http://127.0.0.1:{port}/metrics")
+    return rpc_metrics.start_http_server(metrics.registry, port)
+
+
+def interceptors(metrics, limiter, aio=False):
+    """
+    Interceptores do servidor, na ordem em que rodam: as métricas por fora
+    (contam as recusas como RESOURCE_EXHAUSTED), o limite de tentativas por
+    dentro. None se não há nenhum.
+    """
+    chain = []
+    if metrics is not None:
+        chain.append(metrics.aio_interceptor() if aio else metrics.interceptor())
+    if limiter is not None:
+        chain.append(limiter.aio_interceptor() if aio else limiter.interceptor())
+    return chain or None
+
+
+def serve(data_dir=None, sync_interval=0.0, metrics_port=0, limiter=None, shards=1, assign='hash', difficulty=None,
+          max_watchers=MAX_WATCHERS):
+    global DB
+    # 1. Inicia o banco de dados
+    DB = load_database(data_dir, sync_interval, shards=shards, assign=assign, difficulty=difficulty)
+
+    # 2. Inicia o servidor gRPC
+    # Cada stream WatchChallenges prende uma thread: até max_watchers deles,
+    # e as outras threads ficam livres para as RPCs unárias
+    executor = futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    metrics = rpc_metrics.ServerMetrics() if metrics_port else None
+    server = grpc.server(executor, interceptors=interceptors(metrics, limiter))
+    servicer = MinerServicer(DB, max_watchers)
+    miner_pb2_grpc.add_MinerServicer_to_server(servicer, server)
+    metrics_server = None
+    if metrics:
+        metrics.watch_executor(executor)
+        metrics_server = start_metrics(metrics, servicer, metrics_port, limiter)
+    server.add_insecure_port('[::]:50052') # Usando porta 50052 (diferente da calculadora)
+    print("[Servidor] Servidor gRPC iniciado na porta 50052.")
+    print(f"[Servidor] Até {max_watchers} streams WatchChallenges ({MAX_WORKERS} threads); "
+          "os outros mineradores consultam por polling. Para mais, use --mode aio.")
+    server.start()
+    
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        print("Parando o servidor...")
+        server.stop(0)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if limiter is not None:
+            print(f"[Servidor] Limite de tentativas: {limiter.summary()}")
+        DB.close() # Grava o que falta do log
+        log.close() # E o que ainda está na fila do log de eventos
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor do minerador gRPC")
+    parser.add_argument('--mode', choices=['threads', 'aio'], default='threads',
+                        help="threads: pool de threads (padrão); aio: servidor asyncio (grpc.aio)")
+    parser.add_argument('--data-dir', default=None,
+                        help="Diretório do log/snapshot; sem ele o histórico fica só em memória")
+    parser.add_argument('--sync-interval', type=float, default=0.0,
+                        help="Milissegundos extras para juntar registros antes de cada fsync (padrão: 0)")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="Transações abertas ao mesmo tempo, cada uma com a sua trava (padrão: 1)")
+    parser.add_argument('--assign', choices=ASSIGN_MODES, default='hash',
+                        help="Shard de cada minerador: hash do clientID (padrão) ou round-robin a cada pedido")
+    parser.add_argument('--max-watchers', type=int, default=MAX_WATCHERS,
+                        help=f"Streams WatchChallenges simultâneos no modo threads, menos que as {MAX_WORKERS} "
+                             f"threads do pool (padrão: {MAX_WATCHERS})")
+    rpc_log.add_arguments(parser)
+    rpc_metrics.add_arguments(parser)
+    miner_ratelimit.add_arguments(parser)
+    miner_difficulty.add_arguments(parser)
+    args = parser.parse_args()
+    rpc_log.configure_from_args(args)
+    limiter = miner_ratelimit.from_args(args)
+    difficulty = miner_difficulty.from_args(args)
+    if not 0 < args.max_watchers < MAX_WORKERS:
+        parser.error(f"--max-watchers deve ficar entre 1 e {MAX_WORKERS - 1}")
+    if args.mode == 'aio':
+        import asyncio
+        from miner_server_aio import serve_async
+        try:
+            asyncio.run(serve_async(args.data_dir, args.sync_interval / 1000, args.metrics_port, limiter,
+                                    args.shards, args.assign, difficulty))
+        except KeyboardInterrupt:
+            pass # serve_async já parou o servidor
+    else:
+        serve(args.data_dir, args.sync_interval / 1000, args.metrics_port, limiter, args.shards, args.assign,
+              difficulty, args.max_watchers)
\ No newline at end of file
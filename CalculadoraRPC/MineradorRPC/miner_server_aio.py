@@ -0,0 +1,128 @@
+# miner_server_aio.py
+#
+# Servidor do minerador com grpc.aio (asyncio).
+# No servidor com pool de threads cada RPC em andamento ocupa uma thread, e
+# cada stream WatchChallenges aberto prende uma thread enquanto o minerador
+# estiver conectado: com mais mineradores que threads, as outras chamadas
+# ficam na fila. Aqui cada RPC é uma corrotina no event loop; streams
+# ociosos só custam uma asyncio.Queue.
+#
+# Uso (mesmos argumentos do servidor com threads):
+#   py miner_server.py --mode aio [--data-dir dados]
+
+import asyncio
+import grpc
+import miner_pb2
+import miner_pb2_grpc
+from miner_db import AsyncTransactionDatabase, EVENT_NEW_CHALLENGE
+from miner_server import (MinerServicer, load_database, log, start_metrics, interceptors, challenge_event,
+                          DEFAULT_PAGE_SIZE, MAX_BATCH_SIZE)
+import rpc_metrics # Pasta de cima, já no sys.path pelo import acima
+
+
+class AsyncMinerServicer(MinerServicer):
+    """
+    As mesmas RPCs de MinerServicer, como corrotinas.
+    As leituras não bloqueiam (snapshot e colunas do banco), então
+    reaproveitam o código síncrono direto no loop.
+    """
+
+    async def GetTransactionID(self, request, context):
+        return super().GetTransactionID(request, context)
+
+    async def GetChallenge(self, request, context):
+        return super().GetChallenge(request, context)
+
+    async def GetTransactionStatus(self, request, context):
+        return super().GetTransactionStatus(request, context)
+
+    async def GetWinner(self, request, context):
+        return super().GetWinner(request, context)
+
+    async def GetSolution(self, request, context):
+        return super().GetSolution(request, context)
+
+    async def GetWork(self, request, context):
+        return super().GetWork(request, context)
+
+    async def GetTransactionStatusBatch(self, request, context):
+        return super().GetTransactionStatusBatch(request, context)
+
+    async def GetWinnerBatch(self, request, context):
+        return super().GetWinnerBatch(request, context)
+
+    async def GetSolutionBatch(self, request, context):
+        return super().GetSolutionBatch(request, context)
+
+    async def SubmitChallenge(self, request, context):
+        t_id = request.transactionID
+        client_id = request.clientID
+        solution = request.solution
+
+        log.info("Recebida tentativa de solução para T_ID {t_id} do Cliente {client_id} (Sol: '{solution}')",
+                 t_id=t_id, client_id=client_id, solution=solution)
+
+        # Verificação e compare-and-set sem await no meio (ver AsyncTransactionDatabase)
+        shard = self.db.shard_of(t_id)
+        opened = shard.current
+        status, digest = await self.db.submit(t_id, client_id, solution)
+
+        self.log_submit(status, t_id, client_id, digest, shard)
+        if self.submit_counts is not None:
+            self.record_submit(status, t_id, opened)
+        return miner_pb2.SubmitResponse(status=status)
+
+    async def ListTransactions(self, request, context):
+        end = self.db.next_transaction_id
+        if request.limit > 0:
+            end = min(end, request.start + request.limit)
+        page_size = request.pageSize if request.pageSize > 0 else DEFAULT_PAGE_SIZE
+        page_size = min(page_size, MAX_BATCH_SIZE)
+
+        for page_start in range(max(request.start, 0), end, page_size):
+            page_end = min(page_start + page_size, end)
+            # Se o cliente desconectar, o yield levanta CancelledError
+            yield miner_pb2.TransactionPage(
+                records=[self._record_of(t_id) for t_id in range(page_start, page_end)]
+            )
+
+    async def WatchChallenges(self, request, context):
+        # Um assinante é só uma asyncio.Queue; nenhuma thread fica presa
+        q = self.db.events.subscribe()
+        try:
+            for current in self.db.open_transactions():
+                yield challenge_event(EVENT_NEW_CHALLENGE, current.transaction_id, current.challenge)
+            while True:
+                # Desconexão do cliente cancela a corrotina aqui
+                event = await q.get()
+                yield challenge_event(event.type, event.transaction_id, event.challenge, event.client_id)
+        finally:
+            self.db.events.unsubscribe(q)
+
+
+async def serve_async(data_dir=None, sync_interval=0.0, metrics_port=0, limiter=None, shards=1, assign='hash',
+                      difficulty=None):
+    db = load_database(data_dir, sync_interval, AsyncTransactionDatabase, shards, assign, difficulty)
+
+    metrics = rpc_metrics.ServerMetrics() if metrics_port else None
+    server = grpc.aio.server(interceptors=interceptors(metrics, limiter, aio=True))
+    servicer = AsyncMinerServicer(db)
+    miner_pb2_grpc.add_MinerServicer_to_server(servicer, server)
+    metrics_server = start_metrics(metrics, servicer, metrics_port, limiter) if metrics else None
+    server.add_insecure_port('[::]:50052')
+    print("[Servidor] Servidor gRPC (asyncio) iniciado na porta 50052.")
+    await server.start()
+
+    try:
+        await server.wait_for_termination()
+    except asyncio.CancelledError:
+        # Ctrl+C: asyncio.run cancela esta corrotina
+        print("Parando o servidor...")
+        await server.stop(0)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if limiter is not None:
+            print(f"[Servidor] Limite de tentativas: {limiter.summary()}")
+        db.close() # Grava o que falta do log
+        log.close()
@@ -0,0 +1,169 @@
+# miner_shard_bench.py
+#
+# Vazão de transações resolvidas com K transações abertas ao mesmo tempo
+# (miner_server.py --shards K) e N mineradores.
+# A mineração é simulada: cada minerador "minera" esperando um tempo
+# sorteado da distribuição exponencial com média 2^bits / --hash-rate
+# (a busca por nonce não tem memória) e submete uma solução válida
+# pré-calculada: uma solução com --solution-bits bits zerados vale para
+# qualquer alvo menor. Assim centenas de mineradores cabem num só processo
+# e o resultado não depende de quantos núcleos a máquina tem.
+# Como no cliente real (miner_client.py --headless), cada minerador pede
+# trabalho com GetWork(clientID), e um stream WatchChallenges avisa quando o
+# T_ID sendo minerado foi resolvido por outro: o minerador desiste e pede
+# trabalho novo (rodada abortada). Submissões que chegam depois do vencedor
+# voltam com status 2 (tarde).
+# Com --target-time o servidor liga o controle de dificuldade
+# (miner_difficulty.py): o intervalo entre soluções de cada shard deve ficar
+# perto do alvo qualquer que seja o número de mineradores, com o alvo em
+# bits subindo com a frota. --hash-rate baixo mantém os alvos abaixo de
+# --solution-bits. O controle leva algumas dezenas de soluções para se
+# ajustar a uma frota nova (a janela de estimativa ainda tem as soluções da
+# medição anterior); --warmup deixa esse trecho fora da contagem.
+#
+# Exemplo:
+#   py miner_shard_bench.py --shards 1,4,16 --miners 16,64 --duration 10
+#   py miner_shard_bench.py --shards 1,4 --miners 4,64 --target-time 0.5 --hash-rate 2000 \
+#       --warmup 30 --duration 30
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import threading
+import grpc
+import miner_pb2
+import miner_pb2_grpc
+from miner_engine import mine_worker
+
+SERVER_ADDRESS = 'localhost:50052'
+CHANNEL_OPTIONS = [('grpc.use_local_subchannel_pool', 1)]
+
+
+def start_server(mode, shards, assign, target_time, max_bits):
+    difficulty = ['--target-time', str(target_time), '--max-bits', str(max_bits)] if target_time > 0 else []
+    server = subprocess.Popen(
+        [sys.executable, 'miner_server.py', '--mode', mode, '--shards', str(shards),
+         '--assign', assign, '--log-level', 'warning'] + difficulty,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    channel = grpc.insecure_channel(SERVER_ADDRESS)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    channel.close()
+    return server
+
+
+async def run_level(miners, channels, duration, hash_rate, solution, seed, warmup=0.0):
+    rng = random.Random(seed)
+    opened = [grpc.aio.insecure_channel(SERVER_ADDRESS, options=CHANNEL_OPTIONS) for _ in range(channels)]
+    stubs = [miner_pb2_grpc.MinerStub(channel) for channel in opened]
+    solved = {} # T_ID -> asyncio.Event, ligado quando o servidor anuncia o vencedor
+    counts = {'won': 0, 'late': 0, 'aborted': 0, 'other': 0}
+    won_bits = []
+    stop = asyncio.Event()
+
+    async def watcher():
+        # Um stream para o processo todo, como um pool de mineração
+        call = stubs[0].WatchChallenges(miner_pb2.Empty())
+        try:
+            async for event in call:
+                if event.type == 2: # EVENT_SOLVED
+                    solved.setdefault(event.transactionID, asyncio.Event()).set()
+        except (grpc.aio.AioRpcError, asyncio.CancelledError):
+            pass
+        return call
+
+    async def miner(client_id):
+        stub = stubs[client_id % channels]
+        while not stop.is_set():
+            work = await stub.GetWork(miner_pb2.WorkRequest(clientID=client_id))
+            t_id, bits = work.transactionID, work.bits or 4 * work.challenge
+            done = solved.setdefault(t_id, asyncio.Event())
+            if not done.is_set():
+                try:
+                    await asyncio.wait_for(done.wait(), rng.expovariate(hash_rate / 2 ** bits))
+                except asyncio.TimeoutError:
+                    pass
+            if done.is_set():
+                counts['aborted'] += 1
+                continue
+            response = await stub.SubmitChallenge(miner_pb2.SubmitRequest(
+                transactionID=t_id, clientID=client_id, solution=solution))
+            key = {1: 'won', 2: 'late'}.get(response.status, 'other')
+            counts[key] += 1
+            if key == 'won':
+                won_bits.append(bits)
+
+    watch_task = asyncio.create_task(watcher())
+    await asyncio.sleep(0.2) # O stream abre antes dos mineradores começarem
+    tasks = [asyncio.create_task(miner(client_id)) for client_id in range(1, miners + 1)]
+    if warmup > 0:
+        await asyncio.sleep(warmup)
+        counts.update(dict.fromkeys(counts, 0))
+        won_bits.clear()
+    start = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    watch_task.cancel()
+    await asyncio.gather(watch_task, return_exceptions=True)
+    for channel in opened:
+        await channel.close()
+
+    submits = counts['won'] + counts['late'] + counts['other']
+    return dict(counts, miners=miners, solved_per_sec=counts['won'] / elapsed,
+                late_ratio=counts['late'] / submits if submits else 0.0,
+                mean_bits=sum(won_bits) / len(won_bits) if won_bits else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transações resolvidas/s com K shards e N mineradores")
+    parser.add_argument('--shards', default='1,4,16', help="Valores de K, separados por vírgula (padrão: 1,4,16)")
+    parser.add_argument('--miners', default='16,64', help="Números de mineradores, separados por vírgula")
+    parser.add_argument('--assign', choices=['hash', 'round-robin'], default='hash', help="Distribuição dos shards")
+    parser.add_argument('--mode', choices=['threads', 'aio'], default='aio', help="Modo do servidor (padrão: aio)")
+    parser.add_argument('--hash-rate', type=float, default=1e6,
+                        help="Hashes/s simulados por minerador (padrão: 1000000)")
+    parser.add_argument('--channels', type=int, default=4, help="Canais do cliente (padrão: 4)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Segundos por medição (padrão: 10)")
+    parser.add_argument('--warmup', type=float, default=0.0,
+                        help="Segundos de mineração antes de cada medição, fora da contagem (padrão: 0)")
+    parser.add_argument('--seed', type=int, default=1, help="Semente dos tempos de mineração (padrão: 1)")
+    parser.add_argument('--target-time', type=float, default=0.0,
+                        help="Liga o controle de dificuldade do servidor com esse alvo em segundos (padrão: 0, desligado)")
+    parser.add_argument('--solution-bits', type=int, default=20,
+                        help="Bits zerados da solução simulada, maior alvo aceito (padrão: 20)")
+    args = parser.parse_args()
+
+    print("[Bench] Minerando a solução usada na simulação...", file=sys.stderr)
+    solution, _, _ = mine_worker(args.solution_bits, "bench-shard-", 0, 1 << 40, threading.Event())
+    results = []
+    for shards in [int(k) for k in args.shards.split(',')]:
+        server = start_server(args.mode, shards, args.assign, args.target_time, args.solution_bits)
+        try:
+            for miners in [int(n) for n in args.miners.split(',')]:
+                row = asyncio.run(run_level(miners, args.channels, args.duration, args.hash_rate,
+                                            solution, args.seed, args.warmup))
+                row.update(shards=shards, assign=args.assign, mode=args.mode, target_time=args.target_time)
+                results.append(row)
+                interval = shards / row['solved_per_sec'] if row['won'] else float('inf')
+                mean_bits = f"{row['mean_bits']:.1f}" if row['mean_bits'] is not None else "-"
+                print(f"[Bench] {shards:>3} shards | {miners:>4} mineradores | "
+                      f"{row['solved_per_sec']:>8,.1f} resolvidas/s | {interval:.2f}s por shard | "
+                      f"alvo médio {mean_bits} bits | {row['late']:>6} tarde "
+                      f"({row['late_ratio']:.0%} das submissões) | {row['aborted']:>6} abortadas",
+                      file=sys.stderr)
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
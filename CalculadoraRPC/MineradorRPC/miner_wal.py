@@ -0,0 +1,352 @@
+# miner_wal.py
+#
+# Persistência do TransactionDatabase: log append-only (write-ahead log)
+# com fsync em lote e snapshots compactados periódicos.
+#
+# Cada escrita do banco (desafio criado / transação resolvida) vira um
+# registro no fim do segmento de log atual. Os registros entram num buffer
+# em memória e uma thread de fundo grava e faz fsync de tudo que acumulou
+# de uma vez (group commit). O SubmitChallenge vencedor só responde depois
+# do fsync do lote que contém o seu registro.
+#
+# A cada snapshot_every registros as colunas do banco são gravadas num
+# snapshot e o log recomeça num novo segmento; os segmentos anteriores são
+# apagados. O snapshot roda numa thread própria: enquanto ele é gravado a
+# thread de fsync continua fechando lotes, e o SubmitChallenge vencedor não
+# espera o snapshot. Na partida o snapshot é mapeado em memória (mmap) e só os
+# segmentos posteriores a ele são reaplicados.
+#
+# Layout de um registro: [tamanho u32][crc32 u32][payload]
+#   desafio criado:     [3 u8][t_id i64][alvo em bits u8]
+#   transação resolvida: [2 u8][t_id i64][winner i32][solução UTF-8]
+# (1 e 2 são os códigos de evento do miner_db; o tipo 1, desafio criado em
+# zeros hexadecimais, é de logs gravados antes do alvo em bits e ainda é lido)
+# Um registro cortado ou com CRC errado no fim do último segmento (queda no
+# meio de uma escrita) é descartado na recuperação.
+#
+# O snapshot guarda as colunas no formato nativo da máquina (array.tofile);
+# ele não é portável entre arquiteturas, o log sim.
+
+import mmap
+import os
+from array import array
+import re
+import struct
+import threading
+import time
+import zlib
+from miner_db import TransactionDatabase, EVENT_NEW_CHALLENGE, EVENT_SOLVED
+
+RECORD_HEADER = struct.Struct('<II')
+CREATED = struct.Struct('<BqB')
+SOLVED = struct.Struct('<Bqi')
+
+RECORD_CREATED_BITS = 3
+
+SNAPSHOT_FILE = 'snapshot.bin'
+SNAPSHOT_MAGIC = b'MINERSNP'
+# Versão 2: a coluna de desafios guarda o alvo em bits (na 1, zeros hexadecimais)
+SNAPSHOT_VERSION = 2
+# magic, versão, primeiro segmento fora do snapshot, transações, bytes de soluções
+SNAPSHOT_HEADER = struct.Struct('<8sIQQQ')
+
+SEGMENT_FORMAT = 'wal-{:08d}.log'
+SEGMENT_RE = re.compile(r'^wal-(\d{8})\.log$')
+
+# Registros entre dois snapshots (cada solução gera 2: resolvida + novo desafio)
+SNAPSHOT_EVERY = 100_000
+
+
+def _fsync_dir(directory):
+    # Garante que criar/renomear arquivos sobreviva a uma queda.
+    # No Windows não dá para abrir um diretório para fsync.
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class TransactionLog:
+    """
+    Segmento de log atual + thread de fsync em lote + thread de snapshot.
+    log_created/log_solved são chamados com a trava de escrita do banco,
+    então a ordem no log é a ordem das escritas. Retornam um número de
+    sequência; wait(seq) bloqueia até esse registro estar no disco.
+    """
+
+    def __init__(self, directory, segment, fsync=True, sync_interval=0.0, snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory
+        self.segment = segment
+        self.fsync = fsync
+        # Espera extra antes de cada lote, para juntar mais registros por fsync
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        # Chamado pela thread de snapshot quando é hora de um (ver open_database)
+        self.checkpoint = None
+        self.snapshot_due = threading.Event()
+        self.file = open(self._path(segment), 'ab')
+
+        self.lock = threading.Lock()
+        self.pending = threading.Condition(self.lock)  # Há registros no buffer
+        self.flushed = threading.Condition(self.lock)  # durable_seq avançou
+        self.io_lock = threading.Lock()                # Uma escrita no arquivo por vez
+        self.buffer = bytearray()
+        self.appended_seq = 0
+        self.durable_seq = 0
+        self.since_snapshot = 0
+        self.closed = False
+
+        self.thread = threading.Thread(target=self._flusher, daemon=True)
+        self.thread.start()
+        self.snapshot_thread = threading.Thread(target=self._snapshotter, daemon=True)
+        self.snapshot_thread.start()
+
+    def _path(self, segment):
+        return os.path.join(self.directory, SEGMENT_FORMAT.format(segment))
+
+    def _append(self, payload):
+        with self.lock:
+            self.buffer += RECORD_HEADER.pack(len(payload), zlib.crc32(payload))
+            self.buffer += payload
+            self.appended_seq += 1
+            self.since_snapshot += 1
+            self.pending.notify()
+            return self.appended_seq
+
+    def log_created(self, t_id, challenge):
+        return self._append(CREATED.pack(RECORD_CREATED_BITS, t_id, challenge))
+
+    def log_solved(self, t_id, client_id, data):
+        return self._append(SOLVED.pack(EVENT_SOLVED, t_id, client_id) + data)
+
+    def flush(self):
+        """Grava (e faz fsync de) tudo que está no buffer."""
+        with self.io_lock:
+            with self.lock:
+                data, self.buffer = self.buffer, bytearray()
+                seq = self.appended_seq
+            self._write(self.file, data, seq)
+
+    def _write(self, file, data, seq):
+        # Chamar com io_lock: os lotes chegam ao disco na ordem das sequências
+        if data:
+            file.write(data)
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        with self.lock:
+            self.durable_seq = seq
+            self.flushed.notify_all()
+
+    def wait(self, seq):
+        with self.lock:
+            while self.durable_seq < seq:
+                self.flushed.wait()
+
+    def rotate(self, db_lock, capture):
+        """
+        Fecha o segmento atual e abre o próximo. A troca acontece com a
+        trava de escrita do banco (db_lock), para nenhum registro cair no
+        segmento errado, e capture() roda no mesmo instante (a cópia das
+        colunas do snapshot). O fim do segmento antigo é gravado e
+        sincronizado depois de soltar db_lock: as escritas do banco seguem
+        no segmento novo enquanto isso.
+        Retorna (número do segmento novo, resultado de capture()).
+        """
+        segment = self.segment + 1
+        new_file = open(self._path(segment), 'ab')
+        _fsync_dir(self.directory) # O arquivo novo existe antes de qualquer registro nele
+        # io_lock antes de db_lock: o flusher não grava nada do segmento novo
+        # antes do fim do antigo estar no disco
+        with self.io_lock:
+            with db_lock:
+                with self.lock:
+                    data, self.buffer = self.buffer, bytearray()
+                    seq = self.appended_seq
+                    old_file, self.file = self.file, new_file
+                    self.segment = segment
+                    self.since_snapshot = 0
+                captured = capture()
+            self._write(old_file, data, seq)
+            old_file.close()
+        return segment, captured
+
+    def _flusher(self):
+        while True:
+            with self.lock:
+                while not self.buffer and not self.closed:
+                    self.pending.wait()
+                if self.closed:
+                    return # close() faz o último flush
+            if self.sync_interval:
+                time.sleep(self.sync_interval)
+            self.flush()
+            # Só avisa: o snapshot (cópia das colunas + escrita + fsync) não
+            # pode segurar os próximos lotes
+            if self.checkpoint is not None and self.since_snapshot >= self.snapshot_every:
+                self.snapshot_due.set()
+
+    def _snapshotter(self):
+        while True:
+            self.snapshot_due.wait()
+            self.snapshot_due.clear()
+            if self.closed:
+                return
+            # O aviso pode ter se repetido antes do rotate() do último snapshot zerar a contagem
+            if self.since_snapshot >= self.snapshot_every:
+                self.checkpoint()
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.pending.notify()
+        self.snapshot_due.set()
+        self.snapshot_thread.join() # Um snapshot em andamento termina antes de fechar o arquivo
+        self.thread.join()
+        self.flush()
+        self.file.close()
+
+
+# --- Snapshot ---
+def write_snapshot(directory, segment, db_columns):
+    """Grava o snapshot num arquivo temporário e troca o antigo atomicamente."""
+    challenges, winners, offsets, lengths, data = db_columns
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, segment, len(challenges), len(data)))
+        for column in (challenges, winners, offsets, lengths):
+            column.tofile(f)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(directory)
+
+
+def load_snapshot(directory, db):
+    """
+    Carrega o snapshot (se existir) nas colunas vazias de db, lendo direto
+    do arquivo mapeado em memória. Retorna o primeiro segmento de log que
+    ainda precisa ser reaplicado.
+    """
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, segment, count, data_len = SNAPSHOT_HEADER.unpack_from(mm)
+        if magic != SNAPSHOT_MAGIC or version not in (1, SNAPSHOT_VERSION):
+            raise ValueError(f"Snapshot inválido: {path}")
+        with memoryview(mm) as view:
+            pos = SNAPSHOT_HEADER.size
+            for column in (db.challenges, db.winners, db.solution_offsets, db.solution_lengths):
+                size = count * column.itemsize
+                column.frombytes(view[pos:pos + size])
+                pos += size
+            db.solution_data += view[pos:pos + data_len]
+    if version == 1: # Zeros hexadecimais -> bits
+        db.challenges = array('B', bytes(4 * level for level in db.challenges))
+    return segment
+
+
+def checkpoint(db):
+    """
+    Snapshot compactado: copia as colunas sob a trava do banco (e troca de
+    segmento no mesmo instante), grava fora dela e apaga os segmentos já
+    cobertos. Sob a trava só ficam a cópia e a troca de arquivo; os fsyncs
+    acontecem depois.
+    """
+    segment, columns = db.log.rotate(db.lock, lambda: (
+        db.challenges[:], db.winners[:], db.solution_offsets[:],
+        db.solution_lengths[:], bytes(db.solution_data)))
+    write_snapshot(db.log.directory, segment, columns)
+    _remove_segments_before(db.log.directory, segment)
+
+
+# --- Recuperação ---
+def _segments(directory):
+    found = []
+    for name in os.listdir(directory):
+        match = SEGMENT_RE.match(name)
+        if match:
+            found.append(int(match.group(1)))
+    return sorted(found)
+
+
+def _remove_segments_before(directory, segment):
+    for number in _segments(directory):
+        if number < segment:
+            os.remove(os.path.join(directory, SEGMENT_FORMAT.format(number)))
+
+
+def _apply(db, payload):
+    kind = payload[0]
+    if kind in (RECORD_CREATED_BITS, EVENT_NEW_CHALLENGE):
+        _, t_id, challenge = CREATED.unpack(payload)
+        if kind == EVENT_NEW_CHALLENGE: # Log antigo: zeros hexadecimais
+            challenge *= 4
+        if t_id > db.next_transaction_id:
+            raise ValueError(f"Log inconsistente: desafio {t_id} sem os anteriores")
+        if t_id == db.next_transaction_id: # Menor = já estava no snapshot
+            db._append(challenge)
+    elif kind == EVENT_SOLVED:
+        _, t_id, winner = SOLVED.unpack_from(payload)
+        if db.winners[t_id] == -1:
+            db._record_solution(t_id, payload[SOLVED.size:].decode('utf-8'), winner)
+    else:
+        raise ValueError(f"Tipo de registro desconhecido: {kind}")
+
+
+def replay_segment(path, db):
+    """Reaplica os registros do segmento. Retorna (bytes válidos, tamanho do arquivo)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    pos = 0
+    while pos + RECORD_HEADER.size <= len(data):
+        length, crc = RECORD_HEADER.unpack_from(data, pos)
+        start = pos + RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        _apply(db, payload)
+        pos = start + length
+    return pos, len(data)
+
+
+def open_database(directory, fsync=True, sync_interval=0.0, snapshot_every=SNAPSHOT_EVERY,
+                  database_class=TransactionDatabase):
+    """
+    Abre (ou cria) o banco persistido em 'directory': carrega o snapshot,
+    reaplica o final do log e liga o log às novas escritas.
+    As transações que ficaram pendentes voltam a ser os desafios abertos
+    (uma por shard); shards sem nenhuma ficam em -1 e quem chamou cria os
+    próximos desafios (fill_shards).
+    database_class escolhe a implementação (ex.: AsyncTransactionDatabase,
+    ou um functools.partial com o número de shards).
+    """
+    os.makedirs(directory, exist_ok=True)
+    db = database_class()
+    first = load_snapshot(directory, db)
+    # Sobras de um snapshot interrompido antes da limpeza
+    _remove_segments_before(directory, first)
+
+    segments = _segments(directory)
+    for i, number in enumerate(segments):
+        path = os.path.join(directory, SEGMENT_FORMAT.format(number))
+        valid, size = replay_segment(path, db)
+        if valid < size:
+            if i != len(segments) - 1:
+                raise ValueError(f"Segmento corrompido no meio do log: {path}")
+            # Escrita interrompida no fim do log: descarta o registro parcial
+            with open(path, 'r+b') as f:
+                f.truncate(valid)
+
+    db.reopen_pending()
+
+    db.log = TransactionLog(directory, segments[-1] if segments else first,
+                            fsync=fsync, sync_interval=sync_interval, snapshot_every=snapshot_every)
+    db.log.checkpoint = lambda: checkpoint(db)
+    return db
@@ -0,0 +1,111 @@
+# miner_wal_bench.py
+#
+# Benchmark da persistência do TransactionDatabase (sem gRPC).
+# Threads submissoras enviam só soluções válidas, sem parar, e o benchmark
+# mede quantas transações são resolvidas por segundo e a latência do
+# submit vencedor (que inclui esperar o fsync) em três modos:
+#   memory -> sem log (o servidor sem --data-dir)
+#   nosync -> log gravado, mas sem fsync (sobrevive à queda do processo,
+#             não à do sistema)
+#   fsync  -> log com fsync em lote (o servidor com --data-dir)
+# Depois de cada modo com log, mede o tempo de reabrir o banco
+# (snapshot + final do log).
+#
+# Exemplo:
+#   py miner_wal_bench.py --submitters 8 --duration 5
+
+import argparse
+import json
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from miner_db import TransactionDatabase
+from miner_db_bench import percentile, premine_solutions
+from miner_wal import open_database, SNAPSHOT_EVERY
+
+MODES = ('memory', 'nosync', 'fsync')
+
+
+def run_mode(mode, submitters, duration, valid_solutions, sync_interval, snapshot_every):
+    directory = None
+    if mode == 'memory':
+        db = TransactionDatabase()
+    else:
+        directory = tempfile.mkdtemp(prefix='miner-wal-')
+        db = open_database(directory, fsync=(mode == 'fsync'), sync_interval=sync_interval,
+                           snapshot_every=snapshot_every)
+    with db.lock:
+        db._open_challenge()
+
+    stop = threading.Event()
+    latencies = [[] for _ in range(submitters)]
+
+    def submitter(i):
+        lat = latencies[i]
+        perf = time.perf_counter_ns
+        while not stop.is_set():
+            current = db.current
+            t0 = perf()
+            status, _ = db.submit(current.transaction_id, i + 1, valid_solutions[current.challenge])
+            if status == 1:
+                lat.append(perf() - t0)
+
+    threads = [threading.Thread(target=submitter, args=(i,)) for i in range(submitters)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    db.close()
+
+    all_lat = [x for lat in latencies for x in lat]
+    row = {
+        'mode': mode,
+        'submitters': submitters,
+        'duration_s': duration,
+        'solved': len(all_lat),
+        'solves_per_sec': len(all_lat) / duration,
+        'solve_p50_us': statistics.median(all_lat) / 1000,
+        'solve_p99_us': percentile(all_lat, 99) / 1000,
+    }
+
+    if directory is not None:
+        start = time.perf_counter()
+        reopened = open_database(directory, fsync=False)
+        row['recovery_s'] = time.perf_counter() - start
+        row['recovered'] = reopened.next_transaction_id
+        reopened.close()
+        shutil.rmtree(directory)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de persistência do TransactionDatabase")
+    parser.add_argument('--submitters', type=int, default=8, help="Threads submissoras (padrão: 8)")
+    parser.add_argument('--duration', type=float, default=5.0, help="Segundos por modo (padrão: 5)")
+    parser.add_argument('--modes', default=','.join(MODES), help="Modos, separados por vírgula")
+    parser.add_argument('--sync-interval', type=float, default=0.0,
+                        help="Milissegundos extras para juntar registros antes de cada fsync (padrão: 0)")
+    parser.add_argument('--snapshot-every', type=int, default=SNAPSHOT_EVERY,
+                        help=f"Registros entre snapshots (padrão: {SNAPSHOT_EVERY})")
+    args = parser.parse_args()
+
+    valid_solutions = premine_solutions()
+    results = []
+    for mode in args.modes.split(','):
+        row = run_mode(mode, args.submitters, args.duration, valid_solutions,
+                       args.sync_interval / 1000, args.snapshot_every)
+        results.append(row)
+        recovery = ""
+        if 'recovery_s' in row:
+            recovery = f" | reabertura {row['recovery_s']:.2f}s ({row['recovered']:,} transações)"
+        print(f"[Bench] {mode:>6} | {row['solves_per_sec']:>9,.0f} soluções/s | "
+              f"p50 {row['solve_p50_us']:.0f}us | p99 {row['solve_p99_us']:.0f}us{recovery}")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,422 @@
+# rpc_loadgen.py
+#
+# Gerador de carga para a calculadora e o minerador (servidores já rodando
+# em localhost). Chamadas assíncronas (grpc.aio) espalhadas por --channels
+# canais, opcionalmente em vários processos (--processes), com uma mistura
+# de requisições configurável, ex.: --mix status=90,submit=10.
+#
+# Dois modos:
+#   laço aberto (--rps N): as chamadas seguem um horário fixo, uma a cada
+#     1/N segundos, não importa se as anteriores já voltaram (como clientes
+#     independentes chegando). --max-in-flight limita as chamadas em
+#     andamento; se o limite segura o horário, o atraso entra na latência.
+#   laço fechado (sem --rps): --concurrency chamadas em andamento, cada uma
+#     disparada assim que a anterior volta.
+#
+# Omissão coordenada: no laço fechado um servidor lento também atrasa o
+# envio das próximas chamadas, então as chamadas que "deveriam" ter esperado
+# nunca são medidas, e os percentis altos saem otimistas. No laço aberto a
+# latência é contada a partir do horário previsto da chamada (e não do envio
+# de fato), o que corrige isso: a coluna "latência" inclui a espera na fila
+# do próprio cliente e "serviço" só o tempo desde o envio. No laço fechado
+# as duas colunas são iguais (sem correção possível); use --rps para medir
+# percentis altos.
+#
+# Exemplos:
+#   py rpc_loadgen.py miner --mix status=90,submit=10 --rps 3000 --duration 10
+#   py rpc_loadgen.py calc --mix add=40,div=40,evaluate=20 --concurrency 64 --channels 8
+#   py rpc_loadgen.py miner --rps 8000 --processes 4 --channels 16
+
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from array import array
+import grpc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, 'CalculadoraRPC'))
+sys.path.append(os.path.join(HERE, 'MineradorRPC'))
+import grpcCalc_pb2
+import grpcCalc_pb2_grpc
+import miner_pb2
+import miner_pb2_grpc
+from grpcCalc_bigint import to_message
+
+TARGETS = {'calc': 'localhost:50051', 'miner': 'localhost:50052'}
+DEFAULT_MIX = {'calc': 'add=25,sub=25,mul=25,div=25', 'miner': 'status=90,submit=10'}
+PERCENTILES = (50, 95, 99, 99.9)
+# Sem isso canais iguais compartilham a mesma conexão TCP
+CHANNEL_OPTIONS = [('grpc.use_local_subchannel_pool', 1)]
+BATCH_SIZE = 100
+
+
+# --- Requisições de cada serviço ---
+# Cada operação é um método sem argumentos que devolve algo para await.
+
+class CalcLoad:
+    OPS = ('add', 'sub', 'mul', 'div', 'divfloat', 'mulbig', 'evaluate', 'batch')
+
+    def __init__(self, channel, rng, clients):
+        self.channel = channel
+        self.stub = grpcCalc_pb2_grpc.CalculatorStub(channel)
+        self.rng = rng
+        x = rng.getrandbits(1024)
+        self.big = grpcCalc_pb2.BigOperands(x=to_message(x), y=to_message(x // 3 + 1))
+
+    async def setup(self):
+        await self.channel.channel_ready()
+
+    def operands(self):
+        # Divisor nunca é zero: erros só aparecem se o servidor falhar
+        return grpcCalc_pb2.Operands(x=self.rng.randint(-10000, 10000), y=self.rng.randint(1, 10000))
+
+    def add(self):
+        return self.stub.Add(self.operands())
+
+    def sub(self):
+        return self.stub.Sub(self.operands())
+
+    def mul(self):
+        return self.stub.Mul(self.operands())
+
+    def div(self):
+        return self.stub.Div(self.operands())
+
+    def divfloat(self):
+        x, y = self.rng.getrandbits(60), self.rng.getrandbits(30) + 1
+        return self.stub.DivFloat(grpcCalc_pb2.BigOperands(x=to_message(x), y=to_message(y)))
+
+    def mulbig(self):
+        return self.stub.MulBig(self.big)
+
+    def evaluate(self):
+        r = self.rng
+        return self.stub.Evaluate(grpcCalc_pb2.EvaluateRequest(
+            expression='(a + b) * c / d',
+            variables={'a': r.random(), 'b': r.random(), 'c': r.random(), 'd': r.random() + 1}))
+
+    def batch(self):
+        r = self.rng
+        return self.stub.BatchCompute(grpcCalc_pb2.BatchRequest(operations=[
+            grpcCalc_pb2.Operation(op=r.randint(1, 4), x=r.randint(-10000, 10000), y=r.randint(1, 10000))
+            for _ in range(BATCH_SIZE)
+        ]))
+
+
+class MinerLoad:
+    OPS = ('status', 'submit', 'work', 'challenge', 'winner', 'batch')
+
+    def __init__(self, channel, rng, clients):
+        self.channel = channel
+        self.stub = miner_pb2_grpc.MinerStub(channel)
+        self.rng = rng
+        self.clients = clients
+        self.t_id = 0
+
+    async def setup(self):
+        self.t_id = (await self.stub.GetTransactionID(miner_pb2.Empty())).transactionID
+
+    def _any_tid(self):
+        return miner_pb2.TransactionRequest(transactionID=self.rng.randint(0, self.t_id))
+
+    def status(self):
+        return self.stub.GetTransactionStatus(self._any_tid())
+
+    async def submit(self):
+        # Solução errada (1 em 16^desafio acerta por acaso) na transação atual
+        response = await self.stub.SubmitChallenge(miner_pb2.SubmitRequest(
+            transactionID=self.t_id, clientID=self.rng.randint(1, self.clients),
+            solution=f"carga-{self.rng.getrandbits(64):016x}"))
+        if response.status != 0:
+            # Acertou, ou outro resolveu: o desafio atual mudou
+            await self.setup()
+        return response
+
+    def work(self):
+        return self.stub.GetWork(miner_pb2.WorkRequest(clientID=self.rng.randint(1, self.clients)))
+
+    def challenge(self):
+        return self.stub.GetChallenge(self._any_tid())
+
+    def winner(self):
+        return self.stub.GetWinner(self._any_tid())
+
+    def batch(self):
+        start = self.rng.randint(0, self.t_id)
+        return self.stub.GetTransactionStatusBatch(
+            miner_pb2.TransactionBatchRequest(start=start, end=start + BATCH_SIZE))
+
+
+LOADS = {'calc': CalcLoad, 'miner': MinerLoad}
+
+
+def parse_mix(service, text):
+    """'status=90,submit=10' -> [('status', 90.0), ('submit', 10.0)]"""
+    mix = []
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in LOADS[service].OPS:
+            raise ValueError(f"Operação desconhecida para {service}: {name} (opções: {', '.join(LOADS[service].OPS)})")
+        mix.append((name, float(weight or 1)))
+    if not mix or sum(w for _, w in mix) <= 0:
+        raise ValueError("Mistura vazia")
+    return mix
+
+
+# --- Medição ---
+class Recorder:
+    """Latências (segundos) e erros por operação."""
+
+    def __init__(self, names):
+        self.latency = {name: array('d') for name in names} # Desde o horário previsto
+        self.service = {name: array('d') for name in names} # Desde o envio
+        self.errors = {name: {} for name in names}
+
+    def record(self, name, latency, service, code):
+        self.latency[name].append(latency)
+        self.service[name].append(service)
+        if code is not None:
+            errors = self.errors[name]
+            errors[code] = errors.get(code, 0) + 1
+
+    def export(self):
+        # Para devolver de outro processo
+        return {name: {'latency': self.latency[name].tobytes(), 'service': self.service[name].tobytes(),
+                       'errors': self.errors[name]} for name in self.latency}
+
+
+async def issue(call, name, intended, recorder):
+    perf = time.perf_counter
+    sent = perf()
+    code = None
+    try:
+        await call()
+    except grpc.aio.AioRpcError as e:
+        code = e.code().name
+    done = perf()
+    recorder.record(name, done - intended, done - sent, code)
+
+
+async def open_loop(pick, rps, duration, max_in_flight, recorder):
+    perf = time.perf_counter
+    interval = 1.0 / rps
+    total = int(rps * duration)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks = set()
+    max_lag = 0.0
+
+    def finished(task):
+        tasks.discard(task)
+        in_flight.release()
+
+    start = perf()
+    for i in range(total):
+        intended = start + i * interval
+        # sleep(0) quando atrasado: deixa as chamadas já criadas andarem
+        await asyncio.sleep(max(intended - perf(), 0))
+        await in_flight.acquire()
+        max_lag = max(max_lag, perf() - intended)
+        call, name = pick()
+        task = asyncio.create_task(issue(call, name, intended, recorder))
+        tasks.add(task)
+        task.add_done_callback(finished)
+    if tasks:
+        await asyncio.wait(tasks)
+    return perf() - start, max_lag
+
+
+async def closed_loop(pick, concurrency, duration, recorder):
+    perf = time.perf_counter
+    deadline = perf() + duration
+
+    async def worker():
+        while perf() < deadline:
+            call, name = pick()
+            await issue(call, name, perf(), recorder)
+
+    start = perf()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return perf() - start, 0.0
+
+
+async def run_process(config, index):
+    rng = random.Random(config['seed'] * 1000 + index)
+    channels = [grpc.aio.insecure_channel(config['target'], options=CHANNEL_OPTIONS)
+                for _ in range(config['channels'])]
+    loads = [LOADS[config['service']](channel, rng, config['clients']) for channel in channels]
+    await asyncio.gather(*(load.setup() for load in loads))
+
+    names = [name for name, _ in config['mix']]
+    cum_weights = []
+    total = 0.0
+    for _, weight in config['mix']:
+        total += weight
+        cum_weights.append(total)
+    # Operação já ligada ao canal, por canal
+    bound = [[getattr(load, name) for name in names] for load in loads]
+    counter = [0]
+
+    def pick():
+        # Canais em rodízio; operação sorteada pelos pesos da mistura
+        counter[0] += 1
+        i = bisect.bisect_right(cum_weights, rng.random() * total)
+        i = min(i, len(names) - 1)
+        return bound[counter[0] % len(bound)][i], names[i]
+
+    recorder = Recorder(names)
+    try:
+        if config['rps']:
+            elapsed, max_lag = await open_loop(pick, config['rps'], config['duration'],
+                                               config['max_in_flight'], recorder)
+        else:
+            elapsed, max_lag = await closed_loop(pick, config['concurrency'], config['duration'], recorder)
+    finally:
+        for channel in channels:
+            await channel.close()
+    return {'elapsed': elapsed, 'max_lag': max_lag, 'ops': recorder.export()}
+
+
+def process_entry(job):
+    config, index = job
+    return asyncio.run(run_process(config, index))
+
+
+def split(value, parts, index):
+    # Divide value entre parts processos (os primeiros ficam com o resto)
+    return value // parts + (1 if index < value % parts else 0)
+
+
+# --- Relatório ---
+def quantiles(values):
+    """Percentis (nearest-rank) de PERCENTILES e o máximo, em ms."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    n = len(ordered)
+    result = {}
+    for p in PERCENTILES:
+        rank = max(1, -(-n * p // 100))
+        result[f'p{p:g}_ms'] = ordered[int(rank) - 1] * 1000
+    result['max_ms'] = ordered[-1] * 1000
+    return result
+
+
+def summarize(results, names):
+    elapsed = max(r['elapsed'] for r in results)
+    report = {'elapsed_s': elapsed, 'max_send_lag_ms': max(r['max_lag'] for r in results) * 1000, 'ops': {}}
+    all_latency, all_service = array('d'), array('d')
+    all_errors = {}
+    for name in names:
+        latency, service = array('d'), array('d')
+        errors = {}
+        for r in results:
+            op = r['ops'][name]
+            latency.frombytes(op['latency'])
+            service.frombytes(op['service'])
+            for code, count in op['errors'].items():
+                errors[code] = errors.get(code, 0) + count
+                all_errors[code] = all_errors.get(code, 0) + count
+        all_latency.extend(latency)
+        all_service.extend(service)
+        report['ops'][name] = {
+            'calls': len(latency), 'errors': errors, 'rps': len(latency) / elapsed,
+            'latency': quantiles(latency), 'service_time': quantiles(service),
+        }
+    report.update(calls=len(all_latency), errors=all_errors, rps=len(all_latency) / elapsed,
+                  latency=quantiles(all_latency), service_time=quantiles(all_service))
+    return report
+
+
+def format_quantiles(q):
+    if not q:
+        return "-"
+    return " / ".join(f"{q[f'p{p:g}_ms']:.2f}" for p in PERCENTILES) + f" / máx {q['max_ms']:.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para a calculadora e o minerador")
+    parser.add_argument('service', choices=sorted(LOADS), help="Serviço alvo")
+    parser.add_argument('--target', default=None, help="Endereço do servidor (padrão: localhost:50051 / 50052)")
+    parser.add_argument('--mix', default=None,
+                        help="Pesos das operações, ex.: status=90,submit=10 (padrão: calc "
+                             f"{DEFAULT_MIX['calc']}; miner {DEFAULT_MIX['miner']})")
+    parser.add_argument('--rps', type=float, default=0,
+                        help="Chamadas/s do laço aberto (padrão: 0 = laço fechado com --concurrency)")
+    parser.add_argument('--concurrency', type=int, default=64, help="Chamadas em andamento no laço fechado (padrão: 64)")
+    parser.add_argument('--max-in-flight', type=int, default=10000,
+                        help="Limite de chamadas em andamento no laço aberto (padrão: 10000)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Segundos de carga (padrão: 10)")
+    parser.add_argument('--channels', type=int, default=8, help="Canais (conexões) no total (padrão: 8)")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="Processos geradores; a carga e os canais são divididos entre eles (padrão: 1)")
+    parser.add_argument('--clients', type=int, default=100,
+                        help="ClientIDs sorteados entre 1 e N nas chamadas do minerador (padrão: 100)")
+    parser.add_argument('--seed', type=int, default=1, help="Semente dos sorteios (padrão: 1)")
+    parser.add_argument('--output', default=None, help="Grava o relatório JSON neste arquivo")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.service, args.mix or DEFAULT_MIX[args.service])
+    except ValueError as e:
+        parser.error(str(e))
+    processes = max(1, args.processes)
+    if args.channels < processes:
+        parser.error("--channels precisa ser pelo menos --processes")
+    jobs = []
+    for i in range(processes):
+        jobs.append(({
+            'service': args.service, 'target': args.target or TARGETS[args.service], 'mix': mix,
+            'rps': args.rps / processes, 'concurrency': max(1, split(args.concurrency, processes, i)),
+            'max_in_flight': max(1, split(args.max_in_flight, processes, i)),
+            'duration': args.duration, 'channels': split(args.channels, processes, i),
+            'clients': max(1, args.clients), 'seed': args.seed,
+        }, i))
+
+    mode = f"laço aberto, {args.rps:,.0f} chamadas/s" if args.rps else f"laço fechado, {args.concurrency} em andamento"
+    print(f"[Carga] {args.service} | {mode} | {args.channels} canais | {processes} processo(s) | "
+          f"{args.duration:g}s | mistura {', '.join(f'{n}={w:g}' for n, w in mix)}", file=sys.stderr)
+    if processes == 1:
+        results = [process_entry(jobs[0])]
+    else:
+        # spawn: o gRPC não funciona em processos criados com fork depois de usado
+        with multiprocessing.get_context('spawn').Pool(processes) as pool:
+            results = pool.map(process_entry, jobs)
+
+    names = [name for name, _ in mix]
+    report = summarize(results, names)
+    report.update(service=args.service, target=args.target or TARGETS[args.service], mix=dict(mix),
+                  target_rps=args.rps or None, concurrency=None if args.rps else args.concurrency,
+                  channels=args.channels, processes=processes, duration_s=args.duration)
+
+    print(f"[Carga] percentis p50 / p95 / p99 / p99.9; latência desde o horário previsto"
+          f"{'' if args.rps else ' (laço fechado: sem correção)'}", file=sys.stderr)
+    for name in names:
+        op = report['ops'][name]
+        failed = sum(op['errors'].values())
+        print(f"[Carga] {name:>10} | {op['calls']:>8,} chamadas | {op['rps']:>8,.0f}/s | {failed} erros | "
+              f"latência {format_quantiles(op['latency'])}", file=sys.stderr)
+    print(f"[Carga] {'total':>10} | {report['calls']:>8,} chamadas | {report['rps']:>8,.0f}/s | "
+          f"{sum(report['errors'].values())} erros {report['errors'] or ''}", file=sys.stderr)
+    print(f"[Carga] {'':>10}   latência {format_quantiles(report['latency'])}", file=sys.stderr)
+    print(f"[Carga] {'':>10}   serviço  {format_quantiles(report['service_time'])}", file=sys.stderr)
+    if args.rps:
+        print(f"[Carga] {'':>10}   maior atraso de envio {report['max_send_lag_ms']:.1f} ms "
+              f"(alvo {args.rps:,.0f}/s, obtido {report['rps']:,.0f}/s)", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
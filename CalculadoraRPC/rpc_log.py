@@ -0,0 +1,211 @@
+# rpc_log.py
+#
+# Log estruturado dos servidores (calculadora e minerador), fora do caminho
+# das RPCs. Um handler só faz
+#   log.info("Recebida requisição Add: ({x}, {y})", x=request.x, y=request.y)
+# e isso apenas enfileira (instante, nível, modelo, campos) numa deque.
+# Os campos devem ser valores simples (números, textos; bytes já em hex) ou
+# lazy(func, ...), calculado só na hora de gravar.
+# Uma thread de fundo acorda a cada FLUSH_INTERVAL segundos, formata as
+# mensagens (str.format_map do modelo com os campos) e grava tudo de uma vez.
+# Antes cada requisição fazia um print: formatação e escrita no stdout na
+# thread da RPC, disputando a trava do stdout com todas as outras.
+#
+# Níveis: debug < info < warning < error; registros abaixo do nível
+# configurado custam só uma comparação.
+# Amostragem (--log-sample N): de cada modelo de mensagem em nível info ou
+# debug só 1 a cada N é gravado; warning e error sempre passam.
+# Formatos: text ("[Servidor] mensagem", igual aos prints antigos) ou json
+# (uma linha por registro com ts, level, msg e os campos).
+# Se a fila passar de MAX_PENDING registros (disco lento), os novos são
+# descartados e contados, em vez de bloquear as RPCs.
+#
+# Este módulo fica na pasta de cima das duas atividades; os servidores o
+# encontram acrescentando essa pasta ao sys.path.
+
+import collections
+import json
+import sys
+import threading
+import time
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+FLUSH_INTERVAL = 0.05
+MAX_PENDING = 100_000
+
+
+class lazy:
+    """
+    Campo calculado só na thread de escrita, e só se o registro for gravado.
+    Ex.: log.info("... {x}", x=lazy(show, request.x))
+    """
+
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+    def __format__(self, spec):
+        return format(self.func(*self.args), spec)
+
+
+def _json_value(value):
+    if isinstance(value, (int, float, str, bool)) or value is None:
+        return value
+    return str(value) # ex.: lazy
+
+
+class EventLog:
+    """
+    Log com fila e thread de escrita. level/sample/fmt/sync podem ser
+    trocados a qualquer momento por configure().
+    sync=True grava na própria thread que chamou (o comportamento do
+    print antigo; útil para comparar no benchmark).
+    """
+
+    def __init__(self, prefix='[Servidor]', stream=None, level=INFO, sample=1, fmt='text', sync=False):
+        self.prefix = prefix
+        self.stream = stream # None = o sys.stdout do momento da escrita
+        self.level = level
+        self.sample = sample
+        self.fmt = fmt
+        self.sync = sync
+        self.pending = collections.deque()
+        self.counters = {} # modelo -> registros vistos (para a amostragem)
+        self.dropped = 0
+        self.write_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.closed = False
+        self.thread = threading.Thread(target=self._writer, name='rpc_log', daemon=True)
+        self.thread.start()
+
+    def configure(self, level=None, sample=None, fmt=None, sync=None, stream=None):
+        if level is not None:
+            self.level = LEVELS[level] if isinstance(level, str) else level
+        if sample is not None:
+            self.sample = max(1, sample)
+        if fmt is not None:
+            self.fmt = fmt
+        if sync is not None:
+            self.sync = sync
+        if stream is not None:
+            self.stream = stream
+
+    # --- Caminho das RPCs: só comparações e um append ---
+    def debug(self, template, **fields):
+        if self.level <= DEBUG:
+            self._emit(DEBUG, template, fields)
+
+    def info(self, template, **fields):
+        if self.level <= INFO:
+            self._emit(INFO, template, fields)
+
+    def warning(self, template, **fields):
+        if self.level <= WARNING:
+            self._emit(WARNING, template, fields)
+
+    def error(self, template, **fields):
+        if self.level <= ERROR:
+            self._emit(ERROR, template, fields)
+
+    def _emit(self, level, template, fields):
+        if self.sample > 1 and level <= INFO:
+            # Contagem sem trava: sob concorrência a taxa é aproximada
+            seen = self.counters.get(template, 0)
+            self.counters[template] = seen + 1
+            if seen % self.sample:
+                return
+        record = (time.time(), level, template, fields)
+        if self.sync:
+            self._write([record])
+            return
+        if len(self.pending) >= MAX_PENDING:
+            self.dropped += 1
+            return
+        self.pending.append(record) # deque.append é atômico
+
+    # --- Thread de escrita ---
+    def _format(self, record):
+        ts, level, template, fields = record
+        try:
+            message = template.format_map(fields)
+            if self.fmt == 'json':
+                entry = {'ts': round(ts, 6), 'level': LEVEL_NAMES[level], 'msg': message}
+                for key, value in fields.items():
+                    entry[key] = _json_value(value)
+                return json.dumps(entry, ensure_ascii=False)
+        except Exception as e: # Um modelo errado não pode derrubar a thread de escrita
+            message = f"{template} {fields!r} (erro ao formatar: {e!r})"
+            if self.fmt == 'json':
+                return json.dumps({'ts': round(ts, 6), 'level': LEVEL_NAMES[level], 'msg': message},
+                                  ensure_ascii=False)
+        if level >= WARNING:
+            return f"{self.prefix} {LEVEL_NAMES[level].upper()}: {message}"
+        return f"{self.prefix} {message}"
+
+    def _write(self, records):
+        lines = [self._format(record) for record in records]
+        stream = self.stream or sys.stdout
+        with self.write_lock:
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+
+    def _drain(self):
+        records = []
+        pending = self.pending
+        while True:
+            try:
+                records.append(pending.popleft())
+            except IndexError:
+                break
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            records.append((time.time(), WARNING, "{dropped} registros de log descartados (fila cheia)",
+                            {'dropped': dropped}))
+        if records:
+            self._write(records)
+
+    def _writer(self):
+        while not self.closed:
+            self.wakeup.wait(FLUSH_INTERVAL)
+            try:
+                self._drain()
+            except (OSError, ValueError):
+                pass # stdout fechado; não há onde avisar
+
+    def flush(self):
+        """Grava agora tudo que está na fila (ex.: antes de imprimir um resumo)."""
+        self._drain()
+
+    def close(self):
+        self.closed = True
+        self.wakeup.set()
+        self.thread.join()
+        self._drain()
+
+
+# Log único do processo, usado pelos servidores
+log = EventLog()
+
+
+def add_arguments(parser):
+    """Opções de log comuns aos servidores."""
+    parser.add_argument('--log-level', choices=list(LEVELS), default='info',
+                        help="Nível mínimo do log (padrão: info; warning esconde as linhas por requisição)")
+    parser.add_argument('--log-sample', type=int, default=1,
+                        help="Grava 1 de cada N mensagens info/debug iguais (padrão: 1, todas)")
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text',
+                        help="text: linhas como antes; json: uma linha JSON por registro")
+    parser.add_argument('--log-sync', action='store_true',
+                        help="Grava na thread da RPC, sem a fila (como os prints antigos)")
+
+
+def configure_from_args(args):
+    log.configure(level=args.log_level, sample=args.log_sample, fmt=args.log_format, sync=args.log_sync)
@@ -0,0 +1,190 @@
+# rpc_log_bench.py
+#
+# Vazão dos servidores (calculadora e minerador) com cada configuração de log
+# e, opcionalmente, com as métricas ligadas.
+# Para cada servidor e cada configuração o script sobe o servidor com a
+# saída indo para um arquivo temporário e mantém --concurrency chamadas em
+# andamento (grpc.aio, espalhadas por --channels canais) durante --duration
+# segundos:
+#   calc  -> Add com operandos variados (uma linha de log por chamada)
+#   miner -> SubmitChallenge com soluções erradas (duas linhas por chamada:
+#            "Recebida tentativa..." e "FALHA...")
+# Configurações de log:
+#   sync    -> --log-sync: formata e grava na thread da RPC, com flush a cada
+#              linha (o print antigo num terminal)
+#   async   -> padrão: a RPC só enfileira; a thread de escrita grava em lote
+#   sampled -> --log-sample 100: grava 1 de cada 100 linhas iguais
+#   off     -> --log-level warning: as linhas por requisição nem são enfileiradas
+# Com --metrics off,on cada configuração roda também com o interceptor de
+# métricas ligado (--metrics-port), para medir o custo dele; no fim de cada
+# medição com métricas o script lê /metrics e confere a contagem de chamadas.
+#
+# Exemplo:
+#   py rpc_log_bench.py --servers calc,miner --logs sync,async,sampled,off --duration 5
+#   py rpc_log_bench.py --logs off --metrics off,on --repeats 3
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import re
+import tempfile
+import time
+import urllib.request
+import grpc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, 'CalculadoraRPC'))
+sys.path.append(os.path.join(HERE, 'MineradorRPC'))
+import grpcCalc_pb2
+import grpcCalc_pb2_grpc
+import miner_pb2
+import miner_pb2_grpc
+
+SERVERS = {
+    # nome -> (pasta, script, endereço)
+    'calc': ('CalculadoraRPC', 'grpcCalc_server.py', 'localhost:50051'),
+    'miner': ('MineradorRPC', 'miner_server.py', 'localhost:50052'),
+}
+LOGS = {
+    'sync': ['--log-sync'],
+    'async': [],
+    'sampled': ['--log-sample', '100'],
+    'off': ['--log-level', 'warning'],
+}
+# Sem isso canais iguais compartilham a mesma conexão TCP
+CHANNEL_OPTIONS = [('grpc.use_local_subchannel_pool', 1)]
+METRICS_PORT = 9109
+# RPC medida em cada servidor (rótulo method em /metrics)
+MEASURED_METHOD = {'calc': 'Add', 'miner': 'SubmitChallenge'}
+
+
+def percentile(values, p):
+    """Percentil pelo método nearest-rank (p entre 0 e 100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def start_server(name, mode, log_args, output):
+    folder, script, target = SERVERS[name]
+    server = subprocess.Popen(
+        [sys.executable, script, '--mode', mode] + log_args,
+        cwd=os.path.join(HERE, folder), stdout=output, stderr=subprocess.DEVNULL
+    )
+    channel = grpc.insecure_channel(target)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    channel.close()
+    return server
+
+
+def handled_count(name):
+    """Total de chamadas terminadas da RPC medida, segundo o /metrics do servidor."""
+    text = urllib.request.urlopen(f'http://127.0.0.1:{METRICS_PORT}/metrics', timeout=10).read().decode()
+    pattern = rf'^grpc_server_handled_total{{method="{MEASURED_METHOD[name]}",code="[A-Z_]+"}} (\d+)$'
+    return sum(int(count) for count in re.findall(pattern, text, re.MULTILINE))
+
+
+def call_factory(name, channel):
+    """Retorna uma função i -> corrotina de uma chamada ao servidor."""
+    if name == 'calc':
+        stub = grpcCalc_pb2_grpc.CalculatorStub(channel)
+        return lambda i: stub.Add(grpcCalc_pb2.Operands(x=i % 1000, y=i % 7))
+    stub = miner_pb2_grpc.MinerStub(channel)
+    # Só a transação atual aceita tentativas; uma solução aceita por acaso
+    # (1 em 2^(4*desafio)) só troca o desafio, e a próxima pega o novo ID
+    state = {'t_id': None}
+
+    async def submit(i):
+        if state['t_id'] is None:
+            state['t_id'] = (await stub.GetTransactionID(miner_pb2.Empty())).transactionID
+        response = await stub.SubmitChallenge(miner_pb2.SubmitRequest(
+            transactionID=state['t_id'], clientID=i % 100, solution=f"errada-{i}"))
+        if response.status != 0:
+            state['t_id'] = None
+    return submit
+
+
+async def run_load(name, duration, concurrency, channels):
+    target = SERVERS[name][2]
+    opened = [grpc.aio.insecure_channel(target, options=CHANNEL_OPTIONS) for _ in range(channels)]
+    calls = [call_factory(name, channel) for channel in opened]
+    latencies = []
+    errors = {}
+    perf = time.perf_counter
+    deadline = perf() + duration
+
+    async def worker(w):
+        call = calls[w % channels]
+        i = w
+        while perf() < deadline:
+            t0 = perf()
+            try:
+                await call(i)
+                latencies.append(perf() - t0)
+            except grpc.aio.AioRpcError as e:
+                errors[e.code().name] = errors.get(e.code().name, 0) + 1
+            i += concurrency
+
+    start = perf()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    elapsed = perf() - start
+    for channel in opened:
+        await channel.close()
+    return {
+        'calls_ok': len(latencies),
+        'calls_failed': sum(errors.values()),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+        'p99_ms': percentile(latencies, 99) * 1000 if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão dos servidores com cada configuração de log")
+    parser.add_argument('--servers', default='calc,miner', help="Servidores, separados por vírgula (calc, miner)")
+    parser.add_argument('--logs', default='sync,async,sampled,off',
+                        help="Configurações de log, separadas por vírgula (sync, async, sampled, off)")
+    parser.add_argument('--metrics', default='off',
+                        help="off, on ou off,on: interceptor de métricas desligado/ligado (padrão: off)")
+    parser.add_argument('--mode', choices=['threads', 'aio'], default='threads', help="Modo dos servidores")
+    parser.add_argument('--duration', type=float, default=5.0, help="Segundos por medição (padrão: 5)")
+    parser.add_argument('--concurrency', type=int, default=64, help="Chamadas em andamento (padrão: 64)")
+    parser.add_argument('--channels', type=int, default=4, help="Canais (conexões) do cliente (padrão: 4)")
+    parser.add_argument('--repeats', type=int, default=1, help="Medições por configuração; vale a melhor (padrão: 1)")
+    args = parser.parse_args()
+
+    results = []
+    configs = [(name, log_name, metrics) for name in args.servers.split(',')
+               for log_name in args.logs.split(',') for metrics in args.metrics.split(',')]
+    for name, log_name, metrics in configs:
+        server_args = LOGS[log_name] + (['--metrics-port', str(METRICS_PORT)] if metrics == 'on' else [])
+        best = None
+        for _ in range(args.repeats):
+            with tempfile.TemporaryFile() as output:
+                server = start_server(name, args.mode, server_args, output)
+                try:
+                    row = asyncio.run(run_load(name, args.duration, args.concurrency, args.channels))
+                    # Todas as chamadas respondidas têm que aparecer no /metrics
+                    row['metrics_handled'] = handled_count(name) if metrics == 'on' else None
+                finally:
+                    server.terminate()
+                    server.wait()
+                row['log_bytes'] = output.seek(0, os.SEEK_END)
+            if best is None or row['rps'] > best['rps']:
+                best = row
+        best.update(server=name, log=log_name, metrics=metrics, mode=args.mode)
+        results.append(best)
+        counted = f" | /metrics {best['metrics_handled']:,}" if metrics == 'on' else ""
+        print(f"[Bench] {name:>5} | log {log_name:>7} | métricas {metrics:>3} | {best['rps']:>8,.0f} chamadas/s | "
+              f"p50 {best['p50_ms']:.2f}ms | p99 {best['p99_ms']:.2f}ms | "
+              f"{best['log_bytes'] / 1e6:.1f} MB de log | {best['calls_ok'] + best['calls_failed']:,} chamadas"
+              f"{counted} | {best['calls_failed']} falhas", file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
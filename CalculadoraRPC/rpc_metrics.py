@@ -0,0 +1,442 @@
+# rpc_metrics.py
+#
+# Métricas dos servidores (calculadora e minerador) no formato de texto do
+# Prometheus, servidas em http://127.0.0.1:<porta>/metrics (--metrics-port).
+#
+# As métricas por RPC vêm de um interceptor do servidor gRPC (síncrono ou
+# grpc.aio), sem mexer nos handlers:
+#   grpc_server_started_total{method}          chamadas iniciadas
+#   grpc_server_handled_total{method,code}     chamadas terminadas, por código de status
+#   grpc_server_handling_seconds{method}       histograma da duração
+#   grpc_server_in_flight{method}              chamadas em andamento
+#   grpc_server_thread_pool_queue_depth        chamadas esperando uma thread (servidor com pool)
+# Cada servidor acrescenta as suas (caches da calculadora, submissões do
+# minerador) no mesmo Registry.
+#
+# Custo no caminho das RPCs: duas leituras do relógio e duas aquisições de
+# uma trava do método (uma no início, outra no fim da chamada).
+# O interceptor monta o handler instrumentado uma vez por método e o
+# reaproveita; a formatação do texto só acontece quando alguém lê /metrics.
+#
+# Sem dependências: não usa o prometheus_client.
+
+import asyncio
+import bisect
+import http.server
+import threading
+import time
+import grpc
+
+# Limites (segundos) dos baldes do histograma de duração das RPCs
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Valor numérico do status (como no aio) -> nome
+_CODE_NAMES = {code.value[0]: code.name for code in grpc.StatusCode}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels_text(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help, labelnames=(), callback=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        # callback() -> {valores dos rótulos: valor}, lido a cada /metrics
+        self.callback = callback
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def labels(self, *values):
+        """O filho com esses valores de rótulo (guarde-o para o caminho quente)."""
+        child = self.children.get(values)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(values, self._new_child())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if self.callback is not None:
+            for values, value in sorted(self.callback().items()):
+                lines.append(f"{self.name}{_labels_text(self.labelnames, values)} {_number(value)}")
+        else:
+            for values, child in sorted(self.children.items()):
+                lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+
+class _Value:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self.lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+    def render(self, name, labelnames, values):
+        return [f"{name}{_labels_text(labelnames, values)} {_number(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+
+class _HistogramValue:
+    __slots__ = ('bounds', 'counts', 'sum', 'lock')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1) # O último é o +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def render(self, name, labelnames, values):
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float('inf'),), counts):
+            cumulative += count
+            le = f'le="{_number(bound)}"'
+            lines.append(f"{name}_bucket{_labels_text(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels_text(labelnames, values)} {_number(total)}")
+        lines.append(f"{name}_count{_labels_text(labelnames, values)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(float(b) for b in buckets)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+
+class Registry:
+    """Conjunto de métricas de um servidor; render() gera o texto de /metrics."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=(), callback=None):
+        return self._add(Counter(name, help, labelnames, callback))
+
+    def gauge(self, name, help, labelnames=(), callback=None):
+        return self._add(Gauge(name, help, labelnames, callback))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e: # Um callback com erro não derruba a página inteira
+                lines.append(f"# {metric.name}: erro ao coletar: {e!r}")
+        return '\n'.join(lines) + '\n'
+
+
+# --- Métricas por RPC (interceptores) ---
+class _MethodStats:
+    """
+    Filhos das métricas de um método, resolvidos uma vez. Todos usam a
+    mesma trava: início e fim de uma chamada são uma aquisição cada, em vez
+    de uma por métrica.
+    """
+
+    def __init__(self, metrics, method):
+        self.method = method
+        self.lock = threading.Lock()
+        self.started = self._share(metrics.started.labels(method))
+        self.in_flight = self._share(metrics.in_flight.labels(method))
+        self.latency = self._share(metrics.latency.labels(method))
+        self.bounds = self.latency.bounds
+        self.handled_metric = metrics.handled
+        self.handled = {} # nome do código -> filho
+
+    def _share(self, child):
+        child.lock = self.lock
+        return child
+
+    def start(self):
+        with self.lock:
+            self.started.value += 1
+            self.in_flight.value += 1
+
+    def finish(self, start, code):
+        elapsed = time.perf_counter() - start
+        i = bisect.bisect_left(self.bounds, elapsed)
+        handled = self.handled.get(code)
+        if handled is None:
+            handled = self.handled[code] = self._share(self.handled_metric.labels(self.method, code))
+        latency = self.latency
+        with self.lock:
+            self.in_flight.value -= 1
+            latency.counts[i] += 1
+            latency.sum += elapsed
+            handled.value += 1
+
+
+def _code_name(context, failed):
+    code = context.code()
+    if code is None:
+        return 'UNKNOWN' if failed else 'OK'
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    return _CODE_NAMES.get(code, str(code))
+
+
+class ServerMetrics:
+    """
+    Registry com as métricas gRPC de um servidor. Use interceptor() (ou
+    aio_interceptor()) ao criar o servidor e watch_executor() para a fila
+    do pool de threads.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else Registry()
+        r = self.registry
+        self.started = r.counter('grpc_server_started_total', "RPCs iniciadas", ('method',))
+        self.handled = r.counter('grpc_server_handled_total', "RPCs terminadas, por código de status",
+                                 ('method', 'code'))
+        self.latency = r.histogram('grpc_server_handling_seconds', "Duração das RPCs (segundos)", ('method',))
+        self.in_flight = r.gauge('grpc_server_in_flight', "RPCs em andamento", ('method',))
+        self.stats = {}
+
+    def method_stats(self, full_method):
+        stats = self.stats.get(full_method)
+        if stats is None:
+            # '/pacote.Servico/Metodo' -> 'Metodo'
+            stats = self.stats[full_method] = _MethodStats(self, full_method.rsplit('/', 1)[-1])
+        return stats
+
+    def watch_executor(self, executor):
+        """Exporta a fila do ThreadPoolExecutor do servidor (chamadas esperando uma thread)."""
+        # _work_queue é interno ao concurrent.futures, mas é a única forma de ver a fila
+        self.registry.gauge('grpc_server_thread_pool_queue_depth', "RPCs esperando uma thread do pool",
+                            callback=lambda: {(): executor._work_queue.qsize()})
+        self.registry.gauge('grpc_server_thread_pool_workers', "Threads do pool",
+                            callback=lambda: {(): executor._max_workers})
+
+    def interceptor(self):
+        return MetricsInterceptor(self)
+
+    def aio_interceptor(self):
+        return AsyncMetricsInterceptor(self)
+
+
+def _handler_kind(handler):
+    if handler.request_streaming:
+        return 'stream_stream' if handler.response_streaming else 'stream_unary'
+    return 'unary_stream' if handler.response_streaming else 'unary_unary'
+
+
+_HANDLER_FACTORIES = {
+    'unary_unary': grpc.unary_unary_rpc_method_handler,
+    'unary_stream': grpc.unary_stream_rpc_method_handler,
+    'stream_unary': grpc.stream_unary_rpc_method_handler,
+    'stream_stream': grpc.stream_stream_rpc_method_handler,
+}
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """Interceptor do servidor síncrono (pool de threads)."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.wrapped = {} # método -> (handler original, handler instrumentado)
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method
+        cached = self.wrapped.get(method)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        kind = _handler_kind(handler)
+        behavior = self._wrap(kind, getattr(handler, kind), self.metrics.method_stats(method))
+        wrapped = _HANDLER_FACTORIES[kind](behavior, handler.request_deserializer, handler.response_serializer)
+        self.wrapped[method] = (handler, wrapped)
+        return wrapped
+
+    @staticmethod
+    def _wrap(kind, behavior, stats):
+        perf = time.perf_counter
+
+        if kind in ('unary_unary', 'stream_unary'):
+            def unary_response(request, context):
+                stats.start()
+                start = perf()
+                failed = True
+                try:
+                    response = behavior(request, context)
+                    failed = False
+                    return response
+                finally:
+                    stats.finish(start, _code_name(context, failed))
+            return unary_response
+
+        def streaming_response(request, context):
+            stats.start()
+            start = perf()
+            failed = True
+            code = None
+            try:
+                yield from behavior(request, context)
+                failed = False
+                if not context.is_active(): # O handler parou porque o cliente saiu
+                    code = 'CANCELLED'
+            except GeneratorExit: # Gerador fechado antes do fim: o cliente cancelou
+                code = 'CANCELLED'
+                raise
+            finally:
+                stats.finish(start, code or _code_name(context, failed))
+        return streaming_response
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Interceptor do servidor grpc.aio: os handlers são corrotinas / geradores assíncronos."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.wrapped = {}
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method
+        cached = self.wrapped.get(method)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        kind = _handler_kind(handler)
+        behavior = self._wrap(kind, getattr(handler, kind), self.metrics.method_stats(method))
+        wrapped = _HANDLER_FACTORIES[kind](behavior, handler.request_deserializer, handler.response_serializer)
+        self.wrapped[method] = (handler, wrapped)
+        return wrapped
+
+    @staticmethod
+    def _wrap(kind, behavior, stats):
+        perf = time.perf_counter
+
+        if kind in ('unary_unary', 'stream_unary'):
+            async def unary_response(request, context):
+                stats.start()
+                start = perf()
+                failed = True
+                code = None
+                try:
+                    response = await behavior(request, context)
+                    failed = False
+                    return response
+                except asyncio.CancelledError:
+                    code = 'CANCELLED'
+                    raise
+                finally:
+                    stats.finish(start, code or _code_name(context, failed))
+            return unary_response
+
+        async def streaming_response(request, context):
+            stats.start()
+            start = perf()
+            failed = True
+            code = None
+            try:
+                async for response in behavior(request, context):
+                    yield response
+                failed = False
+            except (asyncio.CancelledError, GeneratorExit):
+                code = 'CANCELLED'
+                raise
+            finally:
+                stats.finish(start, code or _code_name(context, failed))
+        return streaming_response
+
+
+# --- Endpoint HTTP ---
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    registry = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Sem uma linha no stderr a cada coleta
+
+
+def start_http_server(registry, port, host='127.0.0.1'):
+    """Serve /metrics numa thread de fundo; retorna o servidor HTTP (shutdown() para parar)."""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='rpc_metrics', daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    """Opção de métricas comum aos servidores."""
+    parser.add_argument('--metrics-port', type=int, default=0,
+                        help="Porta local do endpoint /metrics (padrão: 0, sem métricas)")